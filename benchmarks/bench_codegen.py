@@ -0,0 +1,114 @@
+"""Сгенерированный модуль-распознаватель против fit() + predict().
+
+Для каждой грамматики набора в отдельном процессе измеряется время от начала
+импорта до ответа на первое слово: у сгенерированного модуля — без .pyc
+(первый запуск) и с .pyc, у парсера — импорт, fit() и predict(). Затем в
+текущем процессе сравнивается скорость recognize() и predict().
+
+Запуск: python -m benchmarks.bench_codegen [--quick] [--repeat N]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import cases
+from codegen import write_module
+from lr_parser import LR1Parser
+from parser_server import grammar_to_dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GENERATED_SCRIPT = """
+import sys, time
+word = sys.argv[2]
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import recognizer
+recognizer.recognize(word)
+print(time.perf_counter() - start)
+"""
+
+PARSER_SCRIPT = """
+import json, sys, time
+data, word = json.loads(sys.argv[1]), sys.argv[2]
+start = time.perf_counter()
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+parser = LR1Parser()
+parser.fit(Grammar(set(data['nonterminals']), set(data['terminals']),
+                   [Rule(lhs, rhs) for lhs, rhs in data['rules']], data['start']))
+parser.predict(word)
+print(time.perf_counter() - start)
+"""
+
+
+def run_script(script: str, *args: str) -> float:
+    result = subprocess.run([sys.executable, '-c', script, *args], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout)
+
+
+def first_call(directory: str, word: str, repeat: int, cached: bool) -> float:
+    pycache = os.path.join(directory, '__pycache__')
+    times = []
+    if cached:
+        run_script(GENERATED_SCRIPT, directory, word)
+    for _ in range(repeat):
+        if not cached:
+            shutil.rmtree(pycache, ignore_errors=True)
+        times.append(run_script(GENERATED_SCRIPT, directory, word))
+    return statistics.median(times)
+
+
+def throughput(function, words) -> float:
+    start = time.perf_counter()
+    for word in words:
+        function(word)
+    return len(words) / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--quick', action='store_true', help="малые грамматики")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="запусков процесса на измерение")
+    arg_parser.add_argument('--words', type=int, default=200)
+    args = arg_parser.parse_args()
+
+    for case in cases(args.quick):
+        grammar = case.grammar()
+        words = [case.word(grammar, seed) for seed in range(args.words)]
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'recognizer.py')
+            write_module(parser, path)
+            size = os.path.getsize(path)
+
+            cold = first_call(directory, words[0], args.repeat, cached=False)
+            warm = first_call(directory, words[0], args.repeat, cached=True)
+            fit = statistics.median(run_script(PARSER_SCRIPT, json.dumps(grammar_to_dict(grammar)), words[0])
+                                    for _ in range(args.repeat))
+
+            sys.path.insert(0, directory)
+            import recognizer
+            generated = throughput(recognizer.recognize, words)
+            sys.path.remove(directory)
+            del sys.modules['recognizer']
+
+        predicted = throughput(parser.predict, words)
+        print(f"{case.name}: states={parser.tables.n_states} module={size / 1024:.0f} KiB")
+        print(f"  import+first call: {cold * 1e3:.1f} ms (no .pyc), {warm * 1e3:.1f} ms (.pyc); "
+              f"import+fit+predict: {fit * 1e3:.1f} ms ({fit / warm:.0f}x)")
+        print(f"  words/s: recognize {generated:.0f}, predict {predicted:.0f} "
+              f"({generated / predicted:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Параллельное построение канонической коллекции: время fit() по числу процессов.
+
+Запуск: python -m benchmarks.bench_collection [--levels L] [--contexts C] [--max-jobs J]
+(по умолчанию грамматика с ~26 тыс. LR(1)-состояний)
+"""
+import argparse
+import os
+import time
+
+from benchmarks.grammars import context_expression_grammar
+from lr_parser import LR1Parser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--levels', type=int, default=10)
+    arg_parser.add_argument('--contexts', type=int, default=700)
+    arg_parser.add_argument('--max-jobs', type=int, default=os.cpu_count() or 1)
+    args = arg_parser.parse_args()
+
+    grammar = context_expression_grammar(args.levels, args.contexts)
+    print(f"levels={args.levels} contexts={args.contexts} cpus={os.cpu_count()}")
+
+    baseline = None
+    reference = None
+    jobs = 1
+    while jobs <= args.max_jobs:
+        parser = LR1Parser()
+        start = time.perf_counter()
+        parser.fit(grammar, jobs=jobs)
+        elapsed = time.perf_counter() - start
+
+        # Номера состояний не зависят от числа процессов
+        if reference is None:
+            reference = parser.transitions
+        assert parser.transitions == reference
+
+        baseline = baseline or elapsed
+        print(f"jobs={jobs:>3}: states={len(parser.states)} fit {elapsed:.2f}s  "
+              f"speedup {baseline / elapsed:.2f}x")
+        jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
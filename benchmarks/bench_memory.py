@@ -0,0 +1,93 @@
+"""Пиковая память (RSS) и выделения памяти fit() на грамматике с большим числом LR(1)-состояний.
+
+Выделения считает tracemalloc во втором, отдельном прогоне fit(): пик
+отслеживаемой памяти и число блоков, оставшихся после построения
+(sys.getallocatedblocks до и после).
+
+Каждое измерение выполняется в отдельном процессе. С --baseline REV то же
+измерение повторяется на версии дерева из указанной git-ревизии.
+
+Запуск: python -m benchmarks.bench_memory [--levels N] [--contexts K] [--baseline REV]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, sys, time, tracemalloc
+from benchmarks.grammars import context_expression_grammar
+from lr_parser import LR1Parser
+
+grammar = context_expression_grammar({levels}, {contexts})
+parser = LR1Parser()
+start = time.perf_counter()
+parser.fit(grammar)
+elapsed = time.perf_counter() - start
+
+# Время и RSS сняты без tracemalloc: трассировка замедляет выделения
+blocks = sys.getallocatedblocks()
+tracemalloc.start()
+traced = LR1Parser()
+traced.fit(grammar)
+traced_peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+retained_blocks = sys.getallocatedblocks() - blocks
+print(json.dumps({{
+    "states": len(parser.states),
+    "items": sum(len(state.items) for state in parser.states),
+    "fit_seconds": elapsed,
+    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "traced_peak_kb": traced_peak // 1024,
+    "retained_blocks": retained_blocks,
+}}))
+"""
+
+
+def measure(tree: str, levels: int, contexts: int) -> dict:
+    code = CHILD.format(levels=levels, contexts=contexts)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([tree, ROOT]))
+    output = subprocess.run([sys.executable, '-c', code], cwd=tree, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def export_revision(revision: str, target: str):
+    archive = subprocess.run(['git', 'archive', revision], cwd=ROOT,
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def report(label: str, result: dict):
+    print(f"{label:>10}: states={result['states']} items={result['items']} "
+          f"fit={result['fit_seconds']:.2f}s peak_rss={result['peak_rss_kb'] / 1024:.1f} MiB "
+          f"traced_peak={result['traced_peak_kb'] / 1024:.1f} MiB blocks={result['retained_blocks']}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--levels', type=int, default=12)
+    arg_parser.add_argument('--contexts', type=int, default=250)
+    arg_parser.add_argument('--baseline', help="git-ревизия для сравнения")
+    args = arg_parser.parse_args()
+
+    current = measure(ROOT, args.levels, args.contexts)
+    report('current', current)
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tree:
+            export_revision(args.baseline, tree)
+            baseline = measure(tree, args.levels, args.contexts)
+        report(args.baseline, baseline)
+        print(f"peak RSS ratio: {baseline['peak_rss_kb'] / current['peak_rss_kb']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
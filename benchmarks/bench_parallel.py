@@ -0,0 +1,47 @@
+"""Масштабирование проверки слов по числу процессов (parallel_check).
+
+Запуск: python -m benchmarks.bench_parallel [--words N] [--max-jobs J]
+"""
+import argparse
+import os
+import random
+import time
+
+from benchmarks.grammars import expression_grammar, random_expression_word
+from lr_parser import LR1Parser
+from parallel_check import check_words
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--words', type=int, default=1_000_000)
+    arg_parser.add_argument('--length', type=int, default=24)
+    arg_parser.add_argument('--levels', type=int, default=6)
+    arg_parser.add_argument('--max-jobs', type=int, default=os.cpu_count() or 1)
+    args = arg_parser.parse_args()
+
+    parser = LR1Parser()
+    parser.fit(expression_grammar(args.levels))
+
+    rnd = random.Random(0)
+    # Небольшой пул различных слов, размноженный до нужного количества
+    pool = [random_expression_word(args.levels, args.length, seed) for seed in range(10_000)]
+    words = [rnd.choice(pool) for _ in range(args.words)]
+    print(f"words={len(words)} cpus={os.cpu_count()}")
+
+    baseline = None
+    jobs = 1
+    while jobs <= args.max_jobs:
+        start = time.perf_counter()
+        results = check_words(parser.tables, words, jobs)
+        elapsed = time.perf_counter() - start
+        assert len(results) == len(words)
+
+        baseline = baseline or elapsed
+        print(f"jobs={jobs:>3}: {elapsed:.2f}s  {len(words) / elapsed / 1e3:.0f}k words/s  "
+              f"speedup {baseline / elapsed:.2f}x")
+        jobs *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Нагрузка на parser_server: задержка запросов (p50/p99) и слова в секунду.
+
+Без --unix/--port сервер запускается отдельным процессом на временном
+Unix-сокете. С --cli для сравнения тот же пакет проверяется запуском
+python main.py на каждый пакет.
+
+Запуск: python -m benchmarks.bench_server [--connections C] [--requests R] [--batch B]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Sequence
+
+import parser_server
+from benchmarks.grammars import expression_grammar, random_expression_word
+from grammar import Grammar
+from parser_server import ParserClient
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_connection(args, grammar: Grammar, batches: List[List[str]]) -> List[float]:
+    client = await ParserClient.connect(args.unix, args.host, args.port)
+    fingerprint = await client.register(grammar)
+    latencies = []
+    for words in batches:
+        start = time.perf_counter()
+        await client.check(fingerprint, words)
+        latencies.append(time.perf_counter() - start)
+    await client.close()
+    return latencies
+
+
+async def run_load(args, grammar: Grammar, batches: List[List[str]]) -> List[float]:
+    # Грамматика регистрируется заранее, чтобы fit() не попал в задержки
+    client = await ParserClient.connect(args.unix, args.host, args.port)
+    await client.register(grammar)
+    await client.close()
+
+    results = await asyncio.gather(*[run_connection(args, grammar, batches)
+                                     for _ in range(args.connections)])
+    return [latency for latencies in results for latency in latencies]
+
+
+def grammar_text(grammar: Grammar, words: List[str]) -> str:
+    """Грамматика и слова во входном формате main.py."""
+    lines = [f"{len(grammar.nonterminals)} {len(grammar.terminals)} {len(grammar.rules)}",
+             ' '.join(sorted(grammar.nonterminals)),
+             ' '.join(sorted(grammar.terminals))]
+    lines.extend(f"{rule.lhs} -> {' '.join(symbol for symbol in rule.rhs if symbol != 'ε')}"
+                 for rule in grammar.rules)
+    lines.extend([grammar.start_symbol, str(len(words))])
+    lines.extend(words)
+    return "\n".join(lines) + "\n"
+
+
+def run_cli(grammar: Grammar, words: List[str], runs: int) -> List[float]:
+    main_path = os.path.join(os.path.dirname(os.path.abspath(parser_server.__file__)), 'main.py')
+    text = grammar_text(grammar, words)
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, main_path], input=text, text=True, capture_output=True, check=True)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def start_server(socket_path: str, jobs: int) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, parser_server.__file__, '--unix', socket_path,
+                                '--jobs', str(jobs)])
+    deadline = time.monotonic() + 30
+    while not os.path.exists(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("Server did not start")
+        time.sleep(0.05)
+    return process
+
+
+def report(name: str, latencies: List[float], words: int, elapsed: float):
+    print(f"{name}: {len(latencies)} requests, p50 {percentile(latencies, 0.5) * 1e3:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1e3:.2f} ms, {words / elapsed / 1e3:.0f}k words/s")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--unix', metavar='PATH', help="сокет запущенного сервера")
+    arg_parser.add_argument('--port', type=int, help="TCP-порт запущенного сервера")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                            help="процессов пула у запускаемого сервера")
+    arg_parser.add_argument('--connections', type=int, default=8)
+    arg_parser.add_argument('--requests', type=int, default=50, help="запросов на соединение")
+    arg_parser.add_argument('--batch', type=int, default=100, help="слов в запросе")
+    arg_parser.add_argument('--levels', type=int, default=6)
+    arg_parser.add_argument('--length', type=int, default=24)
+    arg_parser.add_argument('--cli', type=int, default=0, metavar='RUNS',
+                            help="сравнить с RUNS запусками main.py на пакет")
+    args = arg_parser.parse_args()
+
+    grammar = expression_grammar(args.levels)
+    batches = [[random_expression_word(args.levels, args.length, request * args.batch + i)
+                for i in range(args.batch)] for request in range(args.requests)]
+    total_words = args.connections * args.requests * args.batch
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        if args.unix is None and args.port is None:
+            args.unix = os.path.join(directory, 'server.sock')
+            server = start_server(args.unix, args.jobs)
+
+        try:
+            start = time.perf_counter()
+            latencies = asyncio.run(run_load(args, grammar, batches))
+            report(f"server ({args.connections} connections)", latencies, total_words,
+                   time.perf_counter() - start)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    if args.cli:
+        start = time.perf_counter()
+        latencies = run_cli(grammar, batches[0], args.cli)
+        report("main.py per batch", latencies, args.cli * args.batch, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
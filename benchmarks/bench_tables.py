@@ -0,0 +1,55 @@
+"""Сравнение построения таблиц: старый второй проход через _goto и один проход по goto_table.
+
+Запуск: python -m benchmarks.bench_tables [levels] [contexts]
+"""
+import sys
+import time
+
+from benchmarks.grammars import context_expression_grammar
+from lr_parser import LR1Parser
+
+
+def legacy_build_parsing_tables(parser: LR1Parser):
+    # Прежняя реализация: _goto для каждого состояния и символа и линейный поиск состояния
+    temp_goto = {}
+    for i, state in enumerate(parser.states):
+        for symbol in range(parser.compiled.n_symbols):
+            new_state = parser._goto(state, symbol)
+            if new_state:
+                for j, existing_state in enumerate(parser.states):
+                    if existing_state == new_state:
+                        temp_goto[(i, parser.compiled.name(symbol))] = j
+                        break
+    parser._build_parsing_tables()
+    return temp_goto
+
+
+def main():
+    levels = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    contexts = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    parser = LR1Parser()
+    parser.fit(context_expression_grammar(levels, contexts))
+    print(f"levels={levels} contexts={contexts} states={len(parser.states)}")
+
+    start = time.perf_counter()
+    parser._build_parsing_tables()
+    one_pass = time.perf_counter() - start
+
+    action_table = dict(parser.action_table)
+    goto_table = dict(parser.goto_table)
+
+    start = time.perf_counter()
+    legacy_goto = legacy_build_parsing_tables(parser)
+    legacy = time.perf_counter() - start
+
+    assert parser.action_table == action_table
+    assert legacy_goto == goto_table
+
+    print(f"legacy two-pass: {legacy:.3f}s")
+    print(f"one-pass:        {one_pass:.3f}s")
+    print(f"speedup:         {legacy / one_pass:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import random
+import string
+from typing import Dict, List, Optional
+
+from grammar import Grammar, Rule
+
+
+OPERATOR_CHARS = '+-*/%^&|<>=!~?:;,.@#'
+
+
+def expression_grammar(levels: int) -> Grammar:
+    """Грамматика выражений с levels уровнями приоритета (левоассоциативные операторы)."""
+    if levels < 1 or levels > len(OPERATOR_CHARS):
+        raise ValueError(f"levels must be in 1..{len(OPERATOR_CHARS)}")
+
+    nonterminals = [f"E{i}" for i in range(levels + 1)]
+    terminals = set(OPERATOR_CHARS[:levels]) | {'(', ')', 'x'}
+    rules = []
+
+    for i in range(levels):
+        op = OPERATOR_CHARS[i]
+        rules.append(Rule(nonterminals[i], [nonterminals[i], op, nonterminals[i + 1]]))
+        rules.append(Rule(nonterminals[i], [nonterminals[i + 1]]))
+
+    rules.append(Rule(nonterminals[levels], ['(', nonterminals[0], ')']))
+    rules.append(Rule(nonterminals[levels], ['x']))
+
+    return Grammar(set(nonterminals), terminals, rules, nonterminals[0])
+
+
+def random_expression_word(levels: int, length: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    operators = OPERATOR_CHARS[:levels]
+    parts: List[str] = []
+    depth = 0
+
+    while len(parts) < length:
+        if depth < 8 and rnd.random() < 0.1:
+            parts.append('(')
+            depth += 1
+            continue
+        parts.append('x')
+        while depth and rnd.random() < 0.2:
+            parts.append(')')
+            depth -= 1
+        parts.append(rnd.choice(operators))
+
+    parts.append('x')
+    parts.extend(')' * depth)
+    return ''.join(parts)
+
+
+def random_word(alphabet: str = string.ascii_lowercase, length: int = 16, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    return ''.join(rnd.choice(alphabet) for _ in range(length))
+
+
+def context_expression_grammar(levels: int, contexts: int) -> Grammar:
+    """Выражения внутри contexts различных пар скобок.
+
+    Каждый контекст даёт свой lookahead после выражения, поэтому каноническая
+    LR(1)-коллекция содержит отдельную копию состояний выражения на каждый контекст.
+    """
+    base = expression_grammar(levels)
+    terminals = set(base.terminals)
+    nonterminals = set(base.nonterminals) | {'S'}
+    rules = list(base.rules)
+
+    for i in range(contexts):
+        open_sym, close_sym = context_brackets(i)
+        terminals.update((open_sym, close_sym))
+        rules.append(Rule('S', [open_sym, base.start_symbol, close_sym]))
+
+    return Grammar(nonterminals, terminals, rules, 'S')
+
+
+def context_brackets(index: int):
+    return chr(0x100 + 2 * index), chr(0x101 + 2 * index)
+
+
+def nested_list_grammar(kinds: int) -> Grammar:
+    """Вложенные списки x через запятую в kinds различных парах скобок."""
+    if kinds < 1:
+        raise ValueError("kinds must be positive")
+
+    nonterminals = {'S', 'L', 'Items', 'Rest', 'Item'}
+    terminals = {',', 'x'}
+    rules = [
+        Rule('S', ['L']),
+        Rule('Items', ['ε']),
+        Rule('Items', ['Item', 'Rest']),
+        Rule('Rest', ['ε']),
+        Rule('Rest', [',', 'Item', 'Rest']),
+        Rule('Item', ['x']),
+        Rule('Item', ['L']),
+    ]
+
+    for i in range(kinds):
+        open_sym, close_sym = context_brackets(i)
+        terminals.update((open_sym, close_sym))
+        rules.append(Rule('L', [open_sym, 'Items', close_sym]))
+
+    return Grammar(nonterminals, terminals, rules, 'S')
+
+
+def random_ll1_grammar(nonterminals: int, alternatives: int, max_length: int, seed: int = 0) -> Grammar:
+    """Случайная LL(1) (а значит, LR(1)) грамматика без ε-правил.
+
+    Альтернативы каждого нетерминала начинаются с различных терминалов, а
+    последняя альтернатива состоит только из терминалов, поэтому все
+    нетерминалы продуктивны.
+    """
+    rnd = random.Random(seed)
+    names = [f"N{i}" for i in range(nonterminals)]
+    leading = [f"t{i}" for i in range(alternatives)]
+    others = [f"u{i}" for i in range(max(2, alternatives // 2))]
+    rules = []
+
+    for index, lhs in enumerate(names):
+        for i, first in enumerate(rnd.sample(leading, alternatives)):
+            body = [rnd.choice(others) for _ in range(rnd.randint(0, max_length - 1))]
+            if i < alternatives - 1:
+                # Первая альтернатива ссылается на следующий нетерминал — все достижимы
+                target = names[(index + 1) % nonterminals] if i == 0 else rnd.choice(names)
+                body.insert(rnd.randint(0, len(body)), target)
+            rules.append(Rule(lhs, [first] + body))
+
+    return Grammar(set(names), set(leading) | set(others), rules, names[0])
+
+
+def random_sentence(grammar: Grammar, length: int, seed: int = 0) -> List[str]:
+    """Случайное слово языка (список терминалов) длиной примерно length.
+
+    Пока слово короче length, правила выбираются случайно (чаще — правила
+    с нетерминалами), затем — правила с кратчайшим выводом терминальной строки.
+    """
+    rnd = random.Random(seed)
+    shortest = _shortest_derivations(grammar)
+    by_lhs: Dict[str, List[Rule]] = {}
+    for rule in grammar.rules:
+        # Правила с непродуктивными нетерминалами не дают терминальных строк
+        if all(s in shortest or s not in grammar.nonterminals for s in rule.rhs):
+            by_lhs.setdefault(rule.lhs, []).append(rule)
+
+    def cost(rule: Rule) -> int:
+        return sum(shortest.get(s, _is_terminal(grammar, s)) for s in rule.rhs)
+
+    def grows(rule: Rule) -> bool:
+        return any(s in grammar.nonterminals for s in rule.rhs)
+
+    word: List[str] = []
+    # Стек символов, которые ещё предстоит раскрыть (слева направо)
+    stack = [grammar.start_symbol]
+    while stack:
+        symbol = stack.pop()
+        if symbol == 'ε':
+            continue
+        if _is_terminal(grammar, symbol):
+            word.append(symbol)
+            continue
+
+        rules = by_lhs[symbol]
+        if len(word) + len(stack) < length:
+            # Пока слово короткое, предпочитаются правила с нетерминалами
+            recursive = [rule for rule in rules if grows(rule)]
+            rule = rnd.choice(recursive if recursive and rnd.random() < 0.8 else rules)
+        else:
+            rule = min(rules, key=cost)
+        stack.extend(reversed(rule.rhs))
+
+    return word
+
+
+def _is_terminal(grammar: Grammar, symbol: str) -> bool:
+    return symbol not in grammar.nonterminals and symbol != 'ε'
+
+
+def _shortest_derivations(grammar: Grammar) -> Dict[str, int]:
+    # Длина кратчайшей терминальной строки, выводимой из нетерминала
+    shortest: Dict[str, int] = {}
+    changed = True
+    while changed:
+        changed = False
+        for rule in grammar.rules:
+            total: Optional[int] = 0
+            for symbol in rule.rhs:
+                if symbol == 'ε':
+                    continue
+                if _is_terminal(grammar, symbol):
+                    total += 1
+                elif symbol in shortest:
+                    total += shortest[symbol]
+                else:
+                    total = None
+                    break
+            if total is not None and total < shortest.get(rule.lhs, total + 1):
+                shortest[rule.lhs] = total
+                changed = True
+    return shortest
@@ -0,0 +1,173 @@
+"""Набор бенчмарков: время фаз fit() и скорость predict() на сгенерированных грамматиках.
+
+Результаты записываются в JSON; с --baseline они сравниваются с ранее
+сохранёнными, и при замедлении больше допуска код возврата — 1.
+
+Запуск: python -m benchmarks.suite [--quick] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple
+
+from benchmarks.grammars import (context_expression_grammar, expression_grammar, nested_list_grammar,
+                                 random_expression_word, random_ll1_grammar, random_sentence)
+from grammar import Grammar
+from lr_parser import LR1Parser
+
+PHASES = ('first_follow', 'collection', 'tables', 'conflicts')
+THROUGHPUT = ('predict_tokens_per_second', 'predict_many_tokens_per_second')
+
+
+class Case(NamedTuple):
+    name: str
+    grammar: Callable[[], Grammar]
+    # Слова по номеру (зерну генератора)
+    word: Callable[[Grammar, int], str]
+
+
+def _expression_case(levels: int, length: int) -> Case:
+    return Case(f"expression-{levels}", lambda: expression_grammar(levels),
+                lambda grammar, seed: random_expression_word(levels, length, seed))
+
+
+def _sentence_case(name: str, grammar: Callable[[], Grammar], length: int, separator: str = '') -> Case:
+    return Case(name, grammar,
+                lambda grammar, seed: separator.join(random_sentence(grammar, length, seed)))
+
+
+def cases(quick: bool) -> List[Case]:
+    if quick:
+        return [
+            _expression_case(4, 100),
+            _sentence_case("context-expression-4x20", lambda: context_expression_grammar(4, 20), 100),
+            _sentence_case("nested-lists-5", lambda: nested_list_grammar(5), 100),
+            _sentence_case("random-ll1-20", lambda: random_ll1_grammar(20, 6, 5, seed=1), 100, ' '),
+        ]
+    return [
+        _expression_case(10, 1000),
+        _sentence_case("context-expression-8x150", lambda: context_expression_grammar(8, 150), 1000),
+        _sentence_case("nested-lists-50", lambda: nested_list_grammar(50), 1000),
+        _sentence_case("random-ll1-200", lambda: random_ll1_grammar(200, 8, 6, seed=1), 1000, ' '),
+    ]
+
+
+def time_phases(grammar: Grammar) -> Dict[str, float]:
+    parser = LR1Parser(collect_stats=True)
+    parser.fit(grammar)
+    phases = parser.stats.phase_seconds
+    # Построение CompiledGrammar относится к фазе FIRST/FOLLOW
+    phases['first_follow'] += phases.pop('compile')
+    return phases
+
+
+def throughput(function: Callable[[], object], tokens: int) -> float:
+    start = time.perf_counter()
+    function()
+    return tokens / (time.perf_counter() - start)
+
+
+def run_case(case: Case, words: int, repeat: int) -> dict:
+    grammar = case.grammar()
+
+    phases = {phase: float('inf') for phase in PHASES}
+    for _ in range(repeat):
+        for phase, seconds in time_phases(grammar).items():
+            phases[phase] = min(phases[phase], seconds)
+
+    parser = LR1Parser()
+    parser.fit(grammar)
+    sample = [case.word(grammar, seed) for seed in range(words)]
+    tokens = sum(len(list(parser.tables.tokens(word))) + 1 for word in sample)
+    if not all(parser.predict_many(sample)):
+        raise AssertionError(f"{case.name}: generated word rejected")
+
+    result = {
+        'states': len(parser.states),
+        'rules': len(grammar.rules),
+        'words': words,
+        'tokens': tokens,
+        'phases': phases,
+        'predict_tokens_per_second': max(
+            throughput(lambda: [parser.predict(word) for word in sample], tokens) for _ in range(repeat)),
+        'predict_many_tokens_per_second': max(
+            throughput(lambda: parser.predict_many(sample), tokens) for _ in range(repeat)),
+    }
+    return result
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Сравнение с базовыми результатами; возвращает описания замедлений."""
+    regressions = []
+
+    for name, result in current['cases'].items():
+        base = baseline['cases'].get(name)
+        if base is None:
+            print(f"{name}: no baseline")
+            continue
+
+        # Отношение > 1 — медленнее базового
+        ratios = {phase: result['phases'][phase] / base['phases'][phase]
+                  for phase in PHASES if base['phases'].get(phase)}
+        ratios.update({metric: base[metric] / result[metric]
+                       for metric in THROUGHPUT if metric in base})
+
+        for metric, ratio in ratios.items():
+            marker = ''
+            if ratio > 1 + tolerance:
+                marker = '  REGRESSION'
+                regressions.append(f"{name}/{metric}: {ratio:.2f}x slower")
+            print(f"{name:>28} {metric:>32}: {ratio:6.2f}x{marker}")
+
+    return regressions
+
+
+def report(results: dict):
+    for name, result in results['cases'].items():
+        phases = '  '.join(f"{phase}={seconds * 1e3:.1f}ms" for phase, seconds in result['phases'].items())
+        print(f"{name}: states={result['states']} {phases}")
+        print(f"{'':>{len(name)}}  predict {result['predict_tokens_per_second'] / 1e6:.2f}M tok/s, "
+              f"predict_many {result['predict_many_tokens_per_second'] / 1e6:.2f}M tok/s")
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--quick', action='store_true', help="маленькие грамматики и слова")
+    arg_parser.add_argument('--words', type=int, default=200)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--output', metavar='FILE', help="куда записать результаты (JSON)")
+    arg_parser.add_argument('--baseline', metavar='FILE', help="результаты для сравнения (JSON)")
+    arg_parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="допустимое относительное замедление")
+    args = arg_parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'quick': args.quick,
+            'repeat': args.repeat,
+        },
+        'cases': {case.name: run_case(case, args.words, args.repeat) for case in cases(args.quick)},
+    }
+    report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n".join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
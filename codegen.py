@@ -0,0 +1,257 @@
+"""Генерация самостоятельного модуля-распознавателя из таблиц LR(1).
+
+Модуль не зависит от проекта (только стандартная библиотека): таблицы записаны
+сжатыми байтовыми литералами и при импорте становятся memoryview над
+распакованными байтами, recognize(word) — цикл LR-разбора с константами
+грамматики. ACTION хранится плотно, как в ParseTables; строки GOTO упакованы
+со сдвигами (row displacement): после свёртки переход всегда определён, и
+проверка принадлежности ячейки строке не нужна.
+
+Запуск: python main.py --generate-module recognizer.py < grammar.txt
+"""
+import base64
+import sys
+import zlib
+from array import array
+from string import Template
+from typing import Dict, List, Sequence, Tuple
+from lexer import Lexer
+from lr_parser import LR1Parser
+from parse_tables import ACCEPT, REDUCE, SHIFT, ParseTables, decode_action
+
+
+MODULE_TEMPLATE = Template('''"""Распознаватель языка грамматики $fingerprint.
+
+Сгенерирован codegen.py из таблиц LR(1); не редактировать.
+"""
+import binascii
+import sys
+import zlib
+from itertools import chain
+
+N_TERMINALS = $n_terminals
+N_NONTERMINALS = $n_nonterminals
+# Свёртка по дополнительному правилу S' -> S — допуск
+ACCEPT_RULE = $accept_rule
+TERMINALS = $terminals
+SKIP = $skip
+$lexer_tables
+
+def _table(typecode, data):
+    data = zlib.decompress(binascii.a2b_base64(data))
+    if sys.byteorder != 'little':
+        from array import array
+        values = array(typecode)
+        values.frombytes(data)
+        values.byteswap()
+        return values
+    return memoryview(data).cast(typecode)
+
+
+# ACTION: сдвиг в s — s + 1, свёртка по правилу r — ~r, ошибка — 0
+ACTION = _table('$action_type', $action)
+# Переход из s по нетерминалу A — GOTO[GOTO_BASE[s] + A]
+GOTO_BASE = _table('$goto_base_type', $goto_base)
+GOTO = _table('$goto_type', $goto)
+RULE_LHS = $rule_lhs
+RULE_LENGTH = $rule_length
+
+
+$tokens
+
+def recognize(word):
+    """Принадлежит ли слово языку грамматики."""
+    action = ACTION
+    goto_base = GOTO_BASE
+    goto = GOTO
+    rule_lhs = RULE_LHS
+    rule_length = RULE_LENGTH
+    stack = [0]
+
+    for token in chain(_tokens(word), (0,)):
+        if token is None:
+            return False
+
+        while True:
+            act = action[stack[-1] * $n_terminals + token]
+            if act > 0:
+                stack.append(act - 1)
+                break
+            if act == 0:
+                return False
+
+            rule = ~act
+            if rule == $accept_rule:
+                return True
+            length = rule_length[rule]
+            if length:
+                del stack[-length:]
+            stack.append(goto[goto_base[stack[-1]] + rule_lhs[rule]])
+
+    return False
+
+
+def recognize_many(words):
+    return [recognize(word) for word in words]
+''')
+
+SINGLE_CHAR_TOKENS = '''def _tokens(word):
+    # Все терминалы односимвольные: каждый символ слова — лексема
+    return map(TERMINALS.get, word)
+'''
+
+LONGEST_MATCH_TOKENS = '''def _tokens(word):
+    # Самое длинное совпадение по префиксному дереву терминалов
+    edges = EDGES
+    accept = ACCEPT
+    skip = SKIP
+    length = len(word)
+    i = 0
+
+    while i < length:
+        if word[i] in skip:
+            i += 1
+            continue
+
+        node = 0
+        j = i
+        token = -1
+        end = i
+        while j < length:
+            node = edges[node].get(word[j])
+            if node is None:
+                break
+            j += 1
+            if accept[node] >= 0:
+                token = accept[node]
+                end = j
+
+        if token < 0:
+            yield None
+            return
+
+        yield token
+        i = end
+'''
+
+
+def generate_module(parser: LR1Parser) -> str:
+    """Исходный текст модуля-распознавателя для построенного парсера."""
+    if not parser.grammar:
+        raise RuntimeError("Parser not fitted with grammar")
+
+    tables = parser.tables
+    if tables.conflicts:
+        raise ValueError("Cannot generate a deterministic recognizer: parse tables have conflicts")
+
+    accept_rule = len(tables.rule_length)
+    action = _signed_actions(tables, accept_rule)
+    goto_base, goto = _pack_goto(tables)
+    lexer = Lexer(tables.terminal_ids)
+
+    if lexer.single_char:
+        lexer_tables = ''
+        tokens = SINGLE_CHAR_TOKENS
+    else:
+        lexer_tables = f"EDGES = {lexer.edges!r}\nACCEPT = {lexer.accept!r}\n"
+        tokens = LONGEST_MATCH_TOKENS
+
+    return MODULE_TEMPLATE.substitute(
+        fingerprint=parser.grammar.fingerprint(),
+        n_terminals=tables.n_terminals,
+        n_nonterminals=tables.n_nonterminals,
+        accept_rule=accept_rule,
+        terminals=repr(dict(sorted(tables.terminal_ids.items(), key=lambda item: item[1]))),
+        skip=repr(''.join(sorted(lexer.skip))),
+        lexer_tables=lexer_tables,
+        action_type=_typecode(action),
+        action=_bytes_literal(action),
+        goto_base_type=_typecode(goto_base),
+        goto_base=_bytes_literal(goto_base),
+        goto_type=_typecode(goto),
+        goto=_bytes_literal(goto),
+        rule_lhs=repr(tuple(tables.rule_lhs)),
+        rule_length=repr(tuple(tables.rule_length)),
+        tokens=tokens,
+    )
+
+
+def write_module(parser: LR1Parser, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(generate_module(parser))
+
+
+def _signed_actions(tables: ParseTables, accept_rule: int) -> array:
+    # Перекодировка действий: одна проверка знака вместо выделения вида действия
+    signed = array('i', [0]) * len(tables.action)
+    for index, act in enumerate(tables.action):
+        kind, arg = decode_action(act)
+        if kind == SHIFT:
+            signed[index] = arg + 1
+        elif kind == REDUCE:
+            signed[index] = ~arg
+        elif kind == ACCEPT:
+            signed[index] = ~accept_rule
+    return signed
+
+
+def _pack_goto(tables: ParseTables) -> Tuple[List[int], List[int]]:
+    """Строки GOTO, уложенные в один массив со сдвигами base[s] (первое подходящее место).
+
+    Незанятые ячейки содержат 0: к ним обращаются только по отсутствующим
+    переходам, которых при разборе после свёртки не бывает.
+    """
+    n_nonterminals = tables.n_nonterminals
+    rows = []
+    for state in range(tables.n_states):
+        row = tables.goto[state * n_nonterminals:(state + 1) * n_nonterminals]
+        rows.append(tuple((nonterminal, target) for nonterminal, target in enumerate(row) if target >= 0))
+
+    base = [0] * tables.n_states
+    packed: List[int] = []
+    used = bytearray()
+    # Одинаковые строки получают один сдвиг
+    placed: Dict[tuple, int] = {}
+    first_free = 0
+
+    # Длинные строки раньше: короткие заполняют оставшиеся промежутки
+    for state in sorted(range(tables.n_states), key=lambda state: -len(rows[state])):
+        row = rows[state]
+        if not row:
+            continue
+        offset = placed.get(row)
+        if offset is None:
+            offset = max(0, first_free - row[0][0])
+            while any(offset + nonterminal < len(used) and used[offset + nonterminal] for nonterminal, _ in row):
+                offset += 1
+
+            end = offset + row[-1][0] + 1
+            if end > len(used):
+                used.extend(bytes(end - len(used)))
+                packed.extend([0] * (end - len(packed)))
+            for nonterminal, target in row:
+                used[offset + nonterminal] = 1
+                packed[offset + nonterminal] = target
+            while first_free < len(used) and used[first_free]:
+                first_free += 1
+            placed[row] = offset
+        base[state] = offset
+
+    return base, packed
+
+
+def _typecode(values: Sequence[int]) -> str:
+    # 16-битные элементы, если значения помещаются, иначе 32-битные
+    if not values or -(1 << 15) <= min(values) and max(values) < (1 << 15):
+        return 'h'
+    return 'i'
+
+
+def _bytes_literal(values: Sequence[int], width: int = 76) -> str:
+    # Литерал — base64 от zlib little-endian массива; в модуле разворачивается _table
+    packed = array(_typecode(values), values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    encoded = base64.b64encode(zlib.compress(packed.tobytes(), 9)).decode('ascii')
+    lines = [encoded[start:start + width] for start in range(0, len(encoded), width)] or ['']
+    return "(\n" + "".join(f"    b'{line}'\n" for line in lines) + ")"
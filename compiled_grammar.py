@@ -0,0 +1,133 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from grammar import Grammar, format_symbols
+
+
+EPSILON = 'ε'
+END_MARKER = '$'
+
+
+class CompiledGrammar:
+    """Грамматика с символами и правилами, закодированными плотными целыми числами.
+
+    Терминалы получают номера 0..n_terminals-1 (0 — маркер конца '$'),
+    нетерминалы — n_terminals..n_symbols-1. Номер правила совпадает с его
+    индексом в grammar.rules; дополненное правило S' -> S (если задано)
+    получает номер len(grammar.rules). 'ε' из правых частей удаляется.
+    """
+
+    def __init__(self, grammar: Grammar, augmented_start: Optional[str] = None):
+        self.grammar = grammar
+
+        declared = sorted(t for t in grammar.terminals if t not in (EPSILON, END_MARKER))
+        known = set(grammar.terminals) | set(grammar.nonterminals)
+        # Символы правых частей, не объявленные в грамматике, считаются терминалами,
+        # которые никогда не встречаются во входе
+        undeclared = sorted({symbol for rule in grammar.rules for symbol in rule.rhs
+                             if symbol not in known and symbol != EPSILON})
+
+        self.symbols: List[str] = [END_MARKER] + declared + undeclared
+        self.n_terminals = len(self.symbols)
+        self.symbols.extend(sorted(grammar.nonterminals))
+
+        self.augmented_start = -1
+        if augmented_start is not None:
+            self.augmented_start = len(self.symbols)
+            self.symbols.append(augmented_start)
+
+        self.n_symbols = len(self.symbols)
+        self.symbol_ids: Dict[str, int] = {name: i for i, name in enumerate(self.symbols)}
+        # Терминалы, которые могут встретиться во входном слове
+        self.input_ids: Dict[str, int] = {name: self.symbol_ids[name] for name in declared}
+        self.end = 0
+        self.start = self.symbol_ids.get(grammar.start_symbol, -1)
+
+        self.rule_lhs: List[int] = []
+        self.rule_rhs: List[Tuple[int, ...]] = []
+        self.rules_by_lhs: List[List[int]] = [[] for _ in range(self.n_symbols)]
+
+        seen = set()
+        for rule in grammar.rules:
+            rule_id = len(self.rule_lhs)
+            if rule.lhs not in grammar.nonterminals:
+                raise ValueError(f"Unknown nonterminal in rule: {rule}")
+            lhs = self.symbol_ids[rule.lhs]
+            rhs = tuple(self.symbol_ids[symbol] for symbol in rule.rhs if symbol != EPSILON)
+            self.rule_lhs.append(lhs)
+            self.rule_rhs.append(rhs)
+
+            # Повторяющиеся правила не порождают отдельных пунктов
+            if (lhs, rhs) not in seen:
+                seen.add((lhs, rhs))
+                self.rules_by_lhs[lhs].append(rule_id)
+
+        self.augmented_rule = -1
+        if augmented_start is not None:
+            self.augmented_rule = len(self.rule_lhs)
+            self.rule_lhs.append(self.augmented_start)
+            self.rule_rhs.append((self.start,))
+            self.rules_by_lhs[self.augmented_start].append(self.augmented_rule)
+
+        # Позиции точки в правилах: (правило, позиция) -> плотный номер.
+        # Дополненное правило идёт первым, чтобы добавление правила в конец
+        # грамматики не сдвигало номера существующих позиций.
+        self.rule_positions: List[int] = [0] * self.n_rules
+        self.position_rule: List[int] = []
+        self.position_dot: List[int] = []
+        self.position_next: List[int] = []
+
+        order = list(range(len(grammar.rules)))
+        if augmented_start is not None:
+            order.insert(0, self.augmented_rule)
+
+        for rule_id in order:
+            rhs = self.rule_rhs[rule_id]
+            self.rule_positions[rule_id] = len(self.position_rule)
+            for dot_pos in range(len(rhs) + 1):
+                self.position_rule.append(rule_id)
+                self.position_dot.append(dot_pos)
+                self.position_next.append(rhs[dot_pos] if dot_pos < len(rhs) else -1)
+
+        self.n_positions = len(self.position_rule)
+
+    @property
+    def n_rules(self) -> int:
+        return len(self.rule_lhs)
+
+    @property
+    def nonterminal_ids(self) -> range:
+        return range(self.n_terminals, self.n_symbols)
+
+    def is_terminal(self, symbol: int) -> bool:
+        return symbol < self.n_terminals
+
+    def is_nonterminal(self, symbol: int) -> bool:
+        return symbol >= self.n_terminals
+
+    def name(self, symbol: int) -> str:
+        return self.symbols[symbol]
+
+    def position(self, rule_id: int, dot_pos: int) -> int:
+        return self.rule_positions[rule_id] + dot_pos
+
+    def lr0_closure(self, kernel: Iterable[int]) -> List[int]:
+        """LR(0)-замыкание: позиции точки, достижимые предсказанием из позиций ядра."""
+        closure = list(kernel)
+        seen = set(closure)
+        predicted = set()
+
+        for core in closure:
+            next_sym = self.position_next[core]
+            if next_sym < self.n_terminals or next_sym in predicted:
+                continue
+            predicted.add(next_sym)
+            for rule in self.rules_by_lhs[next_sym]:
+                position = self.rule_positions[rule]
+                if position not in seen:
+                    seen.add(position)
+                    closure.append(position)
+
+        return closure
+
+    def rule_str(self, rule_id: int) -> str:
+        rhs = format_symbols([self.symbols[s] for s in self.rule_rhs[rule_id]])
+        return f"{self.symbols[self.rule_lhs[rule_id]]} -> {rhs or EPSILON}"
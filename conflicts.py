@@ -0,0 +1,126 @@
+from collections import deque
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+from compiled_grammar import CompiledGrammar
+from grammar import format_symbols
+from parse_tables import ACCEPT, ACTION_NAMES, REDUCE, SHIFT, encode_action
+
+
+class Conflict(NamedTuple):
+    """Ячейка ACTION с несколькими действиями."""
+
+    state: int
+    terminal: int
+    # Закодированные действия по возрастанию (как в ParseTables.conflicts)
+    actions: Tuple[int, ...]
+    # Пункты замыкания состояния, дающие эти действия
+    items: Tuple[int, ...]
+    # Кратчайшая последовательность символов, приводящая автомат в состояние
+    prefix: Tuple[int, ...]
+
+    @property
+    def kind(self) -> str:
+        if any(action & 3 == SHIFT for action in self.actions):
+            return "Shift-reduce"
+        return "Reduce-reduce"
+
+    def to_str(self, compiled: CompiledGrammar) -> str:
+        actions = [_action_str(action) for action in self.actions]
+        prefix = format_symbols([compiled.name(symbol) for symbol in self.prefix]) or 'ε'
+        lines = [f"{self.kind} conflict in state {self.state} on '{compiled.name(self.terminal)}': {actions}",
+                 f"  prefix: {prefix}"]
+        lines.extend(f"  {item}" for item in _format_items(compiled, self.items))
+        return "\n".join(lines)
+
+
+def state_conflicts(compiled: CompiledGrammar, reductions: Sequence[int],
+                    transitions: Dict[int, int]) -> Dict[int, Tuple[int, ...]]:
+    """Конфликтные ячейки одного состояния: терминал -> действия.
+
+    Те же действия, что записывает ParseTables.build, но без построения
+    таблиц — для проверки каждого состояния сразу после его раскрытия.
+    """
+    n_terminals = compiled.n_terminals
+    cells: Dict[int, set] = {}
+
+    for item in reductions:
+        position, lookahead = divmod(item, n_terminals)
+        rule = compiled.position_rule[position]
+        if rule == compiled.augmented_rule:
+            if lookahead != compiled.end:
+                continue
+            action = encode_action(ACCEPT)
+        else:
+            action = encode_action(REDUCE, rule)
+
+        cell = cells.get(lookahead)
+        if cell is None:
+            cell = cells[lookahead] = set()
+            if lookahead in transitions:
+                cell.add(encode_action(SHIFT, transitions[lookahead]))
+        cell.add(action)
+
+    return {terminal: tuple(sorted(actions)) for terminal, actions in sorted(cells.items())
+            if len(actions) > 1}
+
+
+def conflict_items(compiled: CompiledGrammar, closure: Sequence[int], terminal: int) -> Tuple[int, ...]:
+    """Пункты замыкания, участвующие в конфликте по terminal:
+    завершённые с этим предпросмотром и пункты с точкой перед ним."""
+    n_terminals = compiled.n_terminals
+    position_next = compiled.position_next
+    items = []
+    for item in closure:
+        position, lookahead = divmod(item, n_terminals)
+        next_symbol = position_next[position]
+        if next_symbol == terminal or (next_symbol < 0 and lookahead == terminal):
+            items.append(item)
+    return tuple(sorted(items))
+
+
+def shortest_prefix(transitions: Sequence[Dict[int, int]], state: int) -> Tuple[int, ...]:
+    """Кратчайший путь символов из начального состояния в state (обход в ширину).
+
+    transitions может быть недостроенным: при обходе в ширину переходы всех
+    состояний ближе state к моменту его раскрытия уже известны.
+    """
+    parents: Dict[int, Tuple[int, int]] = {0: (-1, -1)}
+    queue = deque([0])
+    while queue and state not in parents:
+        current = queue.popleft()
+        if current >= len(transitions):
+            continue
+        for symbol, target in transitions[current].items():
+            if target not in parents:
+                parents[target] = (current, symbol)
+                queue.append(target)
+
+    prefix: List[int] = []
+    while state:
+        state, symbol = parents[state]
+        prefix.append(symbol)
+    return tuple(reversed(prefix))
+
+
+def _action_str(action: int) -> str:
+    kind = action & 3
+    if kind == ACCEPT:
+        return 'accept'
+    return f'{ACTION_NAMES[kind]}{action >> 2}'
+
+
+def _format_items(compiled: CompiledGrammar, items: Sequence[int]) -> List[str]:
+    # Пункты с одинаковым ядром объединяются: [A → α · β, a/b]
+    n_terminals = compiled.n_terminals
+    lookaheads: Dict[int, List[str]] = {}
+    for item in items:
+        position, lookahead = divmod(item, n_terminals)
+        lookaheads.setdefault(position, []).append(compiled.name(lookahead))
+
+    lines = []
+    for position, names in lookaheads.items():
+        rule = compiled.position_rule[position]
+        rhs = [compiled.name(symbol) for symbol in compiled.rule_rhs[rule]]
+        rhs.insert(compiled.position_dot[position], '·')
+        lhs = compiled.name(compiled.rule_lhs[rule])
+        lines.append(f"[{lhs} → {format_symbols(rhs)}, {'/'.join(names)}]")
+    return lines
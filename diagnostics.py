@@ -0,0 +1,131 @@
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from first_follow import bits_to_ids
+from parse_tables import ParseTables, SHIFT, REDUCE, ACCEPT
+
+
+class Diagnostic(NamedTuple):
+    offset: int
+    # Встреченный терминал; None — символ, не начинающий ни одного терминала
+    found: Optional[str]
+    expected: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        found = 'symbol' if self.found is None else repr(self.found)
+        if self.found == '$':
+            found = 'end of input'
+        return f"{self.offset}: unexpected {found}, expected {', '.join(self.expected) or 'nothing'}"
+
+
+class Diagnoser:
+    """Разбор с поиском всех ошибок за один проход и восстановлением в режиме паники.
+
+    При ошибке стек снимается до ближайшего состояния s с переходом по
+    нетерминалу A, для которого текущий терминал входит в FOLLOW(A); в стек
+    кладётся goto(s, A), и разбор продолжается. Если такого состояния нет,
+    терминал пропускается. До следующего сдвига новые ошибки не сообщаются.
+
+    Ожидаемые терминалы и переходы восстановления вычисляются заранее для
+    каждого состояния, поэтому безошибочный разбор не замедляется.
+    """
+
+    def __init__(self, tables: ParseTables, follow_bits: Sequence[int]):
+        self.tables = tables
+        n_terminals = tables.n_terminals
+        n_nonterminals = tables.n_nonterminals
+
+        self.names = [''] * n_terminals
+        self.names[0] = '$'
+        for name, terminal in tables.terminal_ids.items():
+            self.names[terminal] = name
+
+        action = tables.action
+        goto = tables.goto
+        self.expected: List[Tuple[str, ...]] = []
+        # recovery[state][terminal] — состояние после goto по нетерминалу, за которым может идти terminal
+        self.recovery: List[Dict[int, int]] = []
+
+        for state in range(tables.n_states):
+            row = state * n_terminals
+            self.expected.append(tuple(sorted(self.names[terminal] for terminal in range(n_terminals)
+                                              if action[row + terminal])))
+
+            targets: Dict[int, int] = {}
+            for nonterminal in range(n_nonterminals):
+                target = goto[state * n_nonterminals + nonterminal]
+                if target >= 0:
+                    for terminal in bits_to_ids(follow_bits[nonterminal + n_terminals]):
+                        targets.setdefault(terminal, target)
+            self.recovery.append(targets)
+
+    def diagnose(self, spans: Iterable[Tuple[Optional[int], int]], end: int,
+                 max_errors: Optional[int] = None) -> List[Diagnostic]:
+        """Ошибки разбора последовательности (терминал, смещение); end — смещение конца входа."""
+        tables = self.tables
+        action = tables.action
+        goto = tables.goto
+        rule_lhs = tables.rule_lhs
+        rule_length = tables.rule_length
+        n_terminals = tables.n_terminals
+        n_nonterminals = tables.n_nonterminals
+
+        errors: List[Diagnostic] = []
+        stack = [0]
+        recovering = False
+
+        for token, offset in chain(spans, ((0, end),)):
+            if token is None:
+                if not recovering:
+                    errors.append(Diagnostic(offset, None, self.expected[stack[-1]]))
+                    recovering = True
+                    if max_errors is not None and len(errors) >= max_errors:
+                        return errors
+                continue
+
+            # Для каждого терминала — не больше одной попытки восстановления
+            attempted = False
+            while True:
+                act = action[stack[-1] * n_terminals + token]
+                kind = act & 3
+
+                if kind == SHIFT:
+                    stack.append(act >> 2)
+                    recovering = False
+                    break
+
+                if kind == REDUCE:
+                    rule = act >> 2
+                    length = rule_length[rule]
+                    if length:
+                        del stack[-length:]
+                    next_state = goto[stack[-1] * n_nonterminals + rule_lhs[rule]]
+                    if next_state >= 0:
+                        stack.append(next_state)
+                        continue
+                elif kind == ACCEPT:
+                    return errors
+
+                if not recovering:
+                    errors.append(Diagnostic(offset, self.names[token], self.expected[stack[-1]]))
+                    recovering = True
+                    if max_errors is not None and len(errors) >= max_errors:
+                        return errors
+
+                if attempted or not self._recover(stack, token):
+                    # Терминал пропускается; конец входа пропустить нельзя
+                    if token == 0:
+                        return errors
+                    break
+                attempted = True
+
+        return errors
+
+    def _recover(self, stack: List[int], token: int) -> bool:
+        recovery = self.recovery
+        for depth in range(len(stack) - 1, -1, -1):
+            target = recovery[stack[depth]].get(token)
+            if target is not None:
+                del stack[depth + 1:]
+                stack.append(target)
+                return True
+        return False
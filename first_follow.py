@@ -1,131 +1,281 @@
-from typing import Dict, Set, List
+import copy
+from typing import Dict, Set, List, Optional, Iterable, Tuple
 from grammar import Grammar
+from compiled_grammar import CompiledGrammar, EPSILON
+
+
+def bits_to_ids(bits: int) -> List[int]:
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+def _reachable(sources: Set[int], edges: List[Set[int]]) -> Set[int]:
+    reached = set(sources)
+    stack = list(sources)
+    while stack:
+        for target in edges[stack.pop()]:
+            if target not in reached:
+                reached.add(target)
+                stack.append(target)
+    return reached
 
 
 class FirstFollowCalculator:
-    def __init__(self, grammar: Grammar):
+    def __init__(self, grammar: Grammar, compiled: Optional[CompiledGrammar] = None):
         self.grammar = grammar
+        self.compiled = compiled if compiled is not None else CompiledGrammar(grammar)
         self.first: Dict[str, Set[str]] = {}
         self.follow: Dict[str, Set[str]] = {}
 
-    def compute(self):
-        self._compute_first()
-        self._compute_follow()
+        # Те же множества в номерах символов: битовые маски терминалов (бит t — терминал t)
+        # и признак выводимости ε
+        self.first_bits: List[int] = []
+        self.nullable: List[bool] = []
+        self.follow_bits: List[int] = []
 
-    def _compute_first(self):
-        for nt in self.grammar.nonterminals:
-            self.first[nt] = set()
-        for t in self.grammar.terminals:
-            self.first[t] = {t}
+        # FIRST и выводимость ε суффикса правила, начинающегося с позиции точки
+        self.suffix_first: List[int] = []
+        self.suffix_nullable: List[bool] = []
 
-        if 'ε' not in self.first:
-            self.first['ε'] = {'ε'}
-
-        changed = True
-        while changed:
-            changed = False
-
-            for rule in self.grammar.rules:
-                lhs = rule.lhs
-
-                if not rule.rhs or (len(rule.rhs) == 1 and rule.rhs[0] == 'ε'):
-                    if 'ε' not in self.first[lhs]:
-                        self.first[lhs].add('ε')
-                        changed = True
+    def compute(self):
+        cg = self.compiled
+        self.nullable = [False] * cg.n_symbols
+        self.first_bits = [1 << s if cg.is_terminal(s) else 0 for s in range(cg.n_symbols)]
+        self.follow_bits = [0] * cg.n_symbols
+
+        nonterminals = set(cg.nonterminal_ids)
+        self._compute_nullable(nonterminals)
+        self._compute_first(nonterminals)
+        self._compute_suffixes()
+        self._compute_follow(nonterminals)
+        self._export()
+
+    def copy(self) -> 'FirstFollowCalculator':
+        """Копия, которую можно менять через update(), не затрагивая исходную."""
+        other = copy.copy(self)
+        other.first_bits = list(self.first_bits)
+        other.nullable = list(self.nullable)
+        other.follow_bits = list(self.follow_bits)
+        return other
+
+    def update(self, grammar: Grammar, compiled: CompiledGrammar,
+               changed_rules: List[Tuple[int, Tuple[int, ...]]]) -> Set[int]:
+        """Пересчёт после добавления или удаления правил (lhs, rhs) с теми же символами.
+
+        Пересчитываются только нетерминалы, FIRST которых может зависеть от
+        изменённых правил, и те, на FOLLOW которых влияют изменения.
+        Возвращает нетерминалы, у которых изменились FIRST или выводимость ε.
+        """
+        self.grammar = grammar
+        self.compiled = cg = compiled
+
+        # B -> {A}: B встречается в правой части правила A
+        users: List[Set[int]] = [set() for _ in range(cg.n_symbols)]
+        for rule_id, rhs in enumerate(cg.rule_rhs):
+            for symbol in rhs:
+                if cg.is_nonterminal(symbol):
+                    users[symbol].add(cg.rule_lhs[rule_id])
+
+        affected = _reachable({lhs for lhs, _ in changed_rules}, users)
+        old = {nt: (self.nullable[nt], self.first_bits[nt]) for nt in affected}
+
+        self._compute_nullable(affected)
+        self._compute_first(affected)
+        changed = {nt for nt in affected if old[nt] != (self.nullable[nt], self.first_bits[nt])}
+
+        self._compute_suffixes()
+
+        # FOLLOW меняется у символов изменённых правил и у стоящих перед символами
+        # с изменившимся FIRST, а дальше — по зависимостям FOLLOW(A) -> FOLLOW(X)
+        seeds = {symbol for _, rhs in changed_rules for symbol in rhs if cg.is_nonterminal(symbol)}
+        follow_users: List[Set[int]] = [set() for _ in range(cg.n_symbols)]
+
+        for rule_id, rhs in enumerate(cg.rule_rhs):
+            lhs = cg.rule_lhs[rule_id]
+            start = cg.rule_positions[rule_id]
+            seen_changed = False
+            for dot_pos in range(len(rhs) - 1, -1, -1):
+                symbol = rhs[dot_pos]
+                if cg.is_nonterminal(symbol):
+                    if seen_changed:
+                        seeds.add(symbol)
+                    if self.suffix_nullable[start + dot_pos + 1]:
+                        follow_users[lhs].add(symbol)
+                if symbol in changed:
+                    seen_changed = True
+
+        self._compute_follow(_reachable(seeds, follow_users))
+        self._export()
+
+        return changed
+
+    def _compute_nullable(self, affected: Set[int]):
+        cg = self.compiled
+        nullable = self.nullable
+        for nt in affected:
+            nullable[nt] = False
+
+        rules = [rule_id for rule_id in range(cg.n_rules) if cg.rule_lhs[rule_id] in affected]
+
+        # Для каждого правила — число ещё не выводящих ε символов правой части
+        remaining = {}
+        occurrences: Dict[int, List[int]] = {}
+        for rule_id in rules:
+            count = 0
+            for symbol in cg.rule_rhs[rule_id]:
+                if not nullable[symbol]:
+                    count += 1
+                    occurrences.setdefault(symbol, []).append(rule_id)
+            remaining[rule_id] = count
+
+        worklist = [cg.rule_lhs[rule_id] for rule_id in rules if not remaining[rule_id]]
+
+        while worklist:
+            symbol = worklist.pop()
+            if nullable[symbol]:
+                continue
+            nullable[symbol] = True
+
+            for rule_id in occurrences.get(symbol, ()):
+                remaining[rule_id] -= 1
+                if not remaining[rule_id]:
+                    worklist.append(cg.rule_lhs[rule_id])
+
+    def _compute_first(self, affected: Set[int]):
+        cg = self.compiled
+        nullable = self.nullable
+        first_bits = self.first_bits
+        for nt in affected:
+            first_bits[nt] = 0
+
+        # B -> [A, ...]: FIRST(B) входит в FIRST(A), если B стоит после ε-выводимого префикса правила A
+        dependents: Dict[int, Set[int]] = {}
+
+        for rule_id, rhs in enumerate(cg.rule_rhs):
+            lhs = cg.rule_lhs[rule_id]
+            if lhs not in affected:
+                continue
+            for symbol in rhs:
+                if symbol not in affected:
+                    first_bits[lhs] |= first_bits[symbol]
+                elif symbol != lhs:
+                    dependents.setdefault(symbol, set()).add(lhs)
+                if not nullable[symbol]:
+                    break
+
+        worklist = [nt for nt in affected if first_bits[nt]]
+
+        while worklist:
+            symbol = worklist.pop()
+            bits = first_bits[symbol]
+            for dependent in dependents.get(symbol, ()):
+                if bits & ~first_bits[dependent]:
+                    first_bits[dependent] |= bits
+                    worklist.append(dependent)
+
+    def _compute_suffixes(self):
+        cg = self.compiled
+        first_bits = self.first_bits
+        nullable = self.nullable
+        self.suffix_first = [0] * cg.n_positions
+        self.suffix_nullable = [True] * cg.n_positions
+
+        for rule_id, rhs in enumerate(cg.rule_rhs):
+            start = cg.rule_positions[rule_id]
+            bits = 0
+            all_nullable = True
+            for dot_pos in range(len(rhs) - 1, -1, -1):
+                symbol = rhs[dot_pos]
+                if nullable[symbol]:
+                    bits |= first_bits[symbol]
+                else:
+                    bits = first_bits[symbol]
+                    all_nullable = False
+                self.suffix_first[start + dot_pos] = bits
+                self.suffix_nullable[start + dot_pos] = all_nullable
+
+    def _compute_follow(self, affected: Set[int]):
+        cg = self.compiled
+        follow_bits = self.follow_bits
+        for nt in affected:
+            follow_bits[nt] = 0
+
+        if cg.start in affected:
+            follow_bits[cg.start] |= 1 << cg.end
+
+        # A -> [X, ...]: FOLLOW(A) входит в FOLLOW(X), если после X в правиле A стоит ε-выводимый суффикс
+        dependents: Dict[int, Set[int]] = {}
+
+        for rule_id, rhs in enumerate(cg.rule_rhs):
+            lhs = cg.rule_lhs[rule_id]
+            start = cg.rule_positions[rule_id]
+            for dot_pos, symbol in enumerate(rhs):
+                if symbol not in affected:
                     continue
+                follow_bits[symbol] |= self.suffix_first[start + dot_pos + 1]
+                if self.suffix_nullable[start + dot_pos + 1]:
+                    if lhs not in affected:
+                        follow_bits[symbol] |= follow_bits[lhs]
+                    elif symbol != lhs:
+                        dependents.setdefault(lhs, set()).add(symbol)
+
+        worklist = [nt for nt in affected if follow_bits[nt]]
+
+        while worklist:
+            symbol = worklist.pop()
+            bits = follow_bits[symbol]
+            for dependent in dependents.get(symbol, ()):
+                if bits & ~follow_bits[dependent]:
+                    follow_bits[dependent] |= bits
+                    worklist.append(dependent)
+
+    def first_of_ids(self, symbols: Iterable[int]) -> Tuple[Set[int], bool]:
+        bits = 0
 
-                all_epsilon = True
-                for symbol in rule.rhs:
-                    if symbol == 'ε':
-                        continue
-
-                    if symbol in self.grammar.terminals:
-                        to_add = {symbol}
-                        if to_add - self.first[lhs]:
-                            self.first[lhs].update(to_add)
-                            changed = True
-                        all_epsilon = False
-                        break
-
-                    if symbol in self.first:
-                        to_add = self.first[symbol] - {'ε'}
-                        if to_add - self.first[lhs]:
-                            self.first[lhs].update(to_add)
-                            changed = True
-
-                        if 'ε' not in self.first[symbol]:
-                            all_epsilon = False
-                            break
-
-                if all_epsilon and 'ε' not in self.first[lhs]:
-                    self.first[lhs].add('ε')
-                    changed = True
-
-    def _compute_follow(self):
-        for nt in self.grammar.nonterminals:
-            self.follow[nt] = set()
-
-        self.follow[self.grammar.start_symbol].add('$')
-
-        changed = True
-        while changed:
-            changed = False
-
-            for rule in self.grammar.rules:
-                rhs = rule.rhs
+        for symbol in symbols:
+            bits |= self.first_bits[symbol]
+            if not self.nullable[symbol]:
+                return set(bits_to_ids(bits)), False
 
-                if not rhs or (len(rhs) == 1 and rhs[0] == 'ε'):
-                    continue
+        return set(bits_to_ids(bits)), True
 
-                for i in range(len(rhs)):
-                    symbol = rhs[i]
+    def _export(self):
+        cg = self.compiled
+        names = cg.symbols
 
-                    if not self.grammar.is_nonterminal(symbol):
-                        continue
+        self.first = {}
+        self.follow = {}
 
-                    if i + 1 < len(rhs):
-                        remaining = rhs[i + 1:]
-                        first_of_remaining = self._first_of_string(remaining)
+        for nt in self.grammar.nonterminals:
+            nt_id = cg.symbol_ids[nt]
+            self.first[nt] = {names[t] for t in bits_to_ids(self.first_bits[nt_id])}
+            if self.nullable[nt_id]:
+                self.first[nt].add(EPSILON)
+            self.follow[nt] = {names[t] for t in bits_to_ids(self.follow_bits[nt_id])}
 
-                        to_add = first_of_remaining - {'ε'}
-                        if to_add - self.follow[symbol]:
-                            self.follow[symbol].update(to_add)
-                            changed = True
+        for t in self.grammar.terminals:
+            self.first[t] = {t}
 
-                        if 'ε' in first_of_remaining:
-                            to_add = self.follow[rule.lhs] - self.follow[symbol]
-                            if to_add:
-                                self.follow[symbol].update(to_add)
-                                changed = True
-                    else:
-                        to_add = self.follow[rule.lhs] - self.follow[symbol]
-                        if to_add:
-                            self.follow[symbol].update(to_add)
-                            changed = True
+        if EPSILON not in self.first:
+            self.first[EPSILON] = {EPSILON}
 
     def _first_of_string(self, symbols: List[str]) -> Set[str]:
-        if not symbols:
-            return {'ε'}
-
-        result = set()
-
+        ids = []
         for symbol in symbols:
-            if symbol == 'ε':
+            if symbol == EPSILON:
                 continue
-
-            if symbol in self.grammar.terminals:
-                result.add(symbol)
-                return result
-
-            if symbol in self.first:
-                result.update(self.first[symbol] - {'ε'})
-
-                if 'ε' not in self.first[symbol]:
-                    return result
-            else:
-                return result
-
-        result.add('ε')
+            if symbol not in self.compiled.symbol_ids:
+                return {self.compiled.name(t) for t in self.first_of_ids(ids)[0]}
+            ids.append(self.compiled.symbol_ids[symbol])
+
+        first, nullable = self.first_of_ids(ids)
+        result = {self.compiled.name(t) for t in first}
+        if nullable:
+            result.add(EPSILON)
         return result
 
     def get_first(self, symbol: str) -> Set[str]:
@@ -137,4 +287,4 @@ class FirstFollowCalculator:
             return set()
 
     def get_follow(self, nonterminal: str) -> Set[str]:
-        return self.follow.get(nonterminal, set())
\ No newline at end of file
+        return self.follow.get(nonterminal, set())
@@ -0,0 +1,71 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterator, Optional
+
+
+@dataclass
+class FitStats:
+    """Счётчики и время фаз построения парсера (включаются явно, см. LR1Parser)."""
+
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    # Извлечений ядер из очереди в замыканиях
+    closure_iterations: int = 0
+    closures: int = 0
+    # Пунктов во всех построенных замыканиях
+    items_created: int = 0
+    largest_closure: int = 0
+    # Пунктов, хранимых в состояниях (ядра и завершённые пункты)
+    stored_items: int = 0
+    states: int = 0
+    goto_transitions: int = 0
+    action_entries: int = 0
+    action_table_bytes: int = 0
+
+    @property
+    def peak_items(self) -> int:
+        """Оценка сверху числа пунктов в памяти: замыкания отбрасываются после обработки."""
+        return self.stored_items + self.largest_closure
+
+    def reset(self):
+        for f in fields(self):
+            setattr(self, f.name, f.default_factory() if f.name == 'phase_seconds' else f.default)
+
+    def merge_closures(self, other: 'FitStats'):
+        """Добавление счётчиков замыканий, посчитанных в другом процессе."""
+        self.closures += other.closures
+        self.closure_iterations += other.closure_iterations
+        self.items_created += other.items_created
+        self.largest_closure = max(self.largest_closure, other.largest_closure)
+
+    def report(self) -> str:
+        lines = [f"{phase:>18}: {seconds * 1e3:10.1f} ms" for phase, seconds in self.phase_seconds.items()]
+        lines.append(f"{'total':>18}: {sum(self.phase_seconds.values()) * 1e3:10.1f} ms")
+        counters = [
+            ('states', self.states),
+            ('goto transitions', self.goto_transitions),
+            ('closures', self.closures),
+            ('closure iterations', self.closure_iterations),
+            ('items created', self.items_created),
+            ('largest closure', self.largest_closure),
+            ('stored items', self.stored_items),
+            ('peak items', self.peak_items),
+            ('action entries', self.action_entries),
+            ('action table bytes', self.action_table_bytes),
+        ]
+        lines.extend(f"{name:>18}: {value}" for name, value in counters)
+        return "\n".join(lines)
+
+
+@contextmanager
+def measure(stats: Optional[FitStats], phase: str) -> Iterator[None]:
+    """Время фазы прибавляется к stats.phase_seconds[phase]; без stats — ничего."""
+    if stats is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phase_seconds[phase] = stats.phase_seconds.get(phase, 0.0) + time.perf_counter() - start
@@ -0,0 +1,214 @@
+from array import array
+from collections import deque
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from parse_tables import ParseTables, ERROR, SHIFT, REDUCE, ACCEPT, encode_action
+
+
+# Отметка конфликтной ячейки в копии таблицы action
+CONFLICT = encode_action(ERROR, 1)
+
+
+class _Node:
+    """Вершина графа стеков: состояние и ссылки на вершины под ним."""
+
+    __slots__ = ('state', 'links')
+
+    def __init__(self, state: int, links: List['_Node']):
+        self.state = state
+        self.links = links
+
+
+class GLRRecognizer:
+    """Распознаватель GLR (Томита) по таблицам LR с конфликтами.
+
+    Пока действия однозначны, разбор идёт обычным стеком LR. В первой
+    конфликтной ячейке стек превращается в граф стеков: все стеки хранятся
+    вместе, вершины одного уровня (позиции во входе) с одинаковым состоянием
+    сливаются, и все действия ячейки выполняются над всеми вершинами уровня.
+    Когда к уже обработанной вершине добавляется ссылка, свёртки уровня
+    повторяются только по путям через новую ссылку (поправка Фарши), поэтому
+    ε-правила и циклы внутри уровня обрабатываются корректно.
+
+    На входе, где конфликты не встречаются или быстро разрешаются, на каждом
+    уровне остаётся одна-две вершины, и время разбора линейно.
+    """
+
+    def __init__(self, tables: ParseTables):
+        self.tables = tables
+        # Копия action, в которой конфликтные ячейки отмечены CONFLICT
+        self.action = tables.action
+        if tables.conflicts:
+            self.action = array('i', tables.action)
+            for index in tables.conflicts:
+                self.action[index] = CONFLICT
+
+    def tokens(self, word: str) -> Iterable[Optional[int]]:
+        return self.tables.tokens(word)
+
+    def recognize(self, tokens: Iterable[Optional[int]]) -> bool:
+        """Разбор последовательности номеров терминалов; None — неизвестный символ."""
+        tables = self.tables
+        action = self.action
+        goto = tables.goto
+        rule_lhs = tables.rule_lhs
+        rule_length = tables.rule_length
+        n_terminals = tables.n_terminals
+        n_nonterminals = tables.n_nonterminals
+
+        stack = [0]
+        tokens = chain(tokens, (0,))
+
+        for token in tokens:
+            if token is None:
+                return False
+
+            while True:
+                act = action[stack[-1] * n_terminals + token]
+                kind = act & 3
+
+                if kind == SHIFT:
+                    stack.append(act >> 2)
+                    break
+
+                if kind == REDUCE:
+                    rule = act >> 2
+                    length = rule_length[rule]
+                    if length:
+                        del stack[-length:]
+                    next_state = goto[stack[-1] * n_nonterminals + rule_lhs[rule]]
+                    if next_state < 0:
+                        return False
+                    stack.append(next_state)
+                elif kind == ACCEPT:
+                    return True
+                elif act == CONFLICT:
+                    return self._recognize_graph(stack, token, tokens)
+                else:
+                    return False
+
+        return False
+
+    def recognize_many(self, words: Sequence[str]) -> List[bool]:
+        return [self.recognize(self.tables.tokens(word)) for word in words]
+
+    def _actions(self, state: int, token: int) -> Tuple[int, ...]:
+        index = state * self.tables.n_terminals + token
+        actions = self.tables.conflicts.get(index)
+        if actions is not None:
+            return actions
+        act = self.tables.action[index]
+        return (act,) if act else ()
+
+    def _recognize_graph(self, stack: List[int], token: int, tokens: Iterator[Optional[int]]) -> bool:
+        top = None
+        for state in stack:
+            top = _Node(state, [top] if top is not None else [])
+        level = {top.state: top}
+
+        while True:
+            if token is None:
+                return False
+            if self._reduce_level(level, token):
+                return True
+            if token == 0:
+                return False
+
+            level = self._shift_level(level, token)
+            if not level:
+                return False
+            token = next(tokens)
+
+    def _reduce_level(self, level: Dict[int, _Node], token: int) -> bool:
+        """Все свёртки уровня по терминалу token; True, если вход допущен."""
+        goto = self.tables.goto
+        rule_lhs = self.tables.rule_lhs
+        rule_length = self.tables.rule_length
+        n_nonterminals = self.tables.n_nonterminals
+
+        nodes = list(level.values())
+        # Ссылки, добавленные на этом уровне, и среди них — ссылки внутри уровня
+        # (после ε-свёрток): только по ним путь может вернуться к вершине уровня
+        links: Set[Tuple[int, int]] = set()
+        inner: Dict[int, List[_Node]] = {}
+        # Свёртки: (вершина, правило, ссылка, через которую должен пройти путь)
+        work = deque()
+        accepted = False
+
+        def schedule(node: _Node, link: Optional[Tuple[_Node, _Node]]) -> bool:
+            found_accept = False
+            for act in self._actions(node.state, token):
+                kind = act & 3
+                if kind == REDUCE:
+                    rule = act >> 2
+                    if link is None or rule_length[rule]:
+                        work.append((node, rule, link))
+                elif kind == ACCEPT:
+                    found_accept = True
+            return found_accept
+
+        for node in nodes:
+            accepted |= schedule(node, None)
+
+        while work:
+            node, rule, link = work.popleft()
+            lhs = rule_lhs[rule]
+            for base in _path_ends(node, rule_length[rule], link, inner):
+                target = goto[base.state * n_nonterminals + lhs]
+                if target < 0 or (target, id(base)) in links:
+                    continue
+                links.add((target, id(base)))
+                if level.get(base.state) is base:
+                    inner.setdefault(target, []).append(base)
+
+                existing = level.get(target)
+                if existing is None:
+                    new = _Node(target, [base])
+                    level[target] = new
+                    nodes.append(new)
+                    accepted |= schedule(new, None)
+                else:
+                    existing.links.append(base)
+                    for other in nodes:
+                        schedule(other, (existing, base))
+
+        return accepted
+
+    def _shift_level(self, level: Dict[int, _Node], token: int) -> Dict[int, _Node]:
+        shifted: Dict[int, _Node] = {}
+        for node in level.values():
+            for act in self._actions(node.state, token):
+                if act & 3 == SHIFT:
+                    target = act >> 2
+                    existing = shifted.get(target)
+                    if existing is None:
+                        shifted[target] = _Node(target, [node])
+                    else:
+                        existing.links.append(node)
+        return shifted
+
+
+def _path_ends(node: _Node, length: int, link: Optional[Tuple[_Node, _Node]],
+               inner: Dict[int, List[_Node]]) -> List[_Node]:
+    """Концы путей длины length из node; с link — только путей, проходящих через эту ссылку.
+
+    Ссылка link начинается на текущем уровне, поэтому до неё путь идёт
+    только по ссылкам внутри уровня (inner[состояние]).
+    """
+    if link is None:
+        ends = [node]
+        for _ in range(length):
+            ends = list({id(end): end for current in ends for end in current.links}.values())
+        return ends
+
+    source, target = link
+    # Пути, ещё не прошедшие через link, и прошедшие
+    before = [node]
+    after: List[_Node] = []
+    for _ in range(length):
+        following = {id(end): end for current in after for end in current.links}
+        if any(current is source for current in before):
+            following[id(target)] = target
+        after = list(following.values())
+        before = list({id(end): end for current in before for end in inner.get(current.state, ())}.values())
+    return after
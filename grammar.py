@@ -1,18 +1,35 @@
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import dataclass, field
 from typing import List, Set, Dict
 from collections import defaultdict
 
 
+def format_symbols(symbols: List[str]) -> str:
+    # Односимвольные символы пишутся слитно, как во входном формате, остальные — через пробел
+    if all(len(symbol) == 1 for symbol in symbols):
+        return ''.join(symbols)
+    return ' '.join(symbols)
+
+
 @dataclass(frozen=True)
 class Rule:
     lhs: str
     rhs: List[str]
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash((self.lhs, tuple(self.rhs))))
 
     def __str__(self) -> str:
-        return f"{self.lhs} -> {''.join(self.rhs) if self.rhs else 'ε'}"
+        return f"{self.lhs} -> {format_symbols(self.rhs) if self.rhs else 'ε'}"
 
     def __hash__(self):
-        return hash((self.lhs, tuple(self.rhs)))
+        return self._hash
+
+    def __reduce__(self):
+        # Хэш строк зависит от процесса (PYTHONHASHSEED): при распаковке он вычисляется заново
+        return Rule, (self.lhs, self.rhs)
 
 
 class Grammar:
@@ -43,6 +60,16 @@ class Grammar:
             return False
         return True
 
+    def fingerprint(self) -> str:
+        """SHA-256 от правил (с учётом порядка), стартового символа и множеств символов."""
+        payload = json.dumps([
+            self.start_symbol,
+            sorted(self.terminals),
+            sorted(self.nonterminals),
+            [[rule.lhs, list(rule.rhs)] for rule in self.rules],
+        ], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
     def __str__(self) -> str:
         rules_str = '\n'.join(str(rule) for rule in self.rules)
         return f"Grammar(S={self.start_symbol}, rules={len(self.rules)})\n{rules_str}"
\ No newline at end of file
@@ -1,5 +1,6 @@
 import sys
-from typing import Tuple, List
+from itertools import islice
+from typing import Iterable, Iterator, Set, TextIO, Tuple, List
 from grammar import Grammar, Rule
 
 
@@ -7,57 +8,107 @@ class GrammarParser:
     @staticmethod
     def parse_from_stdin() -> Tuple[Grammar, List[str]]:
         """Парсинг грамматики из stdin в формате задания."""
-        lines = [line.strip() for line in sys.stdin if line.strip()]
+        grammar, words = GrammarParser.parse_stream(sys.stdin)
+        return grammar, list(words)
 
-        if not lines:
+    @staticmethod
+    def parse_stream(stream: TextIO = None) -> Tuple[Grammar, Iterator[str]]:
+        """Потоковый парсинг: заголовок с грамматикой читается сразу, слова — лениво.
+
+        Возвращает грамматику и генератор слов, который читает поток по мере
+        обращения, так что память не зависит от количества слов.
+        """
+        lines = GrammarParser._nonempty_lines(sys.stdin if stream is None else stream)
+
+        def next_line(what: str) -> str:
+            line = next(lines, None)
+            if line is None:
+                raise ValueError(f"Unexpected end of input: expected {what}")
+            return line
+
+        first_line = next(lines, None)
+        if first_line is None:
             raise ValueError("Empty input")
 
         # Парсинг размеров
         try:
-            n_nt, n_t, n_rules = map(int, lines[0].split())
+            n_nt, n_t, n_rules = map(int, first_line.split())
         except ValueError:
             raise ValueError("Invalid format in first line")
 
         # Нетерминалы
-        nonterminals = set(lines[1].split())
+        nonterminals = set(next_line("nonterminals").split())
         if len(nonterminals) != n_nt:
             raise ValueError(f"Expected {n_nt} nonterminals, got {len(nonterminals)}")
 
         # Терминалы
-        terminals = set(lines[2].split())
+        terminals = set(next_line("terminals").split())
         if len(terminals) != n_t:
             raise ValueError(f"Expected {n_t} terminals, got {len(terminals)}")
 
-        rules = []
-        rule_lines = lines[3:3 + n_rules]
-
-        for rule_line in rule_lines:
-            if '->' not in rule_line:
-                raise ValueError(f"Invalid rule format: {rule_line}")
-
-            lhs, rhs_str = rule_line.split('->', 1)
-            lhs = lhs.strip()
-            rhs_str = rhs_str.strip()
-
-            if rhs_str == '':
-                rhs = ['ε']
-            else:
-                rhs = list(rhs_str.replace(' ', ''))
+        symbols = nonterminals | terminals
+        rules = [GrammarParser._parse_rule(next_line("rule"), symbols) for _ in range(n_rules)]
 
-            rules.append(Rule(lhs, rhs))
-
-        start_symbol = lines[3 + n_rules].strip()
+        start_symbol = next_line("start symbol").strip()
 
         try:
-            m = int(lines[3 + n_rules + 1])
+            m = int(next_line("number of words"))
         except ValueError:
             raise ValueError("Invalid number of words")
 
-        words = lines[3 + n_rules + 2:3 + n_rules + 2 + m]
-
         grammar = Grammar(nonterminals, terminals, rules, start_symbol)
 
         if not grammar.validate():
             raise ValueError("Invalid grammar")
 
-        return grammar, words
\ No newline at end of file
+        return grammar, islice(lines, m)
+
+    @staticmethod
+    def _nonempty_lines(stream: Iterable[str]) -> Iterator[str]:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+
+    @staticmethod
+    def _parse_rule(rule_line: str, symbols: Set[str] = frozenset()) -> Rule:
+        if '->' not in rule_line:
+            raise ValueError(f"Invalid rule format: {rule_line}")
+
+        lhs, rhs_str = rule_line.split('->', 1)
+        lhs = lhs.strip()
+        rhs_str = rhs_str.strip()
+
+        if rhs_str == '':
+            rhs = ['ε']
+        else:
+            rhs = []
+            for part in rhs_str.split():
+                rhs.extend(GrammarParser._split_symbols(part, symbols))
+
+        return Rule(lhs, rhs)
+
+    @staticmethod
+    def _split_symbols(text: str, symbols: Set[str]) -> List[str]:
+        """Разбиение слитной записи на символы грамматики по самому длинному совпадению.
+
+        Символы можно разделять пробелами ("id + num"), а односимвольные — писать
+        слитно ("aSbS"). Неизвестные символы берутся по одному знаку.
+        """
+        if text in symbols:
+            return [text]
+
+        max_length = max((len(symbol) for symbol in symbols), default=1)
+        result = []
+        i = 0
+
+        while i < len(text):
+            for length in range(min(max_length, len(text) - i), 0, -1):
+                if text[i:i + length] in symbols:
+                    break
+            else:
+                length = 1
+            result.append(text[i:i + length])
+            i += length
+
+        return result
@@ -0,0 +1,123 @@
+from typing import Dict, List, Set, Tuple
+from collections import deque
+from lr_item import LRState
+
+
+# Фиктивный lookahead для выделения распространяемых lookahead
+PROPAGATE = -1
+
+
+class LALRBuilder:
+    """Построение LALR(1)-автомата: LR(0)-ядра и распространение lookahead.
+
+    Для каждого ядерного пункта замыкание строится с фиктивным lookahead
+    PROPAGATE (-1, не номер терминала): обычные lookahead порождаются
+    спонтанно, PROPAGATE означает распространение от исходного пункта
+    (алгоритм из «Книги дракона»).
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.compiled = parser.compiled
+        self.kernels: List[Tuple[int, ...]] = []
+        self.transitions: List[Dict[int, int]] = []
+        self.lookaheads: List[Dict[int, Set[int]]] = []
+
+    def build(self) -> Tuple[List[LRState], List[Dict[int, int]]]:
+        self._build_lr0_collection()
+        self._propagate_lookaheads()
+
+        parser = self.parser
+        cg = self.compiled
+        n_terminals = cg.n_terminals
+        intern = parser.item_pool.intern
+        states = []
+
+        # В состоянии остаются ядро и завершённые пункты замыкания
+        for index, kernel_lookaheads in enumerate(self.lookaheads):
+            kernel = [intern(core * n_terminals + lookahead)
+                      for core, lookaheads in kernel_lookaheads.items()
+                      for lookahead in lookaheads]
+            lookaheads_by_core = {core: set(lookaheads)
+                                  for core, lookaheads in kernel_lookaheads.items()}
+            parser._close(lookaheads_by_core)
+            reductions = [intern(core * n_terminals + lookahead)
+                          for core, lookaheads in lookaheads_by_core.items()
+                          if cg.position_next[core] < 0
+                          for lookahead in sorted(lookaheads)]
+            states.append(LRState(kernel, index, reductions, parser.item_pool))
+
+        return states, self.transitions
+
+    def _build_lr0_collection(self):
+        cg = self.compiled
+        start_kernel = (cg.rule_positions[cg.augmented_rule],)
+        self.kernels = [start_kernel]
+        self.transitions = []
+        kernel_index = {start_kernel: 0}
+        queue = deque([0])
+
+        while queue:
+            index = queue.popleft()
+            by_symbol: Dict[int, List[int]] = {}
+
+            for core in cg.lr0_closure(self.kernels[index]):
+                next_sym = cg.position_next[core]
+                if next_sym >= 0:
+                    by_symbol.setdefault(next_sym, []).append(core + 1)
+
+            state_transitions = {}
+            for symbol in sorted(by_symbol):
+                kernel = tuple(sorted(by_symbol[symbol]))
+                target = kernel_index.get(kernel)
+                if target is None:
+                    target = len(self.kernels)
+                    kernel_index[kernel] = target
+                    self.kernels.append(kernel)
+                    queue.append(target)
+                state_transitions[symbol] = target
+
+            self.transitions.append(state_transitions)
+
+    def _propagate_lookaheads(self):
+        cg = self.compiled
+        self.lookaheads = [{core: set() for core in kernel} for kernel in self.kernels]
+        self.lookaheads[0][self.kernels[0][0]].add(cg.end)
+
+        # (состояние, ядерный пункт) -> куда распространяются его lookahead
+        channels: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+        for index, kernel in enumerate(self.kernels):
+            state_transitions = self.transitions[index]
+
+            for kernel_core in kernel:
+                closure = self.parser._close({kernel_core: {PROPAGATE}})
+
+                for core, lookaheads in closure.items():
+                    next_sym = cg.position_next[core]
+                    if next_sym < 0:
+                        continue
+
+                    target = state_transitions[next_sym]
+                    target_lookaheads = self.lookaheads[target][core + 1]
+
+                    for lookahead in lookaheads:
+                        if lookahead == PROPAGATE:
+                            channels.setdefault((index, kernel_core), []).append((target, core + 1))
+                        else:
+                            target_lookaheads.add(lookahead)
+
+        worklist = deque((index, core)
+                         for index, kernel_lookaheads in enumerate(self.lookaheads)
+                         for core, lookaheads in kernel_lookaheads.items() if lookaheads)
+
+        while worklist:
+            source = worklist.popleft()
+            lookaheads = self.lookaheads[source[0]][source[1]]
+
+            for target, core in channels.get(source, ()):
+                target_lookaheads = self.lookaheads[target][core]
+                added = lookaheads - target_lookaheads
+                if added:
+                    target_lookaheads.update(added)
+                    worklist.append((target, core))
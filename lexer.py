@@ -0,0 +1,103 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+WHITESPACE = ' \t\r\n\f\v'
+
+
+class Lexer:
+    """Разбиение слова на терминалы по самому длинному совпадению.
+
+    Терминалы собираются в префиксное дерево (детерминированный автомат) один
+    раз при построении таблиц. Если есть многосимвольные терминалы, пробельные
+    символы, с которых не начинается ни один терминал, разделяют лексемы и
+    пропускаются; при односимвольных терминалах каждый символ слова — лексема.
+    """
+
+    def __init__(self, terminal_ids: Dict[str, int]):
+        self.terminal_ids = terminal_ids
+        self.edges: List[Dict[str, int]] = [{}]
+        self.accept: List[int] = [-1]
+
+        for name, terminal in terminal_ids.items():
+            node = 0
+            for ch in name:
+                next_node = self.edges[node].get(ch)
+                if next_node is None:
+                    next_node = len(self.edges)
+                    self.edges[node][ch] = next_node
+                    self.edges.append({})
+                    self.accept.append(-1)
+                node = next_node
+            self.accept[node] = terminal
+
+        # Все терминалы односимвольные: лексемы — просто символы слова, пробелы не пропускаются
+        self.single_char = all(len(name) == 1 for name in terminal_ids)
+        self.skip = frozenset() if self.single_char else \
+            frozenset(ch for ch in WHITESPACE if ch not in self.edges[0])
+
+    def tokens(self, text: str) -> Iterator[Optional[int]]:
+        """Номера терминалов по мере чтения; None — дальше слово не разбирается."""
+        if self.single_char:
+            return map(self.terminal_ids.get, text)
+        return self._longest_match(text)
+
+    def _longest_match(self, text: str) -> Iterator[Optional[int]]:
+        edges = self.edges
+        accept = self.accept
+        skip = self.skip
+        length = len(text)
+        i = 0
+
+        while i < length:
+            if text[i] in skip:
+                i += 1
+                continue
+
+            node = 0
+            j = i
+            token = -1
+            end = i
+            while j < length:
+                node = edges[node].get(text[j])
+                if node is None:
+                    break
+                j += 1
+                if accept[node] >= 0:
+                    token = accept[node]
+                    end = j
+
+            if token < 0:
+                yield None
+                return
+
+            yield token
+            i = end
+
+    def spans(self, text: str) -> Iterator[Tuple[Optional[int], int]]:
+        """Пары (терминал, смещение в text); после нераспознанного символа (None) разбор продолжается со следующего."""
+        edges = self.edges
+        accept = self.accept
+        skip = self.skip
+        length = len(text)
+        i = 0
+
+        while i < length:
+            if text[i] in skip:
+                i += 1
+                continue
+
+            node = 0
+            j = i
+            token = -1
+            end = i + 1
+            while j < length:
+                node = edges[node].get(text[j])
+                if node is None:
+                    break
+                j += 1
+                if accept[node] >= 0:
+                    token = accept[node]
+                    end = j
+
+            yield (token if token >= 0 else None), i
+            i = end
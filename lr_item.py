@@ -1,36 +1,87 @@
-from dataclasses import dataclass
-from typing import Optional
-from grammar import Rule
+from typing import Dict, NamedTuple, Optional
+from compiled_grammar import CompiledGrammar
+from grammar import format_symbols
 
 
-@dataclass(frozen=True)
-class LRItem:
-    rule: Rule
+class LRItem(NamedTuple):
+    rule: int
     dot_pos: int
-    lookahead: str
+    lookahead: int
 
-    def next_symbol(self) -> Optional[str]:
-        if self.dot_pos < len(self.rule.rhs):
-            return self.rule.rhs[self.dot_pos]
+    def next_symbol(self, grammar: CompiledGrammar) -> Optional[int]:
+        rhs = grammar.rule_rhs[self.rule]
+        if self.dot_pos < len(rhs):
+            return rhs[self.dot_pos]
         return None
 
-    def is_complete(self) -> bool:
-        return self.dot_pos == len(self.rule.rhs)
+    def is_complete(self, grammar: CompiledGrammar) -> bool:
+        return self.dot_pos == len(grammar.rule_rhs[self.rule])
 
     def shift(self) -> 'LRItem':
         return LRItem(self.rule, self.dot_pos + 1, self.lookahead)
 
-    def __str__(self) -> str:
-        rhs = self.rule.rhs.copy()
+    def to_str(self, grammar: CompiledGrammar) -> str:
+        rhs = [grammar.name(s) for s in grammar.rule_rhs[self.rule]]
         rhs.insert(self.dot_pos, '·')
-        rhs_str = ''.join(rhs) if rhs else '·'
-        return f"[{self.rule.lhs} → {rhs_str}, {self.lookahead}]"
+        rhs_str = format_symbols(rhs)
+        lhs = grammar.name(grammar.rule_lhs[self.rule])
+        return f"[{lhs} → {rhs_str}, {grammar.name(self.lookahead)}]"
+
+
+class ItemPool:
+    """LR(1)-пункты, упакованные в целые числа position * n_terminals + lookahead.
+
+    Равные пункты интернируются, поэтому множества состояний ссылаются
+    на одни и те же объекты. Сдвиг точки — прибавление n_terminals.
+    """
+
+    __slots__ = ('grammar', 'n_terminals', '_items')
+
+    def __init__(self, grammar: CompiledGrammar):
+        self.grammar = grammar
+        self.n_terminals = grammar.n_terminals
+        self._items: Dict[int, int] = {}
+
+    def item(self, rule: int, dot_pos: int, lookahead: int) -> int:
+        return self.intern(self.grammar.position(rule, dot_pos) * self.n_terminals + lookahead)
+
+    def intern(self, item: int) -> int:
+        return self._items.setdefault(item, item)
+
+    def position(self, item: int) -> int:
+        return item // self.n_terminals
+
+    def lookahead(self, item: int) -> int:
+        return item % self.n_terminals
+
+    def decode(self, item: int) -> LRItem:
+        position, lookahead = divmod(item, self.n_terminals)
+        return LRItem(self.grammar.position_rule[position],
+                      self.grammar.position_dot[position], lookahead)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def copy(self, grammar: CompiledGrammar) -> 'ItemPool':
+        """Пул с теми же интернированными пунктами для грамматики с теми же позициями."""
+        pool = ItemPool(grammar)
+        pool._items = dict(self._items)
+        return pool
 
 
 class LRState:
-    def __init__(self, items, index=-1):
+    """Состояние автомата, заданное ядерными пунктами.
+
+    Пункты замыкания не хранятся (их можно получить через LR1Parser.closure),
+    кроме завершённых пунктов reductions, нужных для свёрток в таблице ACTION.
+    """
+
+    def __init__(self, items, index=-1, reductions=(), pool: Optional[ItemPool] = None):
         self.items = frozenset(items)
         self.index = index
+        self.reductions = tuple(reductions)
+        # Пул, по которому пункты расшифровываются в __str__
+        self.pool = pool
 
     def __hash__(self):
         return hash(self.items)
@@ -40,6 +91,12 @@ class LRState:
             return False
         return self.items == other.items
 
+    def to_str(self, pool: ItemPool) -> str:
+        items_str = '\n'.join(sorted(pool.decode(item).to_str(pool.grammar) for item in self.items))
+        return f"State {self.index}:\n{items_str}"
+
     def __str__(self):
-        items_str = '\n'.join(str(item) for item in sorted(self.items, key=str))
-        return f"State {self.index}:\n{items_str}"
\ No newline at end of file
+        if self.pool is not None:
+            return self.to_str(self.pool)
+        items_str = '\n'.join(f"item {item}" for item in sorted(self.items))
+        return f"State {self.index}:\n{items_str}"
@@ -1,256 +1,593 @@
-from typing import Dict, Tuple, List, Set, Optional
-from collections import deque, defaultdict
+import copy
+from typing import Callable, Dict, Tuple, List, Set, Optional, Iterable, FrozenSet
+from collections import deque
 from grammar import Grammar, Rule
-from lr_item import LRItem, LRState
-from first_follow import FirstFollowCalculator
+from compiled_grammar import CompiledGrammar
+from lr_item import ItemPool, LRState
+from first_follow import FirstFollowCalculator, bits_to_ids
+from lalr import LALRBuilder
+from parse_tables import ParseTables
+from parse_tree import ParseTree
+from parallel_collection import FrontierExpander
+from fit_stats import FitStats, measure
+from diagnostics import Diagnoser, Diagnostic
+from glr import GLRRecognizer
+from conflicts import Conflict, conflict_items, shortest_prefix, state_conflicts
 
 
 class LR1Parser:
-    def __init__(self):
+    MODES = ("lr1", "lalr1")
+
+    def __init__(self, collect_stats: bool = False):
         self.grammar: Optional[Grammar] = None
+        self.mode: str = "lr1"
+        self.compiled: Optional[CompiledGrammar] = None
         self.first_follow: Optional[FirstFollowCalculator] = None
         self.states: List[LRState] = []
-        self.action_table: Dict[Tuple[int, str], str] = {}
-        self.goto_table: Dict[Tuple[int, str], int] = {}
+        self.transitions: List[Dict[int, int]] = []
+        self.kernels: List[frozenset] = []
+        # action_table и goto_table строятся по tables и transitions при первом обращении
+        self._action_table: Optional[Dict[Tuple[int, str], str]] = None
+        self._goto_table: Optional[Dict[Tuple[int, str], int]] = None
+        self.tables: Optional[ParseTables] = None
+        # GLR: конфликты допускаются, слова проверяются графом стеков
+        self.glr: bool = False
+        self.recognizer = None
         self.augmented_start: str = ""
-
-    def fit(self, grammar: Grammar):
+        self.item_pool: Optional[ItemPool] = None
+        # FIRST(beta) и выводимость ε для каждой позиции точки A -> alpha · X beta
+        self.beta_first: List[FrozenSet[int]] = []
+        self.beta_nullable: List[bool] = []
+        self._state_index: Dict[frozenset, int] = {}
+        # Статистика построения (фазы, замыкания, размеры) — только по запросу
+        self.stats: Optional[FitStats] = FitStats() if collect_stats else None
+        self._diagnoser: Optional[Diagnoser] = None
+        # Номер в таблицах для каждого правила grammar, если таблицы построены по
+        # грамматике с другим порядком правил (ParserCache); None — номера совпадают
+        self._rule_ids: Optional[List[int]] = None
+
+    def fit(self, grammar: Grammar, mode: str = "lr1", jobs: int = 1, glr: bool = False,
+            fail_fast: bool = False):
+        """Построение таблиц; при конфликтах — ValueError с описанием каждого.
+
+        С fail_fast=True построение канонической коллекции прерывается на первом
+        состоянии с конфликтом (в режиме LALR конфликты ищутся после построения).
+        С glr=True конфликты не считаются ошибкой, а predict() использует GLRRecognizer.
+        При ошибке парсер остаётся в состоянии до вызова.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+
+        snapshot = self._snapshot()
+        try:
+            self._fit(grammar, mode, jobs, glr, fail_fast)
+        except BaseException:
+            self._restore(snapshot)
+            raise
+
+    def _fit(self, grammar: Grammar, mode: str, jobs: int, glr: bool, fail_fast: bool):
         self.grammar = grammar
+        self._rule_ids = None
+        self.mode = mode
+        self.glr = glr
+        stats = self.stats
+        if stats is not None:
+            stats.reset()
 
         if not grammar.validate():
             raise ValueError("Invalid grammar")
 
-        self.first_follow = FirstFollowCalculator(grammar)
-        self.first_follow.compute()
-
-        self.augmented_start = f"{grammar.start_symbol}'"
-
-        self._build_canonical_collection()
-
-        self._build_parsing_tables()
-
-        self._check_lr1_conflicts()
+        with measure(stats, 'compile'):
+            self.augmented_start = f"{grammar.start_symbol}'"
+            self.compiled = CompiledGrammar(grammar, self.augmented_start)
 
-    def _build_canonical_collection(self):
-        start_rule = Rule(self.augmented_start, [self.grammar.start_symbol])
-        start_item = LRItem(start_rule, 0, '$')
-        start_state = self._closure({start_item})
-        start_state.index = 0
-        self.states = [start_state]
+        with measure(stats, 'first_follow'):
+            self.first_follow = FirstFollowCalculator(grammar, self.compiled)
+            self.first_follow.compute()
+            self._build_lookahead_table()
 
-        queue = deque([start_state])
-        visited = {start_state}
-
-        while queue:
-            state = queue.popleft()
+        with measure(stats, 'collection'):
+            if mode == "lalr1":
+                self._build_lalr_collection()
+            else:
+                self._build_canonical_collection(jobs=jobs, fail_fast=fail_fast and not glr)
+
+        self._build_tables_and_check()
+
+    def _build_tables_and_check(self):
+        stats = self.stats
+
+        with measure(stats, 'tables'):
+            self._build_parsing_tables()
+
+        with measure(stats, 'conflicts'):
+            self._check_conflicts()
+
+        if stats is not None:
+            stats.states = len(self.states)
+            stats.goto_transitions = sum(len(state_transitions) for state_transitions in self.transitions)
+            stats.stored_items = sum(len(state.items) + len(state.reductions) for state in self.states)
+            stats.action_entries = len(self.tables.action) - self.tables.action.count(0)
+            stats.action_table_bytes = self.tables.action.itemsize * len(self.tables.action)
+
+    def _build_lalr_collection(self):
+        self.item_pool = ItemPool(self.compiled)
+        builder = LALRBuilder(self)
+        self.states, self.transitions = builder.build()
+        self.kernels = []
+        self._state_index = {state.items: state.index for state in self.states}
+
+    def _build_canonical_collection(self, reuse: Optional[Dict[frozenset, tuple]] = None, jobs: int = 1,
+                                    fail_fast: bool = False):
+        # reuse: ядро -> (пункты замыкания, ядра переходов) из предыдущего построения
+        cg = self.compiled
+        if reuse is None:
+            self.item_pool = ItemPool(cg)
+            reuse = {}
+        start_kernel = frozenset([self.item_pool.item(cg.augmented_rule, 0, cg.end)])
+
+        self.states = []
+        self.transitions = []
+        self.kernels = [start_kernel]
+        # Состояние однозначно определяется ядром: замыкание строится один раз,
+        # из него берутся переходы и завершённые пункты, после чего оно отбрасывается.
+        kernel_index = {start_kernel: 0}
+
+        # Обход в ширину по фронтам: состояния фронта раскрываются независимо
+        # (возможно, параллельно), а номера новым ядрам выдаются в порядке фронта
+        # и символов — так же, как при обработке очереди по одному состоянию.
+        with FrontierExpander(self, jobs) as expander:
+            while len(self.states) < len(self.kernels):
+                frontier = self.kernels[len(self.states):]
+                missing = [kernel for kernel in frontier if kernel not in reuse]
+                expanded = dict(zip(missing, expander.expand(missing)))
+
+                for kernel in frontier:
+                    index = len(self.states)
+                    reductions, successors = reuse.get(kernel) or expanded[kernel]
+                    self.states.append(LRState(kernel, index, reductions, self.item_pool))
+
+                    state_transitions = {}
+                    for symbol in sorted(successors):
+                        successor = successors[symbol]
+                        target = kernel_index.get(successor)
+                        if target is None:
+                            target = len(self.kernels)
+                            kernel_index[successor] = target
+                            self.kernels.append(successor)
+                        state_transitions[symbol] = target
+
+                    self.transitions.append(state_transitions)
+
+                    if fail_fast:
+                        cells = state_conflicts(cg, reductions, state_transitions)
+                        if cells:
+                            terminal, actions = next(iter(cells.items()))
+                            raise ValueError(self._conflict(index, terminal, actions).to_str(cg))
+
+        self._state_index = kernel_index
+
+    def _expand(self, kernel: frozenset) -> Tuple[Tuple[int, ...], Dict[int, frozenset]]:
+        """Завершённые пункты замыкания ядра и ядра состояний, в которые из него есть переходы."""
+        state = self._closure(kernel)
+        position_next = self.compiled.position_next
+        n_terminals = self.compiled.n_terminals
+        reductions = tuple(sorted(item for item in state.items if position_next[item // n_terminals] < 0))
+        successors = {symbol: frozenset(items)
+                      for symbol, items in self._kernels_by_symbol(state).items()}
+        return reductions, successors
+
+    def add_rule(self, rule: Rule):
+        """Добавление правила с пересчётом только затронутых FIRST/FOLLOW и состояний."""
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
 
-            symbols = set()
-            for item in state.items:
-                next_sym = item.next_symbol()
-                if next_sym:
-                    symbols.add(next_sym)
+        self._refit(self.grammar.rules + [rule], rule, None)
 
-            for symbol in symbols:
-                new_state = self._goto(state, symbol)
+    def remove_rule(self, rule: Rule):
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
 
-                if new_state and new_state.items:
-                    if new_state not in visited:
-                        new_state.index = len(self.states)
-                        self.states.append(new_state)
-                        queue.append(new_state)
-                        visited.add(new_state)
+        index = self.grammar.rules.index(rule)
+        self._refit(self.grammar.rules[:index] + self.grammar.rules[index + 1:], rule, index)
+
+    def _snapshot(self) -> dict:
+        # Построение заменяет атрибуты, а не меняет их содержимое (_refit работает
+        # с копиями FIRST/FOLLOW и пула пунктов), поэтому достаточно их словаря
+        return dict(vars(self))
+
+    def _restore(self, snapshot: dict):
+        vars(self).clear()
+        vars(self).update(snapshot)
+
+    def _refit(self, rules: List[Rule], changed_rule: Rule, removed_index: Optional[int]):
+        # Отвергнутое изменение (конфликты) оставляет последний построенный автомат
+        snapshot = self._snapshot()
+        try:
+            self._refit_rules(rules, changed_rule, removed_index)
+        except BaseException:
+            self._restore(snapshot)
+            raise
+
+    def _refit_rules(self, rules: List[Rule], changed_rule: Rule, removed_index: Optional[int]):
+        old = self.grammar
+        grammar = Grammar(old.nonterminals | {changed_rule.lhs}, old.terminals, rules, old.start_symbol)
+        compiled = CompiledGrammar(grammar, self.augmented_start)
+
+        # Новые символы меняют нумерацию, LALR строится по другим ядрам — полное построение
+        # Таблицы с другим порядком правил (_rule_ids) тоже перестраиваются полностью
+        if (compiled.symbols != self.compiled.symbols or self.mode != "lr1" or not self.kernels
+                or self._rule_ids is not None):
+            self.fit(grammar, mode=self.mode, glr=self.glr)
+            return
+
+        old_compiled = self.compiled
+        if removed_index is None:
+            changed_id = compiled.n_rules - 2
+            changed_rhs = compiled.rule_rhs[changed_id]
+        else:
+            changed_rhs = old_compiled.rule_rhs[removed_index]
+        changed_lhs = compiled.symbol_ids[changed_rule.lhs]
 
-                    state_index = new_state.index
-                    self.goto_table[(state.index, symbol)] = state_index
+        self.grammar = grammar
+        self.compiled = compiled
+        stats = self.stats
+        if stats is not None:
+            stats.reset()
+
+        with measure(stats, 'first_follow'):
+            self.first_follow = self.first_follow.copy()
+            changed_first = self.first_follow.update(grammar, compiled, [(changed_lhs, changed_rhs)])
+            self._build_lookahead_table()
+
+        with measure(stats, 'collection'):
+            reuse = self._reusable_states(old_compiled, removed_index, changed_lhs, changed_first)
+            self._build_canonical_collection(reuse)
+
+        self._build_tables_and_check()
+
+    def _reusable_states(self, old_compiled: CompiledGrammar, removed_index: Optional[int],
+                         changed_lhs: int, changed_first: Set[int]) -> Dict[frozenset, tuple]:
+        """Состояния предыдущего автомата, замыкание которых не зависит от изменения.
+
+        Замыкание меняется, только если в нём раскрывается изменённый нетерминал
+        или FIRST(beta) раскрываемой позиции содержит символ с изменившимся FIRST.
+        Замыкания не хранятся, поэтому проверяется LR(0)-замыкание ядра — оно
+        содержит все позиции LR(1)-замыкания.
+        """
+        cg = self.compiled
+        n_terminals = cg.n_terminals
+
+        dirty = bytearray(cg.n_positions)
+        for position, next_sym in enumerate(cg.position_next):
+            if next_sym >= n_terminals:
+                rule = cg.position_rule[position]
+                beta = cg.rule_rhs[rule][cg.position_dot[position] + 1:]
+                if next_sym == changed_lhs or any(symbol in changed_first for symbol in beta):
+                    dirty[position] = 1
+
+        # Номера позиций после удалённого правила сдвигаются
+        if removed_index is None:
+            remap = None
+            self.item_pool = self.item_pool.copy(cg)
+        else:
+            first_removed = old_compiled.rule_positions[removed_index]
+            width = len(old_compiled.rule_rhs[removed_index]) + 1
+            shift = width * n_terminals
+            removed_from = first_removed * n_terminals
+            removed_to = removed_from + shift
+
+            def remap(item):
+                if item < removed_from:
+                    return item
+                if item < removed_to:
+                    return -1
+                return item - shift
+
+            self.item_pool = ItemPool(cg)
+
+        kernels = self.kernels
+        if remap is not None:
+            kernels = [frozenset(remap(item) for item in kernel) for kernel in kernels]
+
+        # LR(0)-ядро -> затронуто ли изменением его замыкание
+        dirty_cores: Dict[frozenset, bool] = {}
+        reuse = {}
+
+        for index, state in enumerate(self.states):
+            kernel = kernels[index]
+            reductions = state.reductions
+            if remap is not None:
+                reductions = tuple(remap(item) for item in reductions)
+                if -1 in kernel or -1 in reductions:
+                    continue
+
+            cores = frozenset(item // n_terminals for item in kernel)
+            is_dirty = dirty_cores.get(cores)
+            if is_dirty is None:
+                is_dirty = any(dirty[core] for core in cg.lr0_closure(cores))
+                dirty_cores[cores] = is_dirty
+            if is_dirty:
+                continue
 
-    def _closure(self, items: Set[LRItem]) -> LRState:
-        closure_set = set(items)
-        changed = True
+            successors = {symbol: kernels[target] for symbol, target in self.transitions[index].items()}
+            reuse[kernel] = (reductions, successors)
 
-        while changed:
-            changed = False
-            current_items = list(closure_set)
+        return reuse
 
-            for item in current_items:
-                next_sym = item.next_symbol()
+    def _kernels_by_symbol(self, state: LRState) -> Dict[int, List[int]]:
+        position_next = self.compiled.position_next
+        n_terminals = self.compiled.n_terminals
+        kernels: Dict[int, List[int]] = {}
 
-                if next_sym and self.grammar.is_nonterminal(next_sym):
-                    beta = item.rule.rhs[item.dot_pos + 1:] if item.dot_pos + 1 < len(item.rule.rhs) else []
+        for item in state.items:
+            next_sym = position_next[item // n_terminals]
+            if next_sym >= 0:
+                # Сдвиг точки: следующая позиция того же правила
+                kernels.setdefault(next_sym, []).append(item + n_terminals)
+
+        return kernels
+
+    def _closure(self, items: Iterable[int]) -> LRState:
+        n_terminals = self.compiled.n_terminals
+        lookaheads_by_core: Dict[int, Set[int]] = {}
+
+        for item in items:
+            core, lookahead = divmod(item, n_terminals)
+            lookaheads_by_core.setdefault(core, set()).add(lookahead)
+
+        self._close(lookaheads_by_core)
+
+        intern = self.item_pool.intern
+        closure_set = [intern(core * n_terminals + lookahead)
+                       for core, lookaheads in lookaheads_by_core.items()
+                       for lookahead in lookaheads]
+
+        stats = self.stats
+        if stats is not None:
+            stats.closures += 1
+            stats.items_created += len(closure_set)
+            stats.largest_closure = max(stats.largest_closure, len(closure_set))
+
+        return LRState(closure_set, pool=self.item_pool)
+
+    def _close(self, lookaheads_by_core: Dict[int, Set[int]]) -> Dict[int, Set[int]]:
+        # Пункты группируются по ядру (позиции точки в правиле) с множеством lookahead,
+        # в очередь попадают только ядра, у которых появились новые lookahead.
+        cg = self.compiled
+        position_next = cg.position_next
+        rule_positions = cg.rule_positions
+        rules_by_lhs = cg.rules_by_lhs
+        n_terminals = cg.n_terminals
+        beta_first = self.beta_first
+        beta_nullable = self.beta_nullable
+
+        pending: Dict[int, Set[int]] = {core: set(lookaheads)
+                                        for core, lookaheads in lookaheads_by_core.items()}
+        worklist = deque(pending)
+        expanded = set()
+        iterations = 0
+
+        while worklist:
+            core = worklist.popleft()
+            new_lookaheads = pending.pop(core)
+            iterations += 1
+
+            next_sym = position_next[core]
+            if next_sym < n_terminals:
+                continue
 
-                    first_beta = self._compute_first_of_sequence(beta)
+            nullable = beta_nullable[core]
 
-                    lookaheads = set()
-                    if 'ε' in first_beta:
-                        lookaheads.add(item.lookahead)
-                        lookaheads.update(first_beta - {'ε'})
-                    else:
-                        lookaheads = first_beta - {'ε'}
+            if core in expanded:
+                # FIRST(beta) уже распространён, передаём только новые lookahead
+                lookaheads = new_lookaheads if nullable else set()
+            else:
+                expanded.add(core)
+                lookaheads = beta_first[core] | new_lookaheads if nullable else beta_first[core]
 
-                    for rule in self.grammar.get_rules_for(next_sym):
-                        for lookahead in lookaheads:
-                            if not rule.rhs or rule.rhs == ['ε']:
-                                new_item = LRItem(rule, 1, lookahead)
-                            else:
-                                new_item = LRItem(rule, 0, lookahead)
+            if not lookaheads:
+                continue
 
-                            if new_item not in closure_set:
-                                closure_set.add(new_item)
-                                changed = True
+            for next_rule in rules_by_lhs[next_sym]:
+                next_core = rule_positions[next_rule]
 
-        return LRState(closure_set)
+                existing = lookaheads_by_core.setdefault(next_core, set())
+                added = lookaheads - existing
+                if added:
+                    existing.update(added)
+                    if next_core not in pending:
+                        pending[next_core] = set()
+                        worklist.append(next_core)
+                    pending[next_core].update(added)
 
-    def _compute_first_of_sequence(self, symbols: List[str]) -> Set[str]:
-        result = set()
+        if self.stats is not None:
+            self.stats.closure_iterations += iterations
 
-        for symbol in symbols:
-            if symbol == 'ε':
-                continue
+        return lookaheads_by_core
 
-            if self.grammar.is_terminal(symbol):
-                result.add(symbol)
-                return result
+    def _build_lookahead_table(self):
+        # Одна таблица на позицию точки для замыкания, LALR и всех, кому нужен FIRST(beta)
+        cg = self.compiled
+        suffix_first = self.first_follow.suffix_first
+        suffix_nullable = self.first_follow.suffix_nullable
+        empty = frozenset()
 
-            if symbol in self.first_follow.first:
-                first_set = self.first_follow.first[symbol]
-                result.update(first_set - {'ε'})
+        self.beta_first = [empty] * cg.n_positions
+        self.beta_nullable = [True] * cg.n_positions
 
-                if 'ε' not in first_set:
-                    return result
-            else:
-                result.add(symbol)
-                return result
+        for position, next_sym in enumerate(cg.position_next):
+            if next_sym >= 0:
+                self.beta_first[position] = frozenset(bits_to_ids(suffix_first[position + 1]))
+                self.beta_nullable[position] = suffix_nullable[position + 1]
 
-        result.add('ε')
-        return result
+    def closure(self, index: int) -> LRState:
+        """Полное замыкание состояния: в states хранятся только ядра."""
+        state = self._closure(self.states[index].items)
+        state.index = index
+        return state
 
-    def _goto(self, state: LRState, symbol: str) -> Optional[LRState]:
-        kernel_items = set()
-
-        for item in state.items:
-            next_sym = item.next_symbol()
-            if next_sym == symbol:
-                kernel_items.add(item.shift())
+    def _goto(self, state: LRState, symbol: int) -> Optional[LRState]:
+        # Состояние, заданное ядром, как и элементы states
+        kernel_items = self._kernels_by_symbol(self._closure(state.items)).get(symbol)
 
         if not kernel_items:
             return None
 
-        return self._closure(kernel_items)
+        return LRState(kernel_items, pool=self.item_pool)
 
     def _build_parsing_tables(self):
-        self.action_table = {}
-
-        temp_goto = {}
-        for i, state in enumerate(self.states):
-            all_symbols = list(self.grammar.nonterminals | self.grammar.terminals)
-
-            for symbol in all_symbols:
-                new_state = self._goto(state, symbol)
-                if new_state:
-                    for j, existing_state in enumerate(self.states):
-                        if existing_state == new_state:
-                            temp_goto[(i, symbol)] = j
-                            break
-
-        self.goto_table.update(temp_goto)
-
-        for i, state in enumerate(self.states):
-            for item in state.items:
-                if item.is_complete():
-                    if item.rule.lhs == self.augmented_start and item.lookahead == '$':
-                        self.action_table[(i, '$')] = 'accept'
-                    else:
-                        rule_num = self._get_rule_number(item.rule)
-                        if rule_num >= 0:
-                            self.action_table[(i, item.lookahead)] = f'r{rule_num}'
-                else:
-                    next_sym = item.next_symbol()
-                    if next_sym and self.grammar.is_terminal(next_sym):
-                        if (i, next_sym) in self.goto_table:
-                            next_state = self.goto_table[(i, next_sym)]
-                            self.action_table[(i, next_sym)] = f's{next_state}'
-
-    def _get_rule_number(self, rule: Rule) -> int:
-        for i, gr_rule in enumerate(self.grammar.rules):
-            if gr_rule.lhs == rule.lhs and gr_rule.rhs == rule.rhs:
-                return i
-        return -1
-
-    def _check_lr1_conflicts(self):
-        conflict_keys = defaultdict(list)
-
-        for key, action in self.action_table.items():
-            conflict_keys[key].append(action)
-
-        conflicts = []
-        for key, actions in conflict_keys.items():
-            if len(actions) > 1:
-                has_shift = any(a.startswith('s') for a in actions)
-                has_reduce = any(a.startswith('r') for a in actions)
-                if has_shift and has_reduce:
-                    conflicts.append(f"Shift-reduce conflict on {key}: {actions}")
-                elif has_reduce and len([a for a in actions if a.startswith('r')]) > 1:
-                    conflicts.append(f"Reduce-reduce conflict on {key}: {actions}")
-
-        if conflicts:
-            raise ValueError("\n".join(conflicts))
-
-    def predict(self, word: str) -> bool:
+        # Переходы уже записаны в transitions при построении канонической коллекции
+        self.tables = ParseTables.build(self.compiled, self.states, self.transitions)
+        self.recognizer = GLRRecognizer(self.tables) if self.glr else self.tables
+        self._diagnoser = None
+        self._action_table = None
+        self._goto_table = None
+
+    @property
+    def action_table(self) -> Dict[Tuple[int, str], str]:
+        """ACTION по (состояние, имя терминала): 's3', 'r1' или 'accept'."""
+        if self._action_table is None:
+            self._action_table = {}
+            if self.tables is not None:
+                names = self.compiled.symbols
+                n_terminals = self.tables.n_terminals
+                for index, action in enumerate(self.tables.action):
+                    if action:
+                        state, terminal = divmod(index, n_terminals)
+                        self._action_table[(state, names[terminal])] = self.tables.action_str(action)
+        return self._action_table
+
+    @property
+    def goto_table(self) -> Dict[Tuple[int, str], int]:
+        """Переходы автомата по (состояние, имя символа)."""
+        if self._goto_table is None:
+            self._goto_table = {}
+            names = self.compiled.symbols if self.compiled is not None else []
+            for i, state_transitions in enumerate(self.transitions):
+                for symbol, next_state in state_transitions.items():
+                    self._goto_table[(i, names[symbol])] = next_state
+        return self._goto_table
+
+    def conflicts(self) -> List[Conflict]:
+        """Конфликты таблиц с пунктами и кратчайшим префиксом до состояния."""
         if not self.grammar:
             raise RuntimeError("Parser not fitted with grammar")
+        if self.tables.conflicts and not self.states:
+            raise RuntimeError("Conflict items are not available for loaded parse tables")
+
+        n_terminals = self.tables.n_terminals
+        closures: Dict[int, LRState] = {}
+        result = []
+        for index, actions in self.tables.conflicts.items():
+            state, terminal = divmod(index, n_terminals)
+            if state not in closures:
+                closures[state] = self.closure(state)
+            result.append(self._conflict(state, terminal, actions, closures[state]))
+        return result
 
-        state_stack = [0]
-        symbol_stack = []
-        input_tokens = list(word) + ['$']
-        input_pos = 0
-
-        while True:
-            current_state = state_stack[-1]
-            current_symbol = input_tokens[input_pos]
-
-            action_key = (current_state, current_symbol)
-
-            if action_key not in self.action_table:
-                return False
+    def _conflict(self, state: int, terminal: int, actions: Tuple[int, ...],
+                  closure: Optional[LRState] = None) -> Conflict:
+        if closure is None:
+            closure = self.closure(state)
+        return Conflict(state, terminal, actions,
+                        conflict_items(self.compiled, closure.items, terminal),
+                        shortest_prefix(self.transitions, state))
 
-            action = self.action_table[action_key]
+    def _check_conflicts(self):
+        # Конфликты записываются в ParseTables.conflicts при заполнении ячеек
+        if self.tables.conflicts and not self.glr:
+            raise ValueError("\n".join(conflict.to_str(self.compiled) for conflict in self.conflicts()))
 
-            if action == 'accept':
-                return True
+    def predict(self, word: str) -> bool:
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
 
-            elif action.startswith('s'):
-                next_state = int(action[1:])
-                state_stack.append(next_state)
-                symbol_stack.append(current_symbol)
-                input_pos += 1
+        return self.recognizer.recognize(self.tables.tokens(word))
 
-            elif action.startswith('r'):
-                rule_num = int(action[1:])
-                if rule_num < 0 or rule_num >= len(self.grammar.rules):
-                    return False
+    def parse(self, word: str, actions: Optional[Dict[Rule, Callable]] = None) -> Optional[ParseTree]:
+        """Дерево разбора слова или None, если слово не принадлежит языку.
 
-                rule = self.grammar.rules[rule_num]
+        actions — семантические действия для правил грамматики: функция
+        получает значения символов правой части и возвращает значение
+        левой; значение корня — в tree.value.
+        """
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
+        self._require_deterministic()
+
+        rule_ids = self._rule_ids
+        rule_actions = None
+        if actions is not None:
+            rule_actions = [None] * len(self.tables.rule_length)
+            for index, rule in enumerate(self.grammar.rules):
+                rule_actions[index if rule_ids is None else rule_ids[index]] = actions.get(rule)
+
+        tree = self.tables.parse(self.tables.tokens(word), rule_actions)
+        if tree is not None and rule_ids is not None:
+            tree = tree.renumbered(rule_ids)
+        return tree
+
+    def diagnose(self, word: str, max_errors: Optional[int] = None) -> List[Diagnostic]:
+        """Все синтаксические ошибки слова (пустой список, если слово принадлежит языку).
+
+        Каждая ошибка содержит смещение в слове, встреченный терминал и
+        ожидаемые в этом месте терминалы; после ошибки разбор продолжается
+        с восстановлением по FOLLOW-множествам.
+        """
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
+        self._require_deterministic()
 
-                if not rule.rhs or rule.rhs == ['ε']:
-                    pass
-                else:
-                    for _ in range(len(rule.rhs)):
-                        if not state_stack or not symbol_stack:
-                            return False
-                        state_stack.pop()
-                        symbol_stack.pop()
+        if self._diagnoser is None:
+            if self.first_follow is None:
+                # Парсер загружен из файла таблиц: FOLLOW ещё не вычислены
+                self.first_follow = FirstFollowCalculator(self.grammar, self.compiled)
+                self.first_follow.compute()
+            self._diagnoser = Diagnoser(self.tables, self.first_follow.follow_bits)
 
-                lhs = rule.lhs
-                symbol_stack.append(lhs)
+        return self._diagnoser.diagnose(self.tables.lexer.spans(word), len(word), max_errors)
 
-                # GOTO
-                goto_state = state_stack[-1]
-                goto_key = (goto_state, lhs)
+    def predict_many(self, words: Iterable[str]) -> List[bool]:
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
 
-                if goto_key not in self.goto_table:
-                    return False
+        if not isinstance(words, (list, tuple)):
+            words = list(words)
+        return self.recognizer.recognize_many(words)
 
-                next_state = self.goto_table[goto_key]
-                state_stack.append(next_state)
+    def _require_deterministic(self):
+        if self.tables.conflicts:
+            raise RuntimeError("Parse tables have conflicts: only predict() is available in GLR mode")
 
-            else:
-                return False
\ No newline at end of file
+    def save(self, path: str):
+        if not self.grammar:
+            raise RuntimeError("Parser not fitted with grammar")
+        if self._rule_ids is not None:
+            # В файле номера правил должны совпадать с грамматикой, по которой он загружается
+            raise RuntimeError("Parse tables were built for a reordered grammar: fit() the parser to save it")
+
+        self.tables.save(path, self.grammar.fingerprint())
+
+    @classmethod
+    def load(cls, path: str, grammar: Grammar, glr: bool = False) -> 'LR1Parser':
+        """Парсер с таблицами из файла; таблицы, построенные для другой грамматики, отвергаются.
+
+        Восстанавливаются только таблицы для predict(): states, transitions
+        и goto_table остаются пустыми. Таблицы с конфликтами
+        загружаются только с glr=True.
+        """
+        tables, fingerprint = ParseTables.load(path)
+        if fingerprint != grammar.fingerprint():
+            raise ValueError(f"Stale parse tables in {path}: grammar has changed")
+        if tables.conflicts and not glr:
+            raise ValueError(f"Parse tables in {path} have conflicts")
+
+        parser = cls()
+        parser.grammar = grammar
+        parser.augmented_start = f"{grammar.start_symbol}'"
+        parser.compiled = CompiledGrammar(grammar, parser.augmented_start)
+        parser.tables = tables
+        parser.glr = glr
+        parser.recognizer = GLRRecognizer(tables) if glr else tables
+        return parser
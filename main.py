@@ -1,28 +1,103 @@
+import os
 import sys
+import argparse
+from itertools import islice
+from codegen import write_module
 from grammar_parser import GrammarParser
 from lr_parser import LR1Parser
+from parallel_check import check_chunks
+from table_cache import cache_path, load_cached_parser
 
 
-def main():
+# Слова проверяются и выводятся блоками по мере чтения входа
+OUTPUT_CHUNK_SIZE = 1024
+
+
+def parse_args(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Проверка принадлежности слов языку LR(1)-грамматики")
+    arg_parser.add_argument('--mode', choices=LR1Parser.MODES, default='lr1',
+                            help="способ построения таблиц: канонический LR(1) или LALR(1)")
+    arg_parser.add_argument('--table-cache', metavar='DIR',
+                            help="каталог для сохранённых таблиц разбора")
+    arg_parser.add_argument('--jobs', type=int, default=1,
+                            help="число процессов для построения таблиц и проверки слов")
+    arg_parser.add_argument('--diagnose', action='store_true',
+                            help="для отвергнутых слов выводить позиции ошибок и ожидаемые терминалы")
+    arg_parser.add_argument('--stats', action='store_true',
+                            help="вывести в stderr время фаз и размеры построенного автомата")
+    arg_parser.add_argument('--fail-fast', action='store_true',
+                            help="прервать построение таблиц на первом конфликте")
+    arg_parser.add_argument('--glr', action='store_true',
+                            help="допускать конфликты в таблицах и проверять слова GLR-разбором")
+    arg_parser.add_argument('--generate-module', metavar='FILE',
+                            help="записать самостоятельный модуль-распознаватель (см. codegen.py)")
+    args = arg_parser.parse_args(argv)
+    if args.glr and args.diagnose:
+        arg_parser.error("--diagnose is not supported with --glr")
+    if args.glr and args.generate_module:
+        arg_parser.error("--generate-module is not supported with --glr")
+    return args
+
+
+def write_results(chunks, out):
+    for results in chunks:
+        out.write(''.join(["Yes\n" if result else "No\n" for result in results]))
+        out.flush()
+
+
+def diagnose_chunks(parser, words, chunk_size: int):
+    """Блоки строк ответа: слова проверяются как обычно, ошибки ищутся только в отвергнутых."""
+    words = iter(words)
+    while True:
+        chunk = list(islice(words, chunk_size))
+        if not chunk:
+            return
+        results = parser.predict_many(chunk)
+        yield ["Yes" if result else "No: " + "; ".join(map(str, parser.diagnose(word)))
+               for word, result in zip(chunk, results)]
+
+
+def write_lines(chunks, out):
+    for lines in chunks:
+        out.write(''.join(line + "\n" for line in lines))
+        out.flush()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     try:
-        grammar, words = GrammarParser.parse_from_stdin()
+        grammar, words = GrammarParser.parse_stream(sys.stdin)
 
-        parser = LR1Parser()
+        parser = load_cached_parser(args.table_cache, grammar, args.mode, args.glr)
 
-        try:
-            parser.fit(grammar)
-        except ValueError as e:
-            print(f"Grammar is not LR(1): {e}", file=sys.stderr)
-            sys.exit(1)
+        if parser is None:
+            parser = LR1Parser(collect_stats=args.stats)
 
-        for word in words:
             try:
-                if parser.predict(word):
-                    print("Yes")
-                else:
-                    print("No")
-            except Exception:
-                print("No")
+                parser.fit(grammar, mode=args.mode, jobs=args.jobs, glr=args.glr,
+                           fail_fast=args.fail_fast)
+            except ValueError as e:
+                kind = "LALR(1)" if args.mode == 'lalr1' else "LR(1)"
+                print(f"Grammar is not {kind}: {e}", file=sys.stderr)
+                sys.exit(1)
+
+            if args.table_cache:
+                os.makedirs(args.table_cache, exist_ok=True)
+                parser.save(cache_path(args.table_cache, grammar, args.mode))
+
+            if args.stats:
+                print(parser.stats.report(), file=sys.stderr)
+        elif args.stats:
+            print("Parse tables loaded from cache", file=sys.stderr)
+
+        if args.generate_module:
+            write_module(parser, args.generate_module)
+
+        if args.diagnose:
+            write_lines(diagnose_chunks(parser, words, OUTPUT_CHUNK_SIZE), sys.stdout)
+        else:
+            write_results(check_chunks(parser.recognizer, words, args.jobs, OUTPUT_CHUNK_SIZE), sys.stdout)
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -30,4 +105,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
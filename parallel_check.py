@@ -0,0 +1,69 @@
+import multiprocessing
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Sequence
+from parse_tables import ParseTables
+
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Таблицы рабочего процесса: передаются один раз при его запуске, а не с каждой задачей
+_worker_tables: Optional[ParseTables] = None
+
+
+def _init_worker(tables: ParseTables):
+    global _worker_tables
+    _worker_tables = tables
+
+
+def _check_chunk(words: List[str]) -> bytes:
+    return bytes(_worker_tables.recognize_many(words))
+
+
+def _chunks(words: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    chunk = []
+    for word in words:
+        chunk.append(word)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def check_chunks(tables: ParseTables, words: Iterable[str], jobs: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[bool]]:
+    """Проверка слов блоками в jobs процессах; блоки результатов выдаются в порядке входа.
+
+    При старте через fork таблицы наследуются рабочими процессами без
+    сериализации, иначе сериализуются один раз на процесс. Одновременно в работе
+    не больше 2 * jobs блоков, поэтому слова можно читать из потока любой длины.
+    """
+    if jobs <= 1:
+        for chunk in _chunks(words, chunk_size):
+            yield tables.recognize_many(chunk)
+        return
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    with context.Pool(jobs, initializer=_init_worker, initargs=(tables,)) as pool:
+        pending = deque()
+
+        for chunk in _chunks(words, chunk_size):
+            pending.append(pool.apply_async(_check_chunk, (chunk,)))
+            if len(pending) >= 2 * jobs:
+                yield [bool(result) for result in pending.popleft().get()]
+
+        while pending:
+            yield [bool(result) for result in pending.popleft().get()]
+
+
+def check_words_parallel(tables: ParseTables, words: Iterable[str], jobs: int,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bool]:
+    for results in check_chunks(tables, words, jobs, chunk_size):
+        yield from results
+
+
+def check_words(tables: ParseTables, words: Sequence[str], jobs: int = 1,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[bool]:
+    return list(check_words_parallel(tables, words, jobs, chunk_size))
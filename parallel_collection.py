@@ -0,0 +1,69 @@
+import multiprocessing
+from typing import Dict, List, Optional, Sequence, Tuple
+from fit_stats import FitStats
+
+
+# Меньшие фронты обходятся в текущем процессе: передача данных дороже замыканий
+MIN_PARALLEL_FRONTIER = 256
+# Блоков на процесс — для выравнивания нагрузки между рабочими процессами
+CHUNKS_PER_JOB = 4
+
+# Завершённые пункты замыкания и ядра переходов одного состояния
+Expansion = Tuple[Tuple[int, ...], Dict[int, frozenset]]
+
+# Парсер рабочего процесса с таблицами FIRST(beta): передаётся один раз при запуске
+_worker_parser = None
+
+
+def _init_worker(parser):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _expand_chunk(kernels: List[frozenset]) -> Tuple[List[Expansion], Optional[FitStats]]:
+    # Счётчики замыканий рабочего процесса возвращаются вместе с результатом
+    stats = _worker_parser.stats
+    if stats is not None:
+        stats.reset()
+    return [_worker_parser._expand(kernel) for kernel in kernels], stats
+
+
+class FrontierExpander:
+    """Раскрытие фронта обхода в ширину (замыкание ядер и переходы) в jobs процессах.
+
+    Результаты возвращаются в порядке ядер фронта, поэтому номера состояний
+    совпадают с последовательным построением. Пул создаётся при первом
+    достаточно большом фронте.
+    """
+
+    def __init__(self, parser, jobs: int = 1):
+        self.parser = parser
+        self.jobs = jobs
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+
+    def __enter__(self) -> 'FrontierExpander':
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def expand(self, kernels: Sequence[frozenset]) -> List[Expansion]:
+        if self.jobs <= 1 or len(kernels) < MIN_PARALLEL_FRONTIER:
+            return [self.parser._expand(kernel) for kernel in kernels]
+
+        if self._pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._pool = context.Pool(self.jobs, initializer=_init_worker, initargs=(self.parser,))
+
+        size = -(-len(kernels) // (self.jobs * CHUNKS_PER_JOB))
+        chunks = [kernels[i:i + size] for i in range(0, len(kernels), size)]
+
+        results = []
+        for chunk_results, stats in self._pool.map(_expand_chunk, chunks):
+            results.extend(chunk_results)
+            if stats is not None:
+                self.parser.stats.merge_closures(stats)
+        return results
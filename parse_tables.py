@@ -0,0 +1,427 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from compiled_grammar import CompiledGrammar
+from lexer import Lexer
+from parse_tree import ParseTree
+
+
+# Вид действия хранится в младших двух битах, аргумент (состояние или правило) — в старших
+ERROR = 0
+SHIFT = 1
+REDUCE = 2
+ACCEPT = 3
+
+ACTION_NAMES = {SHIFT: 's', REDUCE: 'r'}
+
+# Формат файла таблиц: заголовок, затем массивы int32 в порядке байт машины
+# (action, goto, rule_lhs, rule_length) и JSON с номерами терминалов и конфликтами.
+FILE_MAGIC = b'LR1T'
+FILE_VERSION = 2
+HEADER = struct.Struct('<4sHBx32siiiiI')
+
+# Доля лексем в общих префиксах соседних (после сортировки) слов, начиная с
+# которой recognize_many разбирает префиксы один раз: при меньшей доле снимки
+# стека обходятся дороже, чем разбор каждого слова заново
+SHARED_PREFIX_MIN = 0.25
+
+
+def encode_action(kind: int, arg: int = 0) -> int:
+    return (arg << 2) | kind
+
+
+def decode_action(action: int) -> Tuple[int, int]:
+    return action & 3, action >> 2
+
+
+class ParseTables:
+    """Плотные таблицы ACTION/GOTO в массивах целых чисел.
+
+    action[state * n_terminals + terminal] — закодированное действие,
+    goto[state * n_nonterminals + nonterminal] — номер состояния или -1.
+    Нетерминалы нумеруются с нуля (symbol - n_terminals).
+
+    В ячейке action хранится одно действие; если их несколько (грамматика
+    не LR(1)), все они по возрастанию перечислены в conflicts[ячейка].
+    """
+
+    def __init__(self, n_states: int, n_terminals: int, n_nonterminals: int,
+                 action: array, goto: array, rule_lhs: array, rule_length: array,
+                 terminal_ids: Dict[str, int], conflicts: Optional[Dict[int, Tuple[int, ...]]] = None):
+        self.n_states = n_states
+        self.n_terminals = n_terminals
+        self.n_nonterminals = n_nonterminals
+        self.action = action
+        self.goto = goto
+        self.rule_lhs = rule_lhs
+        self.rule_length = rule_length
+        self.terminal_ids = terminal_ids
+        self.conflicts: Dict[int, Tuple[int, ...]] = conflicts or {}
+        self.lexer = Lexer(terminal_ids)
+
+    def __getstate__(self):
+        # Загруженные через mmap таблицы — memoryview, их нельзя сериализовать напрямую
+        state = dict(self.__dict__)
+        for name in ('action', 'goto', 'rule_lhs', 'rule_length'):
+            state[name] = array('i', state[name])
+        state.pop('_buffer', None)
+        return state
+
+    @classmethod
+    def build(cls, compiled: CompiledGrammar, states, transitions: List[Dict[int, int]]) -> 'ParseTables':
+        n_states = len(states)
+        n_terminals = compiled.n_terminals
+        n_nonterminals = compiled.n_symbols - n_terminals
+
+        action = array('i', [0]) * (n_states * n_terminals)
+        goto = array('i', [-1]) * (n_states * n_nonterminals)
+
+        for i, state_transitions in enumerate(transitions):
+            for symbol, next_state in state_transitions.items():
+                if symbol < n_terminals:
+                    action[i * n_terminals + symbol] = encode_action(SHIFT, next_state)
+                else:
+                    goto[i * n_nonterminals + symbol - n_terminals] = next_state
+
+        # Свёртки — по завершённым пунктам, сохранённым в состояниях
+        conflicts: Dict[int, set] = {}
+        for i, state in enumerate(states):
+            for item in state.reductions:
+                position, lookahead = divmod(item, n_terminals)
+                rule = compiled.position_rule[position]
+                if rule == compiled.augmented_rule:
+                    if lookahead != compiled.end:
+                        continue
+                    new = encode_action(ACCEPT)
+                else:
+                    new = encode_action(REDUCE, rule)
+
+                index = i * n_terminals + lookahead
+                old = action[index]
+                if old and old != new:
+                    conflicts.setdefault(index, {old}).add(new)
+                action[index] = new
+
+        rule_lhs = array('i', (lhs - n_terminals for lhs in compiled.rule_lhs))
+        rule_length = array('i', (len(rhs) for rhs in compiled.rule_rhs))
+
+        return cls(n_states, n_terminals, n_nonterminals, action, goto,
+                   rule_lhs, rule_length, dict(compiled.input_ids),
+                   {index: tuple(sorted(actions)) for index, actions in sorted(conflicts.items())})
+
+    def save(self, path: str, fingerprint: str):
+        names = json.dumps({'terminals': self.terminal_ids,
+                            'conflicts': [[index, list(actions)] for index, actions in self.conflicts.items()]},
+                           ensure_ascii=False).encode('utf-8')
+        header = HEADER.pack(FILE_MAGIC, FILE_VERSION, sys.byteorder == 'little',
+                             bytes.fromhex(fingerprint), self.n_states, self.n_terminals,
+                             self.n_nonterminals, len(self.rule_length), len(names))
+
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            for values in (self.action, self.goto, self.rule_lhs, self.rule_length):
+                f.write(array('i', values).tobytes())
+            f.write(names)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple['ParseTables', str]:
+        """Загрузка таблиц через mmap: массивы не копируются, а читаются из файла по мере обращения."""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < HEADER.size:
+            raise ValueError(f"Truncated parse table file: {path}")
+
+        (magic, version, little_endian, fingerprint, n_states, n_terminals,
+         n_nonterminals, n_rules, names_size) = HEADER.unpack_from(buffer)
+
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"Not a parse table file: {path}")
+        if bool(little_endian) != (sys.byteorder == 'little') or array('i').itemsize != 4:
+            raise ValueError(f"Parse table file has a different byte order: {path}")
+
+        sizes = (n_states * n_terminals, n_states * n_nonterminals, n_rules, n_rules)
+        if len(buffer) != HEADER.size + 4 * sum(sizes) + names_size:
+            raise ValueError(f"Truncated parse table file: {path}")
+
+        view = memoryview(buffer)
+        arrays = []
+        offset = HEADER.size
+        for size in sizes:
+            arrays.append(view[offset:offset + 4 * size].cast('i'))
+            offset += 4 * size
+        names = json.loads(bytes(view[offset:offset + names_size]).decode('utf-8'))
+        conflicts = {index: tuple(actions) for index, actions in names['conflicts']}
+
+        tables = cls(n_states, n_terminals, n_nonterminals, *arrays, names['terminals'], conflicts)
+        tables._buffer = buffer
+        return tables, fingerprint.hex()
+
+    def action_at(self, state: int, terminal: int) -> Tuple[int, int]:
+        return decode_action(self.action[state * self.n_terminals + terminal])
+
+    def goto_at(self, state: int, nonterminal: int) -> int:
+        return self.goto[state * self.n_nonterminals + nonterminal]
+
+    def action_str(self, action: int) -> Optional[str]:
+        kind, arg = decode_action(action)
+        if kind == ACCEPT:
+            return 'accept'
+        if kind == ERROR:
+            return None
+        return f'{ACTION_NAMES[kind]}{arg}'
+
+    def tokens(self, word: str) -> Iterable[Optional[int]]:
+        return self.lexer.tokens(word)
+
+    def recognize(self, tokens: Iterable[Optional[int]]) -> bool:
+        """Разбор последовательности номеров терминалов; None — неизвестный символ."""
+        action = self.action
+        goto = self.goto
+        rule_lhs = self.rule_lhs
+        rule_length = self.rule_length
+        n_terminals = self.n_terminals
+        n_nonterminals = self.n_nonterminals
+
+        stack = [0]
+
+        for token in chain(tokens, (0,)):
+            if token is None:
+                return False
+
+            while True:
+                act = action[stack[-1] * n_terminals + token]
+                kind = act & 3
+
+                if kind == SHIFT:
+                    stack.append(act >> 2)
+                    break
+
+                if kind == REDUCE:
+                    rule = act >> 2
+                    length = rule_length[rule]
+                    if length:
+                        del stack[-length:]
+                    next_state = goto[stack[-1] * n_nonterminals + rule_lhs[rule]]
+                    if next_state < 0:
+                        return False
+                    stack.append(next_state)
+                elif kind == ACCEPT:
+                    return True
+                else:
+                    return False
+
+        return False
+
+    def parse(self, tokens: Iterable[Optional[int]],
+              actions: Optional[Sequence[Optional[Callable]]] = None) -> Optional[ParseTree]:
+        """Разбор с построением дерева; None, если последовательность не выводится.
+
+        actions[rule] вызывается при свёртке со значениями детей и возвращает
+        значение узла; значение листа — имя терминала. Без действия значение
+        узла — значение первого ребёнка (None у ε-правила).
+        """
+        action = self.action
+        goto = self.goto
+        rule_lhs = self.rule_lhs
+        rule_length = self.rule_length
+        n_terminals = self.n_terminals
+        n_nonterminals = self.n_nonterminals
+
+        # Узлы копятся в списках (append дешевле, чем у array) и упаковываются в конце
+        label = []
+        first = []
+        children = []
+
+        stack = [0]
+        # Узлы и значения, соответствующие состояниям stack[1:]
+        nodes = []
+        values = None if actions is None else []
+        names = None if actions is None else self._terminal_names()
+        position = 0
+
+        for token in chain(tokens, (0,)):
+            if token is None:
+                return None
+
+            while True:
+                act = action[stack[-1] * n_terminals + token]
+                kind = act & 3
+
+                if kind == SHIFT:
+                    stack.append(act >> 2)
+                    nodes.append(len(label))
+                    label.append(~token)
+                    first.append(position)
+                    if values is not None:
+                        values.append(names[token])
+                    position += 1
+                    break
+
+                if kind == REDUCE:
+                    rule = act >> 2
+                    length = rule_length[rule]
+                    node = len(label)
+                    first.append(len(children))
+                    label.append(rule)
+
+                    if values is not None:
+                        args = values[len(values) - length:]
+                        del values[len(values) - length:]
+                        handler = actions[rule]
+                        if handler is not None:
+                            values.append(handler(*args))
+                        else:
+                            values.append(args[0] if args else None)
+
+                    if length == 1:
+                        # Цепные свёртки: узел и состояние заменяются на месте
+                        children.append(nodes[-1])
+                        nodes[-1] = node
+                        next_state = goto[stack[-2] * n_nonterminals + rule_lhs[rule]]
+                        if next_state < 0:
+                            return None
+                        stack[-1] = next_state
+                        continue
+
+                    if length:
+                        children += nodes[-length:]
+                        del nodes[-length:]
+                        del stack[-length:]
+
+                    next_state = goto[stack[-1] * n_nonterminals + rule_lhs[rule]]
+                    if next_state < 0:
+                        return None
+                    stack.append(next_state)
+                    nodes.append(node)
+                elif kind == ACCEPT:
+                    return ParseTree(array('i', label), array('i', first), array('i', children),
+                                     rule_lhs, rule_length, n_terminals,
+                                     values[-1] if values else None)
+                else:
+                    return None
+
+        return None
+
+    def _terminal_names(self) -> List[str]:
+        names = [''] * self.n_terminals
+        for name, terminal in self.terminal_ids.items():
+            names[terminal] = name
+        return names
+
+    def recognize_many(self, words: Sequence[str]) -> List[bool]:
+        """Проверка набора слов с общим разбором совпадающих префиксов.
+
+        Слова обходятся в лексикографическом порядке (как листья префиксного
+        дерева). Стек хранится неизменяемым списком (состояние, родитель), поэтому
+        снимок после каждого сдвига стоит O(1), а следующее слово продолжает
+        разбор со снимка в конце общего с предыдущим словом префикса. Если общие
+        префиксы соседних слов составляют меньше SHARED_PREFIX_MIN всех лексем,
+        каждое слово разбирается отдельно.
+        """
+        action = self.action
+        goto = self.goto
+        rule_lhs = self.rule_lhs
+        rule_length = self.rule_length
+        n_terminals = self.n_terminals
+        n_nonterminals = self.n_nonterminals
+        get_terminal = self.terminal_ids.get
+        lexer = self.lexer
+
+        # Для односимвольных терминалов общий префикс ищется прямо по строкам,
+        # иначе — по последовательностям номеров терминалов (-1 — ошибка разбиения)
+        if lexer.single_char:
+            sequences = list(words)
+        else:
+            sequences = [tuple(-1 if token is None else token for token in lexer.tokens(word))
+                         for word in words]
+
+        order = sorted(range(len(words)), key=sequences.__getitem__)
+        # commons[k] — длина общего префикса k-го слова в порядке обхода с предыдущим
+        commons = [0] * len(order)
+        for k in range(1, len(order)):
+            commons[k] = _common_prefix_length(sequences[order[k - 1]], sequences[order[k]])
+
+        if sum(commons) < SHARED_PREFIX_MIN * sum(map(len, sequences)):
+            # Общих префиксов мало: снимки стека дороже, чем разбор каждого слова заново
+            if lexer.single_char:
+                return [self.recognize(map(get_terminal, word)) for word in sequences]
+            return [self.recognize(sequence if -1 not in sequence else
+                                   sequence[:sequence.index(-1)] + (None,))
+                    for sequence in sequences]
+
+        results = [False] * len(words)
+        # snapshots[i] — стек после сдвига первых i лексем предыдущего слова
+        snapshots = [(0, None)]
+        # Позиция символа, на котором разбор предыдущего слова завершился ошибкой
+        failed_at = -1
+
+        for index, common in zip(order, commons):
+            sequence = sequences[index]
+
+            if 0 <= failed_at < common:
+                continue
+
+            del snapshots[common + 1:]
+            failed_at = -1
+            node = snapshots[common]
+            position = common
+
+            if lexer.single_char:
+                tokens = map(get_terminal, sequence[common:])
+            else:
+                tokens = (None if token < 0 else token for token in sequence[common:])
+
+            for token in chain(tokens, (0,)):
+                if token is None:
+                    failed_at = position
+                    break
+
+                while True:
+                    act = action[node[0] * n_terminals + token]
+                    kind = act & 3
+
+                    if kind == SHIFT:
+                        node = (act >> 2, node)
+                        position += 1
+                        snapshots.append(node)
+                        break
+
+                    if kind == REDUCE:
+                        rule = act >> 2
+                        for _ in range(rule_length[rule]):
+                            node = node[1]
+                        next_state = goto[node[0] * n_nonterminals + rule_lhs[rule]]
+                        if next_state < 0:
+                            kind = ERROR
+                            break
+                        node = (next_state, node)
+                    else:
+                        break
+
+                if kind == SHIFT:
+                    continue
+                if kind == ACCEPT:
+                    results[index] = True
+                elif token:
+                    failed_at = position
+                break
+
+        return results
+
+
+def _common_prefix_length(a: Sequence, b: Sequence) -> int:
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    i = 0
+    while a[i] == b[i]:
+        i += 1
+    return i
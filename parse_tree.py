@@ -0,0 +1,90 @@
+from array import array
+from typing import Any, Iterator, List, Sequence
+
+
+class ParseTree:
+    """Дерево разбора в плоских массивах целых чисел.
+
+    Узлы нумеруются в порядке создания: лист — при сдвиге, внутренний узел —
+    при свёртке, поэтому корень — последний узел, а номера правил внутренних
+    узлов по порядку образуют последовательность свёрток (правый вывод
+    в обратном порядке).
+
+    label[node] — номер правила внутреннего узла или ~terminal у листа,
+    first[node] — у листа номер лексемы во входе, у внутреннего узла — начало
+    его детей в массиве children. Номера символов — как в CompiledGrammar.
+    """
+
+    __slots__ = ('label', 'first', 'children', 'rule_lhs', 'rule_length', 'n_terminals', 'value')
+
+    def __init__(self, label: array, first: array, children: array,
+                 rule_lhs: Sequence[int], rule_length: Sequence[int], n_terminals: int,
+                 value: Any = None):
+        self.label = label
+        self.first = first
+        self.children = children
+        self.rule_lhs = rule_lhs
+        self.rule_length = rule_length
+        self.n_terminals = n_terminals
+        # Семантическое значение корня (если при разборе заданы действия)
+        self.value = value
+
+    def __len__(self) -> int:
+        return len(self.label)
+
+    @property
+    def root(self) -> int:
+        return len(self.label) - 1
+
+    def is_leaf(self, node: int) -> bool:
+        return self.label[node] < 0
+
+    def rule(self, node: int) -> int:
+        """Правило внутреннего узла, -1 у листа."""
+        return max(self.label[node], -1)
+
+    def symbol(self, node: int) -> int:
+        label = self.label[node]
+        if label < 0:
+            return ~label
+        return self.rule_lhs[label] + self.n_terminals
+
+    def child_nodes(self, node: int) -> array:
+        label = self.label[node]
+        if label < 0:
+            return self.children[:0]
+        start = self.first[node]
+        return self.children[start:start + self.rule_length[label]]
+
+    def renumbered(self, rule_ids: Sequence[int]) -> 'ParseTree':
+        """То же дерево в нумерации другой грамматики: её правило i — правило rule_ids[i] здесь."""
+        index = [0] * len(rule_ids)
+        for i, rule in enumerate(rule_ids):
+            index[rule] = i
+        label = array('i', [index[rule] if rule >= 0 else rule for rule in self.label])
+        return ParseTree(label, self.first, self.children,
+                         [self.rule_lhs[rule] for rule in rule_ids],
+                         [self.rule_length[rule] for rule in rule_ids],
+                         self.n_terminals, self.value)
+
+    def reductions(self) -> List[int]:
+        return [label for label in self.label if label >= 0]
+
+    def leaves(self, node: int = -1) -> Iterator[int]:
+        """Листья поддерева слева направо."""
+        stack = [self.root if node < 0 else node]
+        while stack:
+            node = stack.pop()
+            if self.label[node] < 0:
+                yield node
+            else:
+                stack.extend(reversed(self.child_nodes(node)))
+
+    def to_str(self, names: Sequence[str], node: int = -1) -> str:
+        """Скобочная запись: S(a S() b S())."""
+        node = self.root if node < 0 else node
+        name = names[self.symbol(node)]
+        if self.label[node] < 0:
+            return name
+        children = ' '.join(self.to_str(names, child) for child in self.child_nodes(node))
+        return f"{name}({children})"
@@ -0,0 +1,145 @@
+import copy
+from collections import OrderedDict
+from sys import getsizeof
+from typing import List, Optional, Tuple
+from compiled_grammar import EPSILON
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+
+
+# Размер целого вне кэша малых чисел (пункты, номера состояний > 256)
+INT_BYTES = getsizeof(1 << 20)
+# Объект LRState со словарём атрибутов
+STATE_BYTES = 160
+
+
+def canonical_grammar(grammar: Grammar) -> Grammar:
+    """Грамматика в каноническом виде: без пробелов по краям имён и 'ε',
+    с правилами, отсортированными по (левая часть, правая часть)."""
+    rules = sorted(_canonical_rule(rule) for rule in grammar.rules)
+    return Grammar({symbol.strip() for symbol in grammar.nonterminals},
+                   {symbol.strip() for symbol in grammar.terminals},
+                   [Rule(lhs, list(rhs)) for lhs, rhs in rules],
+                   grammar.start_symbol.strip())
+
+
+def _canonical_rule(rule: Rule) -> Tuple[str, Tuple[str, ...]]:
+    return rule.lhs.strip(), tuple(symbol.strip() for symbol in rule.rhs if symbol.strip() != EPSILON)
+
+
+def canonical_rule_ids(grammar: Grammar, canonical: Grammar) -> Optional[List[int]]:
+    """Номер в canonical для каждого правила grammar; None, если номера совпадают."""
+    positions = {}
+    for index, rule in reversed(list(enumerate(canonical.rules))):
+        positions.setdefault(_canonical_rule(rule), []).append(index)
+    # Одинаковые правила сопоставляются по порядку
+    rule_ids = [positions[_canonical_rule(rule)].pop() for rule in grammar.rules]
+    if rule_ids == list(range(len(rule_ids))):
+        return None
+    return rule_ids
+
+
+def _canonical_key(canonical: Grammar, mode: str) -> str:
+    return f"{canonical.fingerprint()}-{mode}"
+
+
+def estimate_bytes(parser: LR1Parser) -> int:
+    """Оценка памяти построенного парсера по состояниям и таблицам."""
+    tables = parser.tables
+    size = sum(len(values) * values.itemsize
+               for values in (tables.action, tables.goto, tables.rule_lhs, tables.rule_length))
+    if parser.recognizer is not tables and parser.recognizer is not None:
+        # Копия ACTION у GLRRecognizer
+        size += len(tables.action) * tables.action.itemsize
+
+    # Ядра и завершённые пункты состояний; сами пункты интернированы в item_pool
+    size += sum(STATE_BYTES + getsizeof(state.items) + getsizeof(state.reductions) for state in parser.states)
+    if parser.item_pool is not None:
+        size += len(parser.item_pool) * INT_BYTES
+    size += getsizeof(parser._state_index) + getsizeof(parser.kernels)
+
+    size += sum(getsizeof(state_transitions) for state_transitions in parser.transitions)
+    # action_table и goto_table, если уже построены: ключ — кортеж (состояние, имя), значение — строка или номер
+    key_bytes = getsizeof((0, ''))
+    if parser._action_table is not None:
+        size += getsizeof(parser._action_table) + len(parser._action_table) * (key_bytes + getsizeof('r0'))
+    if parser._goto_table is not None:
+        size += getsizeof(parser._goto_table) + len(parser._goto_table) * key_bytes
+
+    # Части, пропорциональные размеру грамматики: списки CompiledGrammar и FIRST(beta) позиций
+    size += sum(getsizeof(value) for value in vars(parser.compiled).values()
+                if isinstance(value, (list, tuple, dict)))
+    size += getsizeof(parser.beta_first) + sum(getsizeof(first) for first in parser.beta_first)
+    size += getsizeof(parser.beta_nullable)
+    return size
+
+
+class ParserCache:
+    """Построенные парсеры по каноническому виду грамматики с вытеснением LRU.
+
+    Грамматики, отличающиеся порядком правил, пробелами в именах или записью
+    пустой правой части, получают один ключ, и парсер строится по
+    каноническому виду. Суммарная оценка памяти (estimate_bytes) не превышает
+    max_bytes: при добавлении вытесняются давно не использованные парсеры,
+    а парсер больше max_bytes возвращается, но не сохраняется.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, Tuple[LR1Parser, int]]' = OrderedDict()
+
+    @staticmethod
+    def key(grammar: Grammar, mode: str = "lr1") -> str:
+        return _canonical_key(canonical_grammar(grammar), mode)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, grammar: Grammar, mode: str = "lr1") -> LR1Parser:
+        """Построенный парсер для грамматики; при промахе вызывается fit()."""
+        canonical = canonical_grammar(grammar)
+        key = _canonical_key(canonical, mode)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return _for_grammar(entry[0], grammar, canonical)
+
+        self.misses += 1
+        parser = LR1Parser()
+        parser.fit(canonical, mode=mode)
+
+        size = estimate_bytes(parser)
+        if size <= self.max_bytes:
+            self._entries[key] = (parser, size)
+            self.size_bytes += size
+            self._evict()
+        return _for_grammar(parser, grammar, canonical)
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _evict(self):
+        while self.size_bytes > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size_bytes -= size
+            self.evictions += 1
+
+
+def _for_grammar(parser: LR1Parser, grammar: Grammar, canonical: Grammar) -> LR1Parser:
+    # Поверхностная копия с грамматикой вызывающего: автомат общий, правила (и actions
+    # в parse()) — в его порядке. Изменения копии (fit, add_rule) заменяют её
+    # атрибуты и не затрагивают парсер в кэше.
+    view = copy.copy(parser)
+    view.grammar = grammar
+    view._rule_ids = canonical_rule_ids(grammar, canonical)
+    return view
@@ -0,0 +1,297 @@
+"""Сервер проверки слов: построенные парсеры остаются в памяти между запросами.
+
+Протокол: каждое сообщение — 4 байта длины (big-endian) и JSON в UTF-8.
+Запросы:
+    {"op": "register", "grammar": {...}, "mode": "lr1"}
+        -> {"ok": true, "grammar": "<хэш>", "states": N}
+    {"op": "check", "grammar": "<хэш>", "mode": "lr1", "words": [...]}
+        -> {"ok": true, "results": [true, false, ...]}
+При ошибке ответ — {"ok": false, "error": "..."}. Ответы на запросы одного
+соединения приходят в порядке запросов.
+
+Запуск: python parser_server.py --unix /tmp/lr1.sock | --port 8765 [--jobs N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import struct
+import sys
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from parse_tables import ParseTables
+from table_cache import cache_path, load_cached_parser
+
+LENGTH = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 64 << 20
+# Пакеты не больше этого проверяются в цикле событий: передача в процесс дороже
+INLINE_WORDS = 256
+
+
+def encode_message(message: dict) -> bytes:
+    payload = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[dict]:
+    """Следующее сообщение или None, если соединение закрыто."""
+    try:
+        header = await reader.readexactly(LENGTH.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ValueError("Truncated message header")
+        return None
+
+    (size,) = LENGTH.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message too large: {size} bytes")
+    try:
+        payload = await reader.readexactly(size)
+    except asyncio.IncompleteReadError as e:
+        raise ValueError(f"Truncated message: {len(e.partial)} of {size} bytes")
+    return json.loads(payload.decode('utf-8'))
+
+
+def grammar_to_dict(grammar: Grammar) -> dict:
+    return {
+        'start': grammar.start_symbol,
+        'nonterminals': sorted(grammar.nonterminals),
+        'terminals': sorted(grammar.terminals),
+        'rules': [[rule.lhs, list(rule.rhs)] for rule in grammar.rules],
+    }
+
+
+def grammar_from_dict(data: dict) -> Grammar:
+    return Grammar(set(data['nonterminals']), set(data['terminals']),
+                   [Rule(lhs, list(rhs)) for lhs, rhs in data['rules']], data['start'])
+
+
+# Таблицы рабочего процесса по путям файлов; файлы читаются через mmap один раз
+_worker_tables: Dict[str, ParseTables] = {}
+
+
+def _fit_tables(grammar: Grammar, mode: str, path: str) -> None:
+    parser = LR1Parser()
+    parser.fit(grammar, mode=mode)
+    parser.save(path)
+
+
+def _check_batch(path: str, words: List[str]) -> bytes:
+    tables = _worker_tables.get(path)
+    if tables is None:
+        tables = _worker_tables[path] = ParseTables.load(path)[0]
+    return bytes(tables.recognize_many(words))
+
+
+class ParserService:
+    """Построенные парсеры по (хэш грамматики, режим) и обработка запросов.
+
+    Построение таблиц и большие пакеты слов выполняются в пуле процессов
+    (с jobs=0 — в текущем процессе). Таблицы сохраняются в table_dir, откуда
+    их через mmap читают рабочие процессы; при повторном запуске с тем же
+    каталогом fit() не нужен.
+    """
+
+    def __init__(self, table_dir: str, jobs: int = 0, inline_words: int = INLINE_WORDS):
+        self.table_dir = table_dir
+        self.jobs = jobs
+        self.inline_words = inline_words
+        self.pool: Optional[Executor] = ProcessPoolExecutor(jobs) if jobs > 0 else None
+        self.parsers: Dict[Tuple[str, str], LR1Parser] = {}
+        self.paths: Dict[Tuple[str, str], str] = {}
+        # Построения в процессе: одновременные регистрации одной грамматики ждут одного fit()
+        self._fitting: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    async def register(self, grammar: Grammar, mode: str = "lr1") -> Tuple[str, LR1Parser]:
+        if mode not in LR1Parser.MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+
+        key = (grammar.fingerprint(), mode)
+        parser = self.parsers.get(key)
+        if parser is None:
+            future = self._fitting.get(key)
+            if future is None:
+                future = self._fitting[key] = asyncio.ensure_future(self._fit(key, grammar, mode))
+                future.add_done_callback(lambda _: self._fitting.pop(key, None))
+            parser = await asyncio.shield(future)
+        return key[0], parser
+
+    async def _fit(self, key: Tuple[str, str], grammar: Grammar, mode: str) -> LR1Parser:
+        path = cache_path(self.table_dir, grammar, mode)
+        parser = load_cached_parser(self.table_dir, grammar, mode)
+        if parser is None:
+            if self.pool is None:
+                _fit_tables(grammar, mode, path)
+            else:
+                await asyncio.get_running_loop().run_in_executor(self.pool, _fit_tables, grammar, mode, path)
+            parser = LR1Parser.load(path, grammar)
+
+        self.parsers[key] = parser
+        self.paths[key] = path
+        return parser
+
+    async def check(self, fingerprint: str, words: List[str], mode: str = "lr1") -> List[bool]:
+        key = (fingerprint, mode)
+        parser = self.parsers.get(key)
+        if parser is None:
+            raise ValueError(f"Unknown grammar: {fingerprint} ({mode})")
+
+        if self.pool is None or len(words) <= self.inline_words:
+            return parser.predict_many(words)
+
+        # Пакет делится между процессами пула, но не мельче inline_words
+        size = max(self.inline_words, -(-len(words) // self.jobs))
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(self.pool, _check_batch, self.paths[key], words[start:start + size])
+            for start in range(0, len(words), size)])
+        return [bool(result) for chunk in chunks for result in chunk]
+
+    async def request(self, message: dict) -> dict:
+        try:
+            op = message.get('op')
+            mode = message.get('mode', 'lr1')
+            if op == 'register':
+                fingerprint, parser = await self.register(grammar_from_dict(message['grammar']), mode)
+                return {'ok': True, 'grammar': fingerprint, 'states': parser.tables.n_states}
+            if op == 'check':
+                words = message['words']
+                if not isinstance(words, list) or not all(isinstance(word, str) for word in words):
+                    raise ValueError("'words' must be a list of strings")
+                return {'ok': True, 'results': await self.check(message['grammar'], words, mode)}
+            raise ValueError(f"Unknown op: {op!r}")
+        except KeyError as e:
+            return {'ok': False, 'error': f"Missing field: {e}"}
+        except Exception as e:
+            # Ошибка одного запроса (в том числе из рабочего процесса) не закрывает соединение
+            return {'ok': False, 'error': str(e)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    response = {'ok': False, 'error': f"Invalid message: {e}"}
+                except ValueError as e:
+                    # Границы сообщений потеряны — соединение закрывается
+                    writer.write(encode_message({'ok': False, 'error': str(e)}))
+                    break
+                else:
+                    if message is None:
+                        break
+                    if isinstance(message, dict):
+                        response = await self.request(message)
+                    else:
+                        response = {'ok': False, 'error': "Message must be a JSON object"}
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Клиент отключился или сервер останавливается
+            pass
+        finally:
+            writer.close()
+
+
+class ParserClient:
+    """Клиент сервера: запросы отправляются по одному и ждут ответа."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, unix: Optional[str] = None, host: str = '127.0.0.1',
+                      port: Optional[int] = None) -> 'ParserClient':
+        if unix is not None:
+            return cls(*await asyncio.open_unix_connection(unix))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def call(self, message: dict) -> dict:
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+        response = await read_message(self.reader)
+        if response is None:
+            raise ConnectionError("Server closed the connection")
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error'))
+        return response
+
+    async def register(self, grammar: Grammar, mode: str = "lr1") -> str:
+        response = await self.call({'op': 'register', 'grammar': grammar_to_dict(grammar), 'mode': mode})
+        return response['grammar']
+
+    async def check(self, fingerprint: str, words: List[str], mode: str = "lr1") -> List[bool]:
+        response = await self.call({'op': 'check', 'grammar': fingerprint, 'mode': mode, 'words': words})
+        return response['results']
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve(service: ParserService, unix: Optional[str] = None, host: str = '127.0.0.1',
+                port: Optional[int] = None, ready: Optional[asyncio.Event] = None):
+    if unix is not None:
+        server = await asyncio.start_unix_server(service.handle, path=unix)
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+
+    async with server:
+        if ready is not None:
+            ready.set()
+        await server.serve_forever()
+
+
+async def _serve_until_signal(service: ParserService, args):
+    # SIGINT и SIGTERM останавливают сервер, после чего завершается пул процессов
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, task.cancel)
+    try:
+        await serve(service, args.unix, args.host, args.port)
+    except asyncio.CancelledError:
+        pass
+
+
+def parse_args(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Сервер проверки слов по LR(1)-грамматикам")
+    address = arg_parser.add_mutually_exclusive_group(required=True)
+    address.add_argument('--unix', metavar='PATH', help="путь Unix-сокета")
+    address.add_argument('--port', type=int, help="TCP-порт")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                            help="процессов для построения таблиц и больших пакетов (0 — без пула)")
+    arg_parser.add_argument('--table-dir', metavar='DIR',
+                            help="каталог таблиц (по умолчанию временный)")
+    return arg_parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporary:
+        table_dir = args.table_dir or temporary
+        os.makedirs(table_dir, exist_ok=True)
+        service = ParserService(table_dir, args.jobs)
+        print(f"Listening on {args.unix or f'{args.host}:{args.port}'}", file=sys.stderr)
+        try:
+            asyncio.run(_serve_until_signal(service, args))
+        finally:
+            service.close()
+            if args.unix and os.path.exists(args.unix):
+                os.unlink(args.unix)
+
+
+if __name__ == "__main__":
+    main()
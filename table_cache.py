@@ -0,0 +1,26 @@
+import os
+from typing import Optional
+from grammar import Grammar
+from lr_parser import LR1Parser
+
+
+def cache_path(cache_dir: str, grammar: Grammar, mode: str) -> str:
+    """Файл таблиц в каталоге кэша: имя содержит хэш грамматики и режим."""
+    return os.path.join(cache_dir, f"{grammar.fingerprint()}-{mode}.lrt")
+
+
+def load_cached_parser(cache_dir: Optional[str], grammar: Grammar, mode: str,
+                       glr: bool = False) -> Optional[LR1Parser]:
+    """Парсер из сохранённых таблиц или None, если файла нет или он не подходит."""
+    if not cache_dir:
+        return None
+
+    path = cache_path(cache_dir, grammar, mode)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        return LR1Parser.load(path, grammar, glr=glr)
+    except (ValueError, OSError):
+        # Повреждённый или устаревший файл — таблицы будут построены заново
+        return None
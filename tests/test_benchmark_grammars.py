@@ -0,0 +1,29 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lr_parser import LR1Parser
+from benchmarks.grammars import nested_list_grammar, random_ll1_grammar, random_sentence
+
+
+class TestBenchmarkGrammars(unittest.TestCase):
+
+    def test_random_sentences_are_accepted(self):
+        for grammar, separator in [(nested_list_grammar(3), ''),
+                                   (random_ll1_grammar(8, 4, 4, seed=3), ' ')]:
+            parser = LR1Parser()
+            parser.fit(grammar)
+
+            words = [separator.join(random_sentence(grammar, 50, seed)) for seed in range(20)]
+            self.assertTrue(all(parser.predict_many(words)))
+            self.assertTrue(any(len(word) >= 50 for word in words))
+
+    def test_random_grammar_is_deterministic(self):
+        self.assertEqual(random_ll1_grammar(5, 3, 4, seed=7).rules,
+                         random_ll1_grammar(5, 3, 4, seed=7).rules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from codegen import generate_module, write_module
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from benchmarks.grammars import expression_grammar, random_expression_word, random_word
+
+
+def fitted(grammar: Grammar, **kwargs) -> LR1Parser:
+    parser = LR1Parser()
+    parser.fit(grammar, **kwargs)
+    return parser
+
+
+def load_module(source: str, directory: str, name: str):
+    path = os.path.join(directory, name + '.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestCodegen(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def assertSameAsParser(self, parser: LR1Parser, words, name: str = 'recognizer'):
+        module = load_module(generate_module(parser), self.directory, name)
+        self.assertEqual(module.recognize_many(words), parser.predict_many(words))
+        return module
+
+    def test_expression_grammar(self):
+        parser = fitted(expression_grammar(4))
+        words = [random_expression_word(4, 20, seed) for seed in range(50)]
+        words += [random_word('x+-*/()', 10, seed) for seed in range(200)]
+        words += ['', 'x', ' x + x ', 'x\t*\n(x)', 'x+', 'x y', '((x)']
+        module = self.assertSameAsParser(parser, words)
+        self.assertIn(True, module.recognize_many(words))
+
+    def test_multichar_terminals(self):
+        # 'if' и 'i', '=' и '==': самое длинное совпадение, пробелы разделяют лексемы
+        grammar = Grammar({'S', 'C'}, {'if', 'then', 'i', '=', '=='},
+                          [Rule('S', ['if', 'C', 'then', 'S']), Rule('S', ['i', '=', 'i']),
+                           Rule('C', ['i', '==', 'i'])], 'S')
+        parser = fitted(grammar)
+        words = ['i=i', 'if i==i then i=i', 'ifi==ithen i = i', 'if i = i then i=i',
+                 'i==i', 'if i==i then', 'i = = i', 'i=i ', '', 'ifthen']
+        words += [random_word('if=then ', 12, seed) for seed in range(200)]
+        self.assertSameAsParser(parser, words)
+
+    def test_empty_rules_and_lalr(self):
+        # Правая часть ε: свёртка без снятия состояний со стека
+        grammar = Grammar({'S'}, {'a', 'b'}, [Rule('S', ['a', 'S', 'b']), Rule('S', [])], 'S')
+        words = ['', 'ab', 'aabb', 'aab', 'abb', 'ba'] + [random_word('ab', 8, seed) for seed in range(100)]
+        self.assertSameAsParser(fitted(grammar), words, 'lr1')
+        self.assertSameAsParser(fitted(grammar, mode='lalr1'), words, 'lalr1')
+
+    def test_self_contained(self):
+        # Модуль исполняется изолированным интерпретатором, в путях которого нет проекта
+        path = os.path.join(self.directory, 'recognizer.py')
+        write_module(fitted(expression_grammar(3)), path)
+        script = ("import sys; sys.path.insert(0, sys.argv[1]); "
+                  "import recognizer; print(recognizer.recognize_many(['x+x*(x)', 'x+']))")
+        result = subprocess.run([sys.executable, '-I', '-c', script, self.directory],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[True, False]')
+
+        with open(path, encoding='utf-8') as f:
+            imports = {line.split()[1] for line in f if line.startswith(('import ', 'from '))}
+        self.assertEqual(imports, {'binascii', 'sys', 'zlib', 'itertools'})
+
+    def test_conflicts_rejected(self):
+        ambiguous = Grammar({'E'}, {'+', 'x'}, [Rule('E', ['E', '+', 'E']), Rule('E', ['x'])], 'E')
+        with self.assertRaisesRegex(ValueError, "conflicts"):
+            generate_module(fitted(ambiguous, glr=True))
+
+    def test_not_fitted(self):
+        with self.assertRaises(RuntimeError):
+            generate_module(LR1Parser())
+
+
+if __name__ == '__main__':
+    unittest.main()
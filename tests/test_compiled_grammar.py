@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from compiled_grammar import CompiledGrammar
+
+
+class TestCompiledGrammar(unittest.TestCase):
+
+    def setUp(self):
+        self.grammar = Grammar(
+            nonterminals={'S', 'A'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'A', 'b']),
+                Rule('A', ['ε']),
+                Rule('A', ['a']),
+            ],
+            start_symbol='S'
+        )
+
+    def test_symbol_ids(self):
+        compiled = CompiledGrammar(self.grammar, "S'")
+
+        self.assertEqual(compiled.n_terminals, 3)
+        self.assertEqual(compiled.symbols[:3], ['$', 'a', 'b'])
+        self.assertTrue(compiled.is_terminal(compiled.symbol_ids['b']))
+        self.assertTrue(compiled.is_nonterminal(compiled.symbol_ids['A']))
+        self.assertEqual(compiled.name(compiled.augmented_start), "S'")
+
+    def test_rules(self):
+        compiled = CompiledGrammar(self.grammar, "S'")
+        ids = compiled.symbol_ids
+
+        self.assertEqual(compiled.rule_rhs[0], (ids['a'], ids['A'], ids['b']))
+        self.assertEqual(compiled.rule_rhs[1], ())
+        self.assertEqual(compiled.rules_by_lhs[ids['A']], [1, 2])
+        self.assertEqual(compiled.augmented_rule, 3)
+        self.assertEqual(compiled.rule_rhs[3], (ids['S'],))
+        self.assertEqual(compiled.rule_str(1), "A -> ε")
+
+    def test_duplicate_rules_are_not_predicted_twice(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a'},
+            rules=[Rule('S', ['a']), Rule('S', ['a'])],
+            start_symbol='S'
+        )
+        compiled = CompiledGrammar(grammar)
+
+        self.assertEqual(compiled.n_rules, 2)
+        self.assertEqual(compiled.rules_by_lhs[compiled.symbol_ids['S']], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
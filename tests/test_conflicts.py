@@ -0,0 +1,93 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from benchmarks.grammars import expression_grammar
+
+
+def ambiguous_grammar():
+    return Grammar(
+        nonterminals={'E'},
+        terminals={'+', 'x'},
+        rules=[
+            Rule('E', ['E', '+', 'E']),
+            Rule('E', ['x']),
+        ],
+        start_symbol='E'
+    )
+
+
+class TestConflicts(unittest.TestCase):
+
+    def test_shift_reduce_is_reported(self):
+        with self.assertRaises(ValueError) as context:
+            LR1Parser().fit(ambiguous_grammar())
+
+        message = str(context.exception)
+        self.assertIn("Shift-reduce conflict in state", message)
+        self.assertIn("prefix: E+E", message)
+        self.assertIn("[E → E+E·, +]", message)
+        self.assertIn("[E → E·+E, $/+]", message)
+
+    def test_conflict_items_and_prefix(self):
+        parser = LR1Parser()
+        parser.fit(ambiguous_grammar(), glr=True)
+        conflicts = parser.conflicts()
+
+        self.assertEqual(len(conflicts), 1)
+        conflict = conflicts[0]
+        names = parser.compiled.symbols
+        self.assertEqual(conflict.kind, "Shift-reduce")
+        self.assertEqual(names[conflict.terminal], '+')
+        self.assertEqual([names[symbol] for symbol in conflict.prefix], ['E', '+', 'E'])
+        self.assertEqual(parser.tables.conflicts[conflict.state * parser.tables.n_terminals + conflict.terminal],
+                         conflict.actions)
+        rules = {parser.item_pool.decode(item).rule for item in conflict.items}
+        self.assertEqual(rules, {0})
+
+    def test_reduce_reduce(self):
+        grammar = Grammar({'S', 'A', 'B'}, {'a'}, [
+            Rule('S', ['A']),
+            Rule('S', ['B']),
+            Rule('A', ['a']),
+            Rule('B', ['a']),
+        ], 'S')
+
+        with self.assertRaises(ValueError) as context:
+            LR1Parser().fit(grammar)
+        self.assertIn("Reduce-reduce conflict", str(context.exception))
+        self.assertIn("['r2', 'r3']", str(context.exception))
+        self.assertIn("prefix: a", str(context.exception))
+
+    def test_fail_fast(self):
+        # Конфликт появляется задолго до конца построения коллекции
+        grammar = expression_grammar(6)
+        grammar = Grammar(grammar.nonterminals, grammar.terminals,
+                          grammar.rules + [Rule('E0', ['E0', 'E0'])], 'E0')
+
+        full = LR1Parser(collect_stats=True)
+        with self.assertRaises(ValueError) as context:
+            full.fit(grammar)
+
+        parser = LR1Parser(collect_stats=True)
+        with self.assertRaises(ValueError) as fast_context:
+            parser.fit(grammar, fail_fast=True)
+
+        # Отвергнутое построение не сохраняется, но счётчики замыканий остаются
+        self.assertIsNone(parser.grammar)
+        self.assertLess(parser.stats.closures, full.stats.closures)
+        self.assertTrue(str(context.exception).startswith(str(fast_context.exception)))
+        self.assertEqual(str(fast_context.exception).count(" conflict in state"), 1)
+
+    def test_lr1_grammar_has_no_conflicts(self):
+        parser = LR1Parser()
+        parser.fit(expression_grammar(3), fail_fast=True)
+        self.assertEqual(parser.conflicts(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+
+
+def expression_grammar():
+    return Grammar(
+        nonterminals={'E', 'T', 'F'},
+        terminals={'+', '*', '(', ')', 'num'},
+        rules=[
+            Rule('E', ['E', '+', 'T']),
+            Rule('E', ['T']),
+            Rule('T', ['T', '*', 'F']),
+            Rule('T', ['F']),
+            Rule('F', ['(', 'E', ')']),
+            Rule('F', ['num']),
+        ],
+        start_symbol='E'
+    )
+
+
+class TestDiagnostics(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = LR1Parser()
+        self.parser.fit(expression_grammar())
+
+    def test_accepted_word(self):
+        self.assertEqual(self.parser.diagnose('num + num * (num)'), [])
+
+    def test_offset_and_expected(self):
+        errors = self.parser.diagnose('num + * num')
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].offset, 6)
+        self.assertEqual(errors[0].found, '*')
+        self.assertEqual(errors[0].expected, ('(', 'num'))
+
+    def test_several_errors_in_one_pass(self):
+        errors = self.parser.diagnose('num + * num + (num num) + num')
+
+        self.assertEqual([error.offset for error in errors], [6, 19])
+        self.assertEqual(errors[1].expected, (')', '*', '+'))
+        self.assertEqual(len(self.parser.diagnose('num + * num + (num num) + num', max_errors=1)), 1)
+
+    def test_end_of_input_and_unknown_symbol(self):
+        errors = self.parser.diagnose('(num')
+        self.assertEqual((errors[0].offset, errors[0].found), (4, '$'))
+        self.assertIn('end of input', str(errors[0]))
+
+        errors = self.parser.diagnose('num?num')
+        self.assertEqual((errors[0].offset, errors[0].found), (3, None))
+        self.assertEqual(errors[0].expected, ('$', '*', '+'))
+
+    def test_loaded_parser(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tables.lrt')
+            self.parser.save(path)
+            loaded = LR1Parser.load(path, expression_grammar())
+
+            self.assertEqual(loaded.diagnose('num + * num'), self.parser.diagnose('num + * num'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from first_follow import FirstFollowCalculator, bits_to_ids
+
+
+class TestFirstFollow(unittest.TestCase):
+
+    def setUp(self):
+        # E -> T X; X -> + T X | ε; T -> ( E ) | i
+        self.grammar = Grammar(
+            nonterminals={'E', 'X', 'T'},
+            terminals={'+', '(', ')', 'i'},
+            rules=[
+                Rule('E', ['T', 'X']),
+                Rule('X', ['+', 'T', 'X']),
+                Rule('X', ['ε']),
+                Rule('T', ['(', 'E', ')']),
+                Rule('T', ['i']),
+            ],
+            start_symbol='E'
+        )
+        self.calculator = FirstFollowCalculator(self.grammar)
+        self.calculator.compute()
+
+    def test_first(self):
+        self.assertEqual(self.calculator.first['E'], {'(', 'i'})
+        self.assertEqual(self.calculator.first['X'], {'+', 'ε'})
+        self.assertEqual(self.calculator.first['+'], {'+'})
+        self.assertEqual(self.calculator._first_of_string(['X', 'T']), {'+', '(', 'i'})
+        self.assertEqual(self.calculator._first_of_string(['X']), {'+', 'ε'})
+
+    def test_follow(self):
+        self.assertEqual(self.calculator.follow['E'], {'$', ')'})
+        self.assertEqual(self.calculator.follow['X'], {'$', ')'})
+        self.assertEqual(self.calculator.follow['T'], {'+', '$', ')'})
+
+    def test_suffix_table(self):
+        calculator = self.calculator
+        compiled = calculator.compiled
+        ids = compiled.symbol_ids
+
+        # X -> + T · X
+        position = compiled.position(1, 2)
+        self.assertEqual(set(bits_to_ids(calculator.suffix_first[position])), {ids['+']})
+        self.assertTrue(calculator.suffix_nullable[position])
+        # E -> · T X
+        position = compiled.position(0, 0)
+        self.assertEqual(set(bits_to_ids(calculator.suffix_first[position])), {ids['('], ids['i']})
+        self.assertFalse(calculator.suffix_nullable[position])
+
+    def test_bits_to_ids(self):
+        self.assertEqual(bits_to_ids(0), [])
+        self.assertEqual(bits_to_ids(0b10110), [1, 2, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
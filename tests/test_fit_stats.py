@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lr_parser import LR1Parser
+from benchmarks.grammars import context_expression_grammar
+
+
+class TestFitStats(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        parser = LR1Parser()
+        parser.fit(context_expression_grammar(2, 2))
+        self.assertIsNone(parser.stats)
+
+    def test_counters(self):
+        parser = LR1Parser(collect_stats=True)
+        parser.fit(context_expression_grammar(3, 4))
+        stats = parser.stats
+
+        self.assertEqual(list(stats.phase_seconds),
+                         ['compile', 'first_follow', 'collection', 'tables', 'conflicts'])
+        self.assertEqual(stats.states, len(parser.states))
+        # Каноническая коллекция строит одно замыкание на состояние
+        self.assertEqual(stats.closures, len(parser.states))
+        self.assertEqual(stats.goto_transitions, sum(len(t) for t in parser.transitions))
+        self.assertEqual(stats.action_entries, len(parser.action_table))
+        self.assertGreaterEqual(stats.closure_iterations, stats.closures)
+        self.assertGreaterEqual(stats.items_created, stats.largest_closure)
+        self.assertEqual(stats.peak_items, stats.stored_items + stats.largest_closure)
+        self.assertIn('closure iterations', stats.report())
+
+    def test_reset_between_fits(self):
+        parser = LR1Parser(collect_stats=True)
+        parser.fit(context_expression_grammar(3, 4))
+        closures = parser.stats.closures
+        parser.fit(context_expression_grammar(3, 4))
+        self.assertEqual(parser.stats.closures, closures)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import os
+import sys
+import tempfile
+from itertools import product
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+
+
+def ambiguous_expression_grammar():
+    return Grammar(
+        nonterminals={'E'},
+        terminals={'+', '*', '(', ')', 'x'},
+        rules=[
+            Rule('E', ['E', '+', 'E']),
+            Rule('E', ['E', '*', 'E']),
+            Rule('E', ['(', 'E', ')']),
+            Rule('E', ['x']),
+        ],
+        start_symbol='E'
+    )
+
+
+def expression_grammar():
+    return Grammar(
+        nonterminals={'E', 'T', 'F'},
+        terminals={'+', '*', '(', ')', 'x'},
+        rules=[
+            Rule('E', ['E', '+', 'T']),
+            Rule('E', ['T']),
+            Rule('T', ['T', '*', 'F']),
+            Rule('T', ['F']),
+            Rule('F', ['(', 'E', ')']),
+            Rule('F', ['x']),
+        ],
+        start_symbol='E'
+    )
+
+
+def words(alphabet: str, max_length: int):
+    for length in range(max_length + 1):
+        for letters in product(alphabet, repeat=length):
+            yield ''.join(letters)
+
+
+class TestGLR(unittest.TestCase):
+
+    def test_conflicts_are_kept(self):
+        parser = LR1Parser()
+        parser.fit(ambiguous_expression_grammar(), glr=True)
+        self.assertTrue(parser.tables.conflicts)
+        self.assertTrue(all(len(actions) > 1 for actions in parser.tables.conflicts.values()))
+
+        parser.fit(expression_grammar(), glr=True)
+        self.assertEqual(parser.tables.conflicts, {})
+
+    def test_ambiguous_grammar(self):
+        reference = LR1Parser()
+        reference.fit(expression_grammar())
+
+        for mode in LR1Parser.MODES:
+            parser = LR1Parser()
+            parser.fit(ambiguous_expression_grammar(), mode=mode, glr=True)
+            for word in words('+*()x', 5):
+                self.assertEqual(parser.predict(word), reference.predict(word), (mode, word))
+
+    def test_palindromes(self):
+        # Однозначная грамматика, но не LR(k) ни при каком k
+        grammar = Grammar({'S'}, {'a', 'b'}, [
+            Rule('S', ['a', 'S', 'a']),
+            Rule('S', ['b', 'S', 'b']),
+            Rule('S', ['a']),
+            Rule('S', ['b']),
+            Rule('S', []),
+        ], 'S')
+        parser = LR1Parser()
+        parser.fit(grammar, glr=True)
+
+        for word in words('ab', 8):
+            self.assertEqual(parser.predict(word), word == word[::-1], word)
+
+    def test_epsilon_cycle(self):
+        # После свёртки A -> ε состояние переходит само в себя внутри уровня
+        grammar = Grammar({'S', 'A'}, {'x', 'b'}, [
+            Rule('S', ['A', 'S', 'b']),
+            Rule('S', ['x']),
+            Rule('A', []),
+        ], 'S')
+        parser = LR1Parser()
+        parser.fit(grammar, glr=True)
+
+        for word in words('xb', 7):
+            expected = word[:1] == 'x' and set(word[1:]) <= {'b'}
+            self.assertEqual(parser.predict(word), expected, word)
+
+    def test_predict_many_and_unknown_symbol(self):
+        parser = LR1Parser()
+        parser.fit(ambiguous_expression_grammar(), glr=True)
+        self.assertEqual(parser.predict_many(['x+x*x', 'x+', 'x?x', '(x)']), [True, False, False, True])
+
+    def test_deterministic_methods_are_rejected(self):
+        parser = LR1Parser()
+        parser.fit(ambiguous_expression_grammar(), glr=True)
+        with self.assertRaises(RuntimeError):
+            parser.parse('x+x')
+        with self.assertRaises(RuntimeError):
+            parser.diagnose('x+')
+
+    def test_saved_conflicts(self):
+        parser = LR1Parser()
+        parser.fit(ambiguous_expression_grammar(), glr=True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tables.lrt')
+            parser.save(path)
+
+            loaded = LR1Parser.load(path, ambiguous_expression_grammar(), glr=True)
+            self.assertEqual(loaded.tables.conflicts, parser.tables.conflicts)
+            self.assertTrue(loaded.predict('x+x*x'))
+
+            with self.assertRaises(ValueError):
+                LR1Parser.load(path, ambiguous_expression_grammar())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 import unittest
+import pickle
+import subprocess
 import sys
 import os
 
@@ -99,6 +101,32 @@ class TestGrammar(unittest.TestCase):
         x_rules = grammar.get_rules_for('X')
         self.assertEqual(len(x_rules), 0)
 
+    def test_fingerprint(self):
+        def make(rules, terminals=('a', 'b')):
+            return Grammar(nonterminals={'S'}, terminals=set(terminals), rules=rules, start_symbol='S')
+
+        base = make([Rule('S', ['a', 'S']), Rule('S', ['b'])])
+
+        self.assertEqual(base.fingerprint(), make([Rule('S', ['a', 'S']), Rule('S', ['b'])]).fingerprint())
+        self.assertNotEqual(base.fingerprint(), make([Rule('S', ['b']), Rule('S', ['a', 'S'])]).fingerprint())
+        self.assertNotEqual(base.fingerprint(),
+                            make([Rule('S', ['a', 'S']), Rule('S', ['b'])], ('a', 'b', 'c')).fingerprint())
+
+
+    def test_rule_pickled_in_other_process(self):
+        # Хэш строк зависит от PYTHONHASHSEED: правило из другого процесса должно находиться в словаре
+        script = ("import pickle, sys; sys.path.insert(0, sys.argv[1]); from grammar import Rule; "
+                  "sys.stdout.buffer.write(pickle.dumps(Rule('S', ['a', 'b'])))")
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        for seed in ('1', '2'):
+            data = subprocess.run([sys.executable, '-c', script, root], capture_output=True, check=True,
+                                  env=dict(os.environ, PYTHONHASHSEED=seed)).stdout
+            rule = pickle.loads(data)
+
+            self.assertEqual(rule, Rule('S', ['a', 'b']))
+            self.assertEqual(hash(rule), hash(Rule('S', ['a', 'b'])))
+            self.assertEqual({Rule('S', ['a', 'b']): 1}.get(rule), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
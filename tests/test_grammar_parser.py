@@ -38,6 +38,49 @@ abb"""
 
         sys.stdin = sys.__stdin__
 
+    def test_parse_stream_reads_words_lazily(self):
+        header = ["1 2 2\n", "S\n", "a b\n", "S -> a S b S\n", "S ->\n", "S\n", "3\n"]
+        consumed = []
+
+        def lines():
+            for line in header + ["ab\n", "\n", "ba\n", "aabb\n", "extra\n"]:
+                consumed.append(line)
+                yield line
+
+        grammar, words = GrammarParser.parse_stream(lines())
+
+        self.assertEqual(grammar.start_symbol, 'S')
+        self.assertEqual(len(consumed), len(header))
+        self.assertEqual(next(words), 'ab')
+        self.assertEqual(len(consumed), len(header) + 1)
+        self.assertEqual(list(words), ['ba', 'aabb'])
+
+    def test_multi_char_symbols(self):
+        input_text = """2 4 3
+Expr Term
+id num + ==
+Expr -> Term == Term
+Term -> Term + id
+Term -> num
+Expr
+1
+id==num"""
+
+        grammar, words = GrammarParser.parse_stream(io.StringIO(input_text))
+
+        self.assertEqual(grammar.rules[0].rhs, ['Term', '==', 'Term'])
+        self.assertEqual(grammar.rules[1].rhs, ['Term', '+', 'id'])
+        self.assertEqual(str(grammar.rules[0]), "Expr -> Term == Term")
+
+    def test_compact_single_char_rules(self):
+        grammar, _ = GrammarParser.parse_stream(io.StringIO("1 2 1\nS\na b\nS-> aSbS\nS\n0\n"))
+
+        self.assertEqual(grammar.rules[0].rhs, ['a', 'S', 'b', 'S'])
+
+    def test_empty_input(self):
+        with self.assertRaises(ValueError):
+            GrammarParser.parse_stream(iter([]))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
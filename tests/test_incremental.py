@@ -0,0 +1,140 @@
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from benchmarks.grammars import expression_grammar
+
+
+class TestIncrementalRefit(unittest.TestCase):
+
+    def assertSameAsFullFit(self, parser):
+        fresh = LR1Parser()
+        fresh.fit(parser.grammar, mode=parser.mode, glr=parser.glr)
+
+        self.assertEqual([state.items for state in parser.states],
+                         [state.items for state in fresh.states])
+        self.assertEqual(parser.transitions, fresh.transitions)
+        self.assertEqual(parser.action_table, fresh.action_table)
+        self.assertEqual(parser.goto_table, fresh.goto_table)
+        self.assertEqual(parser.first_follow.first, fresh.first_follow.first)
+        self.assertEqual(parser.first_follow.follow, fresh.first_follow.follow)
+        self.assertEqual(list(parser.tables.action), list(fresh.tables.action))
+        self.assertEqual(parser.tables.conflicts, fresh.tables.conflicts)
+
+    def test_add_rule(self):
+        parser = LR1Parser()
+        parser.fit(expression_grammar(3))
+        self.assertFalse(parser.predict('x*(x)x'))
+
+        parser.add_rule(Rule('E3', ['E3', 'x']))
+
+        self.assertSameAsFullFit(parser)
+        self.assertTrue(parser.predict('x*(x)x'))
+
+    def test_remove_rule(self):
+        parser = LR1Parser()
+        parser.fit(expression_grammar(3))
+        self.assertTrue(parser.predict('x+x'))
+
+        parser.remove_rule(parser.grammar.rules[0])
+
+        self.assertSameAsFullFit(parser)
+
+    def test_nullable_rule(self):
+        grammar = Grammar(
+            nonterminals={'S', 'A'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['A', 'b']),
+                Rule('A', ['a', 'A']),
+                Rule('A', ['a']),
+            ],
+            start_symbol='S'
+        )
+        # После добавления A -> ε грамматика неоднозначна: 'ab' выводится двумя способами
+        parser = LR1Parser()
+        parser.fit(grammar, glr=True)
+        self.assertFalse(parser.predict('b'))
+
+        parser.add_rule(Rule('A', ['ε']))
+        self.assertSameAsFullFit(parser)
+        self.assertTrue(parser.predict('b'))
+
+        parser.remove_rule(Rule('A', ['a']))
+        self.assertSameAsFullFit(parser)
+        self.assertTrue(parser.predict('aab'))
+
+    def test_new_symbol_falls_back_to_full_fit(self):
+        grammar = Grammar({'S'}, {'a'}, [Rule('S', ['a'])], 'S')
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        parser.add_rule(Rule('S', ['T']))
+        parser.add_rule(Rule('T', ['a', 'a']))
+
+        self.assertSameAsFullFit(parser)
+        self.assertTrue(parser.predict('aa'))
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        grammar = expression_grammar(3)
+        candidates = [Rule(lhs, rhs) for lhs in sorted(grammar.nonterminals)
+                      for rhs in (['x'], ['(', lhs, ')'], ['ε'], [lhs, '*', 'x'])]
+
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        for _ in range(20):
+            if rng.random() < 0.5 and len(parser.grammar.rules) > 1:
+                rule = rng.choice(parser.grammar.rules)
+                edit = parser.remove_rule
+            else:
+                rule = rng.choice(candidates)
+                edit = parser.add_rule
+
+            try:
+                edit(rule)
+            except ValueError:
+                # Правка сделала грамматику не LR(1) — автомат остаётся прежним
+                pass
+            self.assertSameAsFullFit(parser)
+
+    def test_rejected_edit_keeps_parser(self):
+        grammar = Grammar({'S'}, {'a', 'b'}, [Rule('S', ['a', 'S', 'b', 'S']), Rule('S', ['ε'])], 'S')
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        with self.assertRaises(ValueError):
+            parser.add_rule(Rule('S', ['S', 'S']))
+
+        self.assertEqual(parser.grammar.rules, grammar.rules)
+        self.assertEqual(parser.tables.conflicts, {})
+        self.assertSameAsFullFit(parser)
+        self.assertEqual(parser.predict_many(['ab', 'aabb', 'abab', 'ba', 'a']),
+                         [True, True, True, False, False])
+
+        # После отвергнутой правки инкрементальное изменение по-прежнему работает
+        parser.remove_rule(Rule('S', ['a', 'S', 'b', 'S']))
+        parser.add_rule(Rule('S', ['a', 'S', 'b', 'S']))
+        self.assertSameAsFullFit(parser)
+
+    def test_rejected_fit_keeps_parser(self):
+        parser = LR1Parser()
+        parser.fit(expression_grammar(2))
+
+        ambiguous = Grammar({'E'}, {'+', 'x'}, [Rule('E', ['E', '+', 'E']), Rule('E', ['x'])], 'E')
+        with self.assertRaises(ValueError):
+            parser.fit(ambiguous)
+
+        self.assertEqual(parser.grammar.fingerprint(), expression_grammar(2).fingerprint())
+        self.assertTrue(parser.predict('x+(x)'))
+        self.assertFalse(parser.predict('x+'))
+
+
+if __name__ == '__main__':
+    unittest.main()
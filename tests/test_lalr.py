@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from benchmarks.grammars import context_expression_grammar, context_brackets
+
+
+class TestLALRMode(unittest.TestCase):
+
+    def test_fewer_states_same_language(self):
+        grammar = context_expression_grammar(3, 5)
+
+        lr1 = LR1Parser()
+        lr1.fit(grammar)
+        lalr = LR1Parser()
+        lalr.fit(grammar, mode="lalr1")
+
+        self.assertLess(len(lalr.states), len(lr1.states))
+
+        open_sym, close_sym = context_brackets(2)
+        for word in ['x', 'x+x', '(x-x)*x', 'x+', '(x', 'x)']:
+            wrapped = open_sym + word + close_sym
+            self.assertEqual(lalr.predict(wrapped), lr1.predict(wrapped), wrapped)
+        self.assertTrue(lalr.predict(open_sym + '(x+x)*x' + close_sym))
+
+    def test_example_from_assignment(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'S', 'b', 'S']),
+                Rule('S', ['ε']),
+            ],
+            start_symbol='S'
+        )
+
+        parser = LR1Parser()
+        parser.fit(grammar, mode="lalr1")
+
+        self.assertTrue(parser.predict('aababb'))
+        self.assertTrue(parser.predict(''))
+        self.assertFalse(parser.predict('aabbba'))
+
+    def test_merge_reduce_reduce_conflict(self):
+        # LR(1), но не LALR(1): слияние ядер E -> e· и F -> e· даёт конфликт свёртка/свёртка
+        grammar = Grammar(
+            nonterminals={'S', 'E', 'F'},
+            terminals={'a', 'b', 'e'},
+            rules=[
+                Rule('S', ['a', 'E', 'a']),
+                Rule('S', ['b', 'E', 'b']),
+                Rule('S', ['a', 'F', 'b']),
+                Rule('S', ['b', 'F', 'a']),
+                Rule('E', ['e']),
+                Rule('F', ['e']),
+            ],
+            start_symbol='S'
+        )
+
+        parser = LR1Parser()
+        parser.fit(grammar)
+        self.assertTrue(parser.predict('aea'))
+        self.assertTrue(parser.predict('bea'))
+
+        with self.assertRaises(ValueError) as context:
+            LR1Parser().fit(grammar, mode="lalr1")
+        self.assertIn("Reduce-reduce conflict", str(context.exception))
+        self.assertIn("['r4', 'r5']", str(context.exception))
+
+    def test_unknown_mode(self):
+        grammar = Grammar({'S'}, {'a'}, [Rule('S', ['a'])], 'S')
+        with self.assertRaises(ValueError):
+            LR1Parser().fit(grammar, mode="slr")
+
+
+if __name__ == '__main__':
+    unittest.main()
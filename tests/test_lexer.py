@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lexer import Lexer
+from lr_parser import LR1Parser
+
+
+class TestLexer(unittest.TestCase):
+
+    def test_longest_match(self):
+        lexer = Lexer({'=': 1, '==': 2, 'id': 3, 'i': 4})
+
+        self.assertFalse(lexer.single_char)
+        self.assertEqual(list(lexer.tokens('id==i=id')), [3, 2, 4, 1, 3])
+        self.assertEqual(list(lexer.tokens(' id  == i ')), [3, 2, 4])
+        self.assertEqual(list(lexer.tokens('id?i')), [3, None])
+
+    def test_single_char(self):
+        lexer = Lexer({'a': 1, 'b': 2})
+
+        self.assertTrue(lexer.single_char)
+        self.assertEqual(list(lexer.tokens('ab')), [1, 2])
+        # Пробелы пропускаются только при многосимвольных терминалах
+        self.assertEqual(list(lexer.tokens('a b')), [1, None, 2])
+        self.assertEqual(lexer.skip, frozenset())
+        self.assertEqual(list(lexer.tokens('abc')), [1, 2, None])
+
+    def test_spans(self):
+        lexer = Lexer({'=': 1, '==': 2, 'id': 3})
+
+        # После нераспознанного символа разбиение продолжается
+        self.assertEqual(list(lexer.spans(' id == ?id')), [(3, 1), (2, 4), (None, 7), (3, 8)])
+
+    def test_whitespace_terminal_is_not_skipped(self):
+        lexer = Lexer({'a': 1, ' ': 2})
+
+        self.assertEqual(list(lexer.tokens('a a')), [1, 2, 1])
+
+
+class TestMultiCharTerminals(unittest.TestCase):
+
+    def test_predict(self):
+        grammar = Grammar(
+            nonterminals={'E', 'T'},
+            terminals={'id', 'num', '+', '=='},
+            rules=[
+                Rule('E', ['T', '==', 'T']),
+                Rule('T', ['T', '+', 'id']),
+                Rule('T', ['id']),
+                Rule('T', ['num']),
+            ],
+            start_symbol='E'
+        )
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        words = ['id == num', 'id+id==num', 'id = num', 'num == num + id', 'idid == id', 'id ==']
+        expected = [True, True, False, True, False, False]
+
+        self.assertEqual([parser.predict(word) for word in words], expected)
+        self.assertEqual(parser.predict_many(words), expected)
+
+    def test_single_char_whitespace_rejected(self):
+        grammar = Grammar({'S'}, {'a', 'b'}, [Rule('S', ['a', 'S', 'b', 'S']), Rule('S', [])], 'S')
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        words = ['ab', 'a b', 'aa bb', 'a\tb', ' ', 'aabb']
+        expected = [True, False, False, False, False, True]
+
+        self.assertEqual([parser.predict(word) for word in words], expected)
+        self.assertEqual(parser.predict_many(words), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from compiled_grammar import CompiledGrammar
+from lr_item import ItemPool, LRItem, LRState
+
+
+class TestItemPool(unittest.TestCase):
+
+    def setUp(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[Rule('S', ['a', 'S', 'b']), Rule('S', ['ε'])],
+            start_symbol='S'
+        )
+        self.compiled = CompiledGrammar(grammar, "S'")
+        self.pool = ItemPool(self.compiled)
+
+    def test_equal_items_are_interned(self):
+        b = self.compiled.symbol_ids['b']
+        item = self.pool.item(0, 1, b)
+        self.assertIs(self.pool.intern(int(str(item))), item)
+
+        # Числа больше 256 не кэшируются интерпретатором: равные значения — разные объекты
+        large = 1000 * self.compiled.n_terminals + b
+        first, second = int(str(large)), int(str(large))
+        self.assertIsNot(first, second)
+
+        self.assertIs(self.pool.intern(first), first)
+        self.assertIs(self.pool.intern(second), first)
+        self.assertEqual(len(self.pool), 2)
+
+    def test_state_str(self):
+        b = self.compiled.symbol_ids['b']
+        state = LRState([self.pool.item(0, 1, b)], 3, pool=self.pool)
+        self.assertEqual(str(state), "State 3:\n[S → a·Sb, b]")
+
+    def test_shift_and_decode(self):
+        b = self.compiled.symbol_ids['b']
+        item = self.pool.item(0, 1, b)
+
+        self.assertEqual(self.pool.decode(item), LRItem(0, 1, b))
+        self.assertEqual(self.pool.decode(item + self.compiled.n_terminals), LRItem(0, 2, b))
+        self.assertEqual(self.pool.lookahead(item), b)
+        self.assertEqual(self.pool.decode(item).to_str(self.compiled), "[S → a·Sb, b]")
+
+
+if __name__ == '__main__':
+    unittest.main()
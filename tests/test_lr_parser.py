@@ -120,6 +120,102 @@ class TestLR1Parser(unittest.TestCase):
             print(f"Пропуск теста: {e}")
             self.skipTest(f"Грамматика не LR(1): {e}")
 
+    def test_predict_many_matches_predict(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'S', 'b', 'S']),
+                Rule('S', ['ε']),
+            ],
+            start_symbol='S'
+        )
+
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        words = ['aababb', 'aabbba', '', 'ab', 'aab', 'aabb', 'aabbab', 'abc', 'ab', 'b', 'aabbabab']
+        self.assertEqual(parser.predict_many(words), [parser.predict(w) for w in words])
+        self.assertEqual(parser.predict_many(iter(['ab', 'ba'])), [True, False])
+        self.assertEqual(parser.predict_many([]), [])
+
+    def test_lookahead_table(self):
+        grammar = Grammar(
+            nonterminals={'S', 'A'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['A', 'A', 'b']),
+                Rule('A', ['a']),
+                Rule('A', ['ε']),
+            ],
+            start_symbol='S'
+        )
+
+        # Грамматика неоднозначна ('ab'), таблицы строятся с конфликтами
+        parser = LR1Parser()
+        parser.fit(grammar, glr=True)
+        compiled = parser.compiled
+        ids = compiled.symbol_ids
+
+        # S -> · A A b: FIRST(A b) = {a, b}
+        position = compiled.position(0, 0)
+        self.assertEqual(parser.beta_first[position], {ids['a'], ids['b']})
+        self.assertFalse(parser.beta_nullable[position])
+        # S -> A A · b: после b ничего нет
+        position = compiled.position(0, 2)
+        self.assertEqual(parser.beta_first[position], set())
+        self.assertTrue(parser.beta_nullable[position])
+
+    def test_states_store_kernels(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'S', 'b', 'S']),
+                Rule('S', ['ε']),
+            ],
+            start_symbol='S'
+        )
+
+        parser = LR1Parser()
+        parser.fit(grammar)
+        pool = parser.item_pool
+        ids = parser.compiled.symbol_ids
+
+        # В начальном состоянии хранится только [S' -> ·S, $]
+        state = parser.states[0]
+        self.assertEqual(state.items, {pool.item(parser.compiled.augmented_rule, 0, 0)})
+
+        closure = parser.closure(0)
+        self.assertEqual(closure.index, 0)
+        self.assertTrue(state.items <= closure.items)
+        self.assertIn(pool.item(0, 0, ids['$']), closure.items)
+        self.assertIn(pool.item(1, 0, ids['$']), closure.items)
+
+        # Завершённые пункты замыкания сохраняются для свёрток
+        self.assertEqual(state.reductions, (pool.item(1, 0, ids['$']),))
+
+    def test_string_tables_built_on_demand(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'S', 'b', 'S']),
+                Rule('S', ['ε']),
+            ],
+            start_symbol='S'
+        )
+
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        # fit() оставляет только плотные таблицы; словари строятся при первом обращении
+        self.assertIsNone(parser._action_table)
+        self.assertIsNone(parser._goto_table)
+        self.assertEqual(parser.action_table[(0, 'a')], 's' + str(parser.goto_table[(0, 'a')]))
+        self.assertEqual(parser.action_table[(0, '$')], 'r1')
+        self.assertIn((0, 'S'), parser.goto_table)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
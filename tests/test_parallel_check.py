@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from parallel_check import check_words
+
+
+class TestParallelCheck(unittest.TestCase):
+
+    def test_results_in_input_order(self):
+        grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'S', 'b', 'S']),
+                Rule('S', ['ε']),
+            ],
+            start_symbol='S'
+        )
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        words = ['aababb', 'aabbba', '', 'ab', 'ba', 'abab', 'abb'] * 5
+        expected = [parser.predict(word) for word in words]
+
+        self.assertEqual(check_words(parser.tables, words, jobs=1, chunk_size=3), expected)
+        self.assertEqual(check_words(parser.tables, words, jobs=2, chunk_size=3), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
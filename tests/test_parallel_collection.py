@@ -0,0 +1,38 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import parallel_collection
+from lr_parser import LR1Parser
+from benchmarks.grammars import context_expression_grammar
+
+
+class TestParallelCollection(unittest.TestCase):
+
+    def setUp(self):
+        # Раскрываем в пуле даже маленькие фронты
+        self.min_frontier = parallel_collection.MIN_PARALLEL_FRONTIER
+        parallel_collection.MIN_PARALLEL_FRONTIER = 1
+
+    def tearDown(self):
+        parallel_collection.MIN_PARALLEL_FRONTIER = self.min_frontier
+
+    def test_same_states_as_sequential(self):
+        grammar = context_expression_grammar(3, 4)
+
+        sequential = LR1Parser()
+        sequential.fit(grammar)
+        parallel = LR1Parser()
+        parallel.fit(grammar, jobs=2)
+
+        self.assertEqual([state.items for state in parallel.states],
+                         [state.items for state in sequential.states])
+        self.assertEqual(parallel.transitions, sequential.transitions)
+        self.assertEqual(list(parallel.tables.action), list(sequential.tables.action))
+        self.assertEqual(list(parallel.tables.goto), list(sequential.tables.goto))
+
+
+if __name__ == '__main__':
+    unittest.main()
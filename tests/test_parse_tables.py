@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from parse_tables import ACCEPT, ERROR, REDUCE, SHIFT, decode_action, encode_action
+
+
+class TestParseTables(unittest.TestCase):
+
+    def setUp(self):
+        grammar = Grammar(
+            nonterminals={'E'},
+            terminals={'a', '+'},
+            rules=[
+                Rule('E', ['E', '+', 'a']),
+                Rule('E', ['a']),
+            ],
+            start_symbol='E'
+        )
+        self.parser = LR1Parser()
+        self.parser.fit(grammar)
+
+    def test_encoding(self):
+        for kind in (SHIFT, REDUCE):
+            self.assertEqual(decode_action(encode_action(kind, 12345)), (kind, 12345))
+        self.assertEqual(decode_action(encode_action(ACCEPT)), (ACCEPT, 0))
+
+    def test_dense_tables_match_action_table(self):
+        tables = self.parser.tables
+        names = self.parser.compiled.symbols
+
+        for state in range(tables.n_states):
+            for terminal in range(tables.n_terminals):
+                action = tables.action[state * tables.n_terminals + terminal]
+                expected = self.parser.action_table.get((state, names[terminal]))
+                self.assertEqual(tables.action_str(action), expected)
+
+        self.assertEqual(tables.action_at(0, 0)[0], ERROR)
+
+    def test_recognize_unknown_symbol(self):
+        tables = self.parser.tables
+
+        self.assertTrue(tables.recognize(tables.tokens('a+a')))
+        self.assertFalse(tables.recognize(tables.tokens('a+b')))
+        self.assertFalse(tables.recognize(tables.tokens('a+$')))
+
+    def test_recognize_many_paths(self):
+        # Общий разбор префиксов и разбор каждого слова отдельно дают одни ответы
+        multichar = LR1Parser()
+        multichar.fit(Grammar({'E'}, {'id', '+'}, [Rule('E', ['E', '+', 'id']), Rule('E', ['id'])], 'E'))
+
+        for tables, words in ((self.parser.tables, ['a+a+a', 'a+a+', 'a+a', 'a+b+a', 'a', '', 'a+a+a+a']),
+                              (multichar.tables, ['id+id', 'id + id+', 'id+?', 'id', '', 'id+id+id'])):
+            expected = [tables.recognize(tables.tokens(word)) for word in words]
+            for shared_prefix_min in (0, 2):
+                with mock.patch('parse_tables.SHARED_PREFIX_MIN', shared_prefix_min):
+                    self.assertEqual(tables.recognize_many(words), expected)
+            self.assertIn(True, expected)
+            self.assertIn(False, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+
+
+class TestParseTree(unittest.TestCase):
+
+    def setUp(self):
+        self.grammar = Grammar(
+            nonterminals={'S'},
+            terminals={'a', 'b'},
+            rules=[
+                Rule('S', ['a', 'S', 'b', 'S']),
+                Rule('S', ['ε']),
+            ],
+            start_symbol='S'
+        )
+        self.parser = LR1Parser()
+        self.parser.fit(self.grammar)
+
+    def test_tree_structure(self):
+        tree = self.parser.parse('aabb')
+        names = self.parser.compiled.symbols
+
+        self.assertEqual(tree.to_str(names), 'S(a S(a S() b S()) b S())')
+        self.assertEqual(tree.rule(tree.root), 0)
+        self.assertEqual(names[tree.symbol(tree.root)], 'S')
+        self.assertEqual([tree.first[leaf] for leaf in tree.leaves()], [0, 1, 2, 3])
+        self.assertEqual(''.join(names[tree.symbol(leaf)] for leaf in tree.leaves()), 'aabb')
+        self.assertTrue(all(tree.is_leaf(leaf) for leaf in tree.leaves()))
+
+    def test_reductions(self):
+        # Правый вывод в обратном порядке: S -> ε трижды вперемешку с S -> aSbS
+        self.assertEqual(self.parser.parse('aabb').reductions(), [1, 1, 0, 1, 0])
+        self.assertEqual(self.parser.parse('').reductions(), [1])
+
+    def test_rejected_word(self):
+        self.assertIsNone(self.parser.parse('aab'))
+        self.assertIsNone(self.parser.parse('ba'))
+        self.assertIsNone(self.parser.parse('ac'))
+
+    def test_semantic_actions(self):
+        grammar = Grammar(
+            nonterminals={'E', 'T', 'F'},
+            terminals={'+', '*', '(', ')', 'num'},
+            rules=[
+                Rule('E', ['E', '+', 'T']),
+                Rule('E', ['T']),
+                Rule('T', ['T', '*', 'F']),
+                Rule('T', ['F']),
+                Rule('F', ['(', 'E', ')']),
+                Rule('F', ['num']),
+            ],
+            start_symbol='E'
+        )
+        parser = LR1Parser()
+        parser.fit(grammar)
+
+        actions = {
+            Rule('E', ['E', '+', 'T']): lambda e, _, t: e + t,
+            Rule('T', ['T', '*', 'F']): lambda t, _, f: t * f,
+            Rule('F', ['(', 'E', ')']): lambda _, e, __: e,
+            Rule('F', ['num']): lambda _: 2,
+        }
+
+        # Правила E -> T и T -> F передают значение единственного ребёнка
+        self.assertEqual(parser.parse('num + num * (num + num)', actions).value, 10)
+        self.assertIsNone(parser.parse('num +', actions))
+        self.assertIsNone(parser.parse('num * num').value)
+
+
+if __name__ == '__main__':
+    unittest.main()
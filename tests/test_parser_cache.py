@@ -0,0 +1,101 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from parser_cache import ParserCache, canonical_grammar, estimate_bytes
+from benchmarks.grammars import expression_grammar
+
+
+def brackets_grammar(rules):
+    return Grammar({'S'}, {'a', 'b'}, rules, 'S')
+
+
+class TestParserCache(unittest.TestCase):
+
+    def test_canonical_key(self):
+        first = brackets_grammar([Rule('S', ['a', 'S', 'b', 'S']), Rule('S', ['ε'])])
+        reordered = brackets_grammar([Rule('S', []), Rule(' S', ['a', 'S ', 'b', 'S'])])
+        other = brackets_grammar([Rule('S', ['a', 'S', 'b']), Rule('S', [])])
+
+        self.assertEqual(ParserCache.key(first), ParserCache.key(reordered))
+        self.assertNotEqual(ParserCache.key(first), ParserCache.key(other))
+        self.assertNotEqual(ParserCache.key(first), ParserCache.key(first, mode="lalr1"))
+        self.assertEqual([str(rule) for rule in canonical_grammar(reordered).rules],
+                         ['S -> ε', 'S -> aSbS'])
+
+    def test_hits_and_misses(self):
+        cache = ParserCache()
+        parser = cache.get(brackets_grammar([Rule('S', ['a', 'S', 'b', 'S']), Rule('S', ['ε'])]))
+        same = cache.get(brackets_grammar([Rule('S', []), Rule('S', ['a', 'S', 'b', 'S'])]))
+
+        # Автомат общий, грамматика у каждого парсера — переданная в get()
+        self.assertIs(parser.tables, same.tables)
+        self.assertEqual(same.grammar.rules[0], Rule('S', []))
+        self.assertTrue(parser.predict('aabbab'))
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 1, 0))
+        self.assertEqual(cache.size_bytes, estimate_bytes(parser))
+
+    def test_parse_actions_use_caller_rules(self):
+        # Число пар скобок: действия заданы правилами вызывающего, включая 'ε'
+        rules = [Rule('S', ['a', 'S', 'b', 'S']), Rule('S', ['ε'])]
+        actions = {rules[0]: lambda a, inner, b, rest: inner + rest + 1, rules[1]: lambda: 0}
+        fresh = LR1Parser()
+        fresh.fit(brackets_grammar(rules))
+
+        cache = ParserCache()
+        cache.get(brackets_grammar([Rule('S', []), Rule('S', ['a', 'S', 'b', 'S'])]))
+        parser = cache.get(brackets_grammar(rules))
+
+        tree = parser.parse('aabbab', actions)
+        self.assertEqual(tree.value, 3)
+        # Номера правил в дереве — по грамматике вызывающего
+        self.assertEqual(tree.reductions(), fresh.parse('aabbab').reductions())
+        self.assertEqual(tree.to_str(parser.compiled.symbols), fresh.parse('aabbab').to_str(fresh.compiled.symbols))
+
+    def test_edit_does_not_change_cached_parser(self):
+        cache = ParserCache()
+        grammar = expression_grammar(2)
+        parser = cache.get(grammar)
+        parser.add_rule(Rule('E2', ['E2', 'x']))
+        self.assertTrue(parser.predict('xx'))
+
+        cached = cache.get(grammar)
+        self.assertFalse(cached.predict('xx'))
+        self.assertTrue(cached.predict('x+x'))
+
+    def test_lru_eviction(self):
+        grammars = [expression_grammar(levels) for levels in (2, 3, 4)]
+        sizes = [estimate_bytes(ParserCache().get(grammar)) for grammar in grammars]
+        # Помещаются два последних использованных парсера, но не три
+        cache = ParserCache(max_bytes=sizes[0] + sizes[1] + sizes[2] - 1)
+
+        cache.get(grammars[0])
+        cache.get(grammars[1])
+        cache.get(grammars[0])
+        cache.get(grammars[2])
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertIn(ParserCache.key(grammars[0]), cache)
+        self.assertNotIn(ParserCache.key(grammars[1]), cache)
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+
+    def test_parser_larger_than_budget(self):
+        cache = ParserCache(max_bytes=1)
+        parser = cache.get(expression_grammar(2))
+        self.assertTrue(parser.predict('x+x'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size_bytes, 0)
+
+    def test_estimate_grows_with_grammar(self):
+        cache = ParserCache()
+        small = estimate_bytes(cache.get(expression_grammar(2)))
+        large = estimate_bytes(cache.get(expression_grammar(6)))
+        self.assertLess(small, large)
+
+
+if __name__ == '__main__':
+    unittest.main()
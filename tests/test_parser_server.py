@@ -0,0 +1,119 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+from parser_server import LENGTH, ParserClient, ParserService, encode_message, read_message, serve
+from benchmarks.grammars import expression_grammar, random_expression_word
+
+
+class TestParserServer(unittest.IsolatedAsyncioTestCase):
+
+    async def start(self, jobs: int = 0, inline_words: int = 256):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.service = ParserService(directory.name, jobs, inline_words)
+        self.addCleanup(self.service.close)
+
+        self.socket_path = os.path.join(directory.name, 'server.sock')
+        ready = asyncio.Event()
+        server = asyncio.create_task(serve(self.service, unix=self.socket_path, ready=ready))
+        self.addAsyncCleanup(self.stop, server)
+        await ready.wait()
+
+        client = await ParserClient.connect(unix=self.socket_path)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def stop(self, server: asyncio.Task):
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+    async def test_register_and_check(self):
+        client = await self.start()
+        grammar = expression_grammar(3)
+        fingerprint = await client.register(grammar)
+        self.assertEqual(fingerprint, grammar.fingerprint())
+
+        reference = LR1Parser()
+        reference.fit(grammar)
+        words = [random_expression_word(3, 12, seed) for seed in range(20)] + ['x+', '(x', '']
+        self.assertEqual(await client.check(fingerprint, words), reference.predict_many(words))
+
+    async def test_batches_in_process_pool(self):
+        client = await self.start(jobs=1, inline_words=10)
+        fingerprint = await client.register(expression_grammar(3))
+
+        words = [random_expression_word(3, 12, seed) for seed in range(25)] + ['x+x)']
+        results = await client.check(fingerprint, words)
+        self.assertEqual(results, [True] * 25 + [False])
+
+    async def test_concurrent_registration_fits_once(self):
+        await self.start()
+        clients = [await ParserClient.connect(unix=self.socket_path) for _ in range(4)]
+        fingerprints = await asyncio.gather(*[client.register(expression_grammar(3)) for client in clients])
+        for client in clients:
+            await client.close()
+
+        self.assertEqual(len(set(fingerprints)), 1)
+        self.assertEqual(len(self.service.parsers), 1)
+
+    async def test_errors_keep_connection(self):
+        client = await self.start()
+
+        with self.assertRaisesRegex(RuntimeError, "Unknown grammar"):
+            await client.check('0' * 64, ['x'])
+
+        ambiguous = Grammar({'E'}, {'+', 'x'}, [Rule('E', ['E', '+', 'E']), Rule('E', ['x'])], 'E')
+        with self.assertRaisesRegex(RuntimeError, "Shift-reduce conflict"):
+            await client.register(ambiguous)
+
+        with self.assertRaisesRegex(RuntimeError, "Unknown op"):
+            await client.call({'op': 'drop'})
+
+        # Некорректный JSON в правильной рамке: ответ с ошибкой, соединение остаётся открытым
+        client.writer.write(LENGTH.pack(3) + b'{x}')
+        response = await read_message(client.reader)
+        self.assertFalse(response['ok'])
+
+        fingerprint = await client.register(expression_grammar(2))
+        self.assertEqual(await client.check(fingerprint, ['x']), [True])
+
+    async def test_message_framing(self):
+        message = {'op': 'check', 'words': ['ä', '']}
+        data = encode_message(message)
+        self.assertEqual(LENGTH.unpack(data[:LENGTH.size])[0], len(data) - LENGTH.size)
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        self.assertEqual(await read_message(reader), message)
+        self.assertIsNone(await read_message(reader))
+
+    async def test_truncated_message(self):
+        for data in (LENGTH.pack(10)[:2], LENGTH.pack(10) + b'{"op"'):
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            with self.assertRaisesRegex(ValueError, "Truncated message"):
+                await read_message(reader)
+
+    async def test_truncated_body_closes_connection(self):
+        client = await self.start()
+        # Заголовок обещает 10 байт, клиент отправляет 5 и закрывает запись
+        client.writer.write(LENGTH.pack(10) + b'{"op"')
+        client.writer.write_eof()
+
+        response = await read_message(client.reader)
+        self.assertFalse(response['ok'])
+        self.assertIn("Truncated message", response['error'])
+        self.assertIsNone(await read_message(client.reader))
+
+
+if __name__ == '__main__':
+    unittest.main()
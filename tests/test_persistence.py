@@ -0,0 +1,68 @@
+import unittest
+import os
+import pickle
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grammar import Grammar, Rule
+from lr_parser import LR1Parser
+
+
+def make_grammar(extra_rules=()):
+    return Grammar(
+        nonterminals={'S'},
+        terminals={'a', 'b'},
+        rules=[
+            Rule('S', ['a', 'S', 'b', 'S']),
+            Rule('S', ['ε']),
+            *extra_rules,
+        ],
+        start_symbol='S'
+    )
+
+
+class TestPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'tables.lrt')
+        self.parser = LR1Parser()
+        self.parser.fit(make_grammar())
+        self.parser.save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        loaded = LR1Parser.load(self.path, make_grammar())
+
+        words = ['aababb', 'aabbba', '', 'ab', 'ba', 'abc']
+        self.assertEqual([loaded.predict(w) for w in words],
+                         [self.parser.predict(w) for w in words])
+        self.assertEqual(loaded.predict_many(words), self.parser.predict_many(words))
+        self.assertEqual(list(loaded.tables.action), list(self.parser.tables.action))
+
+    def test_stale_tables_rejected(self):
+        changed = make_grammar([Rule('S', ['b'])])
+
+        with self.assertRaises(ValueError):
+            LR1Parser.load(self.path, changed)
+
+    def test_corrupt_file_rejected(self):
+        with open(self.path, 'r+b') as f:
+            f.truncate(40)
+
+        with self.assertRaises(ValueError):
+            LR1Parser.load(self.path, make_grammar())
+
+    def test_loaded_tables_can_be_pickled(self):
+        loaded = LR1Parser.load(self.path, make_grammar())
+        tables = pickle.loads(pickle.dumps(loaded.tables))
+
+        self.assertTrue(tables.recognize(tables.tokens('aababb')))
+
+
+if __name__ == '__main__':
+    unittest.main()